@@ -3,12 +3,14 @@
 Provides:
 - parse_log_file(path) -> logs dict
 - find_important_logs(logs) -> list of important log entries
-- CLI: accepts a filename and prints important logs
+- follow_important_logs(path) -> alerts on WARN/ERROR lines as they are appended
+- CLI: accepts a filename and prints important logs (`--follow` keeps watching)
 """
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+from follow import DEFAULT_POLL_INTERVAL, FileFollower
 from log_file import LogFile
 import logging
 import argparse
@@ -40,36 +42,72 @@ def parse_log_file(file_path: str | Path) -> Dict[str, List[str]]:
     return lf.logs
 
 
-def find_important_logs(logs: Dict[str, List[str]]) -> List[Tuple[str, str, str, str]]:
+def find_important_logs(
+    logs: Dict[str, List[str]] | Iterable[Tuple[str, str, str, str]],
+) -> List[Tuple[str, str, str, str]]:
     """Return list of important logs (WARN or ERROR) as tuples.
 
+    `logs` is either a parsed logs dict or an iterable of record tuples such
+    as `LogFile.iter_records()`, which keeps memory flat for large files.
     Each tuple is (timestamp, level, module, message).
     """
+    if isinstance(logs, Mapping):
+        records: Iterable[Tuple[str, str, str, str]] = zip(
+            logs.get("TIMESTAMP", []),
+            logs.get("LEVEL", []),
+            logs.get("MODULE", []),
+            logs.get("MESSAGE", []),
+        )
+    else:
+        records = logs
+
     res: List[Tuple[str, str, str, str]] = []
-    for ts, level, mod, msg in zip(
-        logs.get("TIMESTAMP", []),
-        logs.get("LEVEL", []),
-        logs.get("MODULE", []),
-        logs.get("MESSAGE", []),
-    ):
+    for ts, level, mod, msg in records:
         flag = LEVEL_FLAGS.get(level, 0)
         if flag & IMPORTANT_LEVELS:
             res.append((ts, level, mod, msg))
     return res
 
 
+def follow_important_logs(
+    file_path: str | Path,
+    interval: float = DEFAULT_POLL_INTERVAL,
+    stop: Optional[Callable[[], bool]] = None,
+) -> int:
+    """Print WARN/ERROR records as they are appended to `file_path`.
+
+    Existing content is checked first, then only new bytes are parsed.
+    Runs until `stop()` is true or Ctrl-C; returns the number of alerts.
+    """
+    alerts = 0
+    try:
+        for records in FileFollower(file_path).follow(interval, stop):
+            for ts, level, mod, msg in find_important_logs(records):
+                alerts += 1
+                print("ALERT:", ts, level, mod, msg, flush=True)
+    except KeyboardInterrupt:
+        pass
+    return alerts
+
+
 def main(argv: List[str] | None = None) -> int:
     parser = argparse.ArgumentParser(description="Detect important logs (WARN/ERROR)")
     parser.add_argument("file", help="Path to log file")
+    parser.add_argument("--follow", action="store_true", help="Keep watching the file and alert on new lines")
+    parser.add_argument("--interval", type=float, default=DEFAULT_POLL_INTERVAL, help="Follow poll interval in seconds")
     args = parser.parse_args(argv)
 
+    if args.follow:
+        follow_important_logs(args.file, args.interval)
+        return 0
+
     try:
-        logs = parse_log_file(args.file)
+        # Stream records so memory stays flat regardless of file size.
+        important = find_important_logs(LogFile(args.file).iter_records())
     except FileNotFoundError as e:
         print(e)
         return 1
 
-    important = find_important_logs(logs)
     if important:
         print("IMPORTANT LOGS FOUND:")
         for ts, level, mod, msg in important:
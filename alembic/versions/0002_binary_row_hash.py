@@ -0,0 +1,87 @@
+"""store logs.row_hash as a 128-bit uuid
+
+Revision ID: 0002_binary_row_hash
+Revises: 0001_create_ingests_logs
+Create Date: 2026-10-17 00:00:00.000000
+
+Ingest now hashes rows with a 16-byte BLAKE2b digest of the stored
+timestamp/level/module/message (see `ingest.row_hash`). The old values
+were SHA256 of the raw line, so they are recomputed here from the stored
+columns; otherwise re-ingesting existing data would insert it again. Rows
+that turn out to be duplicates under the new hash (same stored values) are
+removed, keeping the lowest id, before the unique constraint is restored.
+
+The downgrade keeps the new digests (as hex); the SHA256 of the original
+line cannot be rebuilt from the table.
+"""
+
+import hashlib
+import uuid
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0002_binary_row_hash'
+down_revision = '0001_create_ingests_logs'
+branch_labels = None
+depends_on = None
+
+BATCH_ROWS = 10000
+NULL_FIELD = b"\xff\xff\xff\xff"
+
+
+def _row_hash(timestamp, level, module, message) -> uuid.UUID:
+    # Frozen copy of ingest.row_hash at this revision
+    digest = hashlib.blake2b(digest_size=16)
+    for value in (None if timestamp is None else timestamp.isoformat(), level, module, message):
+        if value is None:
+            digest.update(NULL_FIELD)
+            continue
+        data = value.encode("utf-8")
+        digest.update(len(data).to_bytes(4, "little"))
+        digest.update(data)
+    return uuid.UUID(bytes=digest.digest())
+
+
+def upgrade() -> None:
+    op.drop_constraint('uq_logs_row_hash', 'logs', type_='unique')
+    # Placeholder values; every row is rehashed below
+    op.execute(
+        "ALTER TABLE logs ALTER COLUMN row_hash TYPE uuid "
+        "USING substr(row_hash, 1, 32)::uuid"
+    )
+
+    bind = op.get_bind()
+    select = sa.text(
+        "SELECT id, timestamp, level, module, message FROM logs "
+        "WHERE id > :last ORDER BY id LIMIT :limit"
+    )
+    update = sa.text(
+        "UPDATE logs SET row_hash = v.h "
+        "FROM unnest(CAST(:ids AS bigint[]), CAST(:hashes AS uuid[])) AS v (id, h) "
+        "WHERE logs.id = v.id"
+    )
+    last = 0
+    while True:
+        rows = bind.execute(select, {"last": last, "limit": BATCH_ROWS}).all()
+        if not rows:
+            break
+        bind.execute(
+            update,
+            {
+                "ids": [r.id for r in rows],
+                "hashes": [str(_row_hash(r.timestamp, r.level, r.module, r.message)) for r in rows],
+            },
+        )
+        last = rows[-1].id
+
+    op.execute("DELETE FROM logs a USING logs b WHERE a.row_hash = b.row_hash AND a.id > b.id")
+    op.create_unique_constraint('uq_logs_row_hash', 'logs', ['row_hash'])
+
+
+def downgrade() -> None:
+    op.execute(
+        "ALTER TABLE logs ALTER COLUMN row_hash TYPE varchar(128) "
+        "USING replace(row_hash::text, '-', '')"
+    )
@@ -0,0 +1,25 @@
+"""add ingests.checkpoint_offset for resumable ingest
+
+Revision ID: 0003_ingest_checkpoint
+Revises: 0002_binary_row_hash
+Create Date: 2026-10-17 00:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0003_ingest_checkpoint'
+down_revision = '0002_binary_row_hash'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Byte offset just past the last committed batch; total_rows is the
+    # matching row count
+    op.add_column('ingests', sa.Column('checkpoint_offset', sa.BigInteger(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('ingests', 'checkpoint_offset')
@@ -0,0 +1,25 @@
+"""add ingests.file_size / file_mtime for stat-based skip in batch ingest
+
+Revision ID: 0004_ingest_file_stat
+Revises: 0003_ingest_checkpoint
+Create Date: 2026-10-17 00:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0004_ingest_file_stat'
+down_revision = '0003_ingest_checkpoint'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('ingests', sa.Column('file_size', sa.BigInteger(), nullable=True))
+    op.add_column('ingests', sa.Column('file_mtime', sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('ingests', 'file_mtime')
+    op.drop_column('ingests', 'file_size')
@@ -0,0 +1,42 @@
+"""add log_rollups: counts per (resolution, time bucket, module, level)
+
+Revision ID: 0006_log_rollups
+Revises: 0005_logs_message_trgm
+Create Date: 2026-10-17 00:00:00.000000
+
+Ingest keeps the table current from now on (see `rollups.with_rollups`);
+the upgrade backfills it from the rows already in `logs`.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0006_log_rollups'
+down_revision = '0005_logs_message_trgm'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'log_rollups',
+        sa.Column('resolution', sa.String(length=8), nullable=False),
+        sa.Column('bucket', sa.DateTime(), nullable=False),
+        sa.Column('module', sa.String(length=128), nullable=False),
+        sa.Column('level', sa.String(length=32), nullable=False),
+        sa.Column('count', sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint('resolution', 'bucket', 'module', 'level'),
+    )
+    op.execute(
+        "INSERT INTO log_rollups (resolution, bucket, module, level, count) "
+        "SELECT r.resolution, date_trunc(r.resolution, l.timestamp), "
+        "coalesce(l.module, ''), coalesce(l.level, ''), count(*) "
+        "FROM logs l CROSS JOIN (VALUES ('minute'), ('hour'), ('day')) AS r (resolution) "
+        "WHERE l.timestamp IS NOT NULL "
+        "GROUP BY 1, 2, 3, 4"
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('log_rollups')
@@ -0,0 +1,120 @@
+"""partition logs by month on timestamp
+
+Revision ID: 0007_partition_logs
+Revises: 0006_log_rollups
+Create Date: 2026-10-17 00:00:00.000000
+
+Rebuilds `logs` as a range-partitioned table with one partition per month
+present in the data plus `logs_default` for rows without a timestamp
+(see partitions.py). Unique keys of a partitioned table must include the
+partition key, so `uq_logs_row_hash` becomes UNIQUE NULLS NOT DISTINCT
+(row_hash, timestamp) (PostgreSQL 15+) and `id` keeps its sequence but is
+only indexed. Rows are copied, so this takes a full rewrite of `logs`
+under an exclusive lock, and its indexes (the trigram one included) are
+rebuilt in the same transaction rather than CONCURRENTLY: run it with
+ingest and the API stopped.
+"""
+
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+import sqlalchemy.dialects.postgresql as pg
+
+# revision identifiers, used by Alembic.
+revision = '0007_partition_logs'
+down_revision = '0006_log_rollups'
+branch_labels = None
+depends_on = None
+
+COLUMNS = "id, ingest_id, timestamp, module, level, message, row_hash"
+INDEXES = ('ix_logs_ingest_id', 'ix_logs_timestamp', 'ix_logs_module', 'ix_logs_level', 'ix_logs_row_hash')
+
+
+def _next_month(month: datetime) -> datetime:
+    return month.replace(year=month.year + 1, month=1) if month.month == 12 else month.replace(month=month.month + 1)
+
+
+def _create_indexes(id_index: bool) -> None:
+    if id_index:
+        # Stands in for the primary key, which a partitioned table cannot have
+        op.create_index('ix_logs_id', 'logs', ['id'], unique=False)
+    op.create_index('ix_logs_ingest_id', 'logs', ['ingest_id'], unique=False)
+    op.create_index('ix_logs_timestamp', 'logs', ['timestamp'], unique=False)
+    op.create_index('ix_logs_module', 'logs', ['module'], unique=False)
+    op.create_index('ix_logs_level', 'logs', ['level'], unique=False)
+    op.create_index('ix_logs_row_hash', 'logs', ['row_hash'], unique=False)
+    op.execute(
+        "CREATE INDEX ix_logs_message_trgm ON logs "
+        "USING gin (message gin_trgm_ops) WITH (gin_pending_list_limit = 16384)"
+    )
+
+
+def _drop_old_indexes() -> None:
+    # Free the names for the rebuilt table
+    op.drop_constraint('uq_logs_row_hash', 'logs_old', type_='unique')
+    for name in INDEXES + ('ix_logs_message_trgm',):
+        op.execute(f"DROP INDEX IF EXISTS {name}")
+
+
+def upgrade() -> None:
+    op.execute("ALTER SEQUENCE logs_id_seq OWNED BY NONE")
+    op.rename_table('logs', 'logs_old')
+    _drop_old_indexes()
+    op.execute("ALTER TABLE logs_old DROP CONSTRAINT IF EXISTS logs_pkey")
+
+    op.create_table(
+        'logs',
+        sa.Column('id', sa.BigInteger(), server_default=sa.text("nextval('logs_id_seq')"), nullable=False),
+        sa.Column('ingest_id', pg.UUID(as_uuid=True), sa.ForeignKey('ingests.id'), nullable=False),
+        sa.Column('timestamp', sa.DateTime(), nullable=True),
+        sa.Column('module', sa.String(length=128), nullable=True),
+        sa.Column('level', sa.String(length=32), nullable=True),
+        sa.Column('message', sa.Text(), nullable=True),
+        sa.Column('row_hash', pg.UUID(as_uuid=True), nullable=False),
+        sa.UniqueConstraint('row_hash', 'timestamp', name='uq_logs_row_hash', postgresql_nulls_not_distinct=True),
+        postgresql_partition_by='RANGE (timestamp)',
+    )
+    op.execute("CREATE TABLE logs_default PARTITION OF logs DEFAULT")
+
+    first, last = op.get_bind().execute(
+        sa.text("SELECT date_trunc('month', min(timestamp)), date_trunc('month', max(timestamp)) FROM logs_old")
+    ).one()
+    month = first
+    while month is not None and month <= last:
+        end = _next_month(month)
+        op.execute(
+            f"CREATE TABLE logs_y{month.year:04d}m{month.month:02d} PARTITION OF logs "
+            f"FOR VALUES FROM ('{month:%Y-%m-%d}') TO ('{end:%Y-%m-%d}')"
+        )
+        month = end
+
+    op.execute(f"INSERT INTO logs ({COLUMNS}) SELECT {COLUMNS} FROM logs_old")
+    # Build indexes once after the copy rather than row by row
+    _create_indexes(id_index=True)
+    op.drop_table('logs_old')
+    op.execute("ALTER SEQUENCE logs_id_seq OWNED BY logs.id")
+
+
+def downgrade() -> None:
+    op.execute("ALTER SEQUENCE logs_id_seq OWNED BY NONE")
+    op.rename_table('logs', 'logs_old')
+    _drop_old_indexes()
+    op.execute("DROP INDEX IF EXISTS ix_logs_id")
+
+    op.create_table(
+        'logs',
+        sa.Column('id', sa.BigInteger(), server_default=sa.text("nextval('logs_id_seq')"), primary_key=True),
+        sa.Column('ingest_id', pg.UUID(as_uuid=True), sa.ForeignKey('ingests.id'), nullable=False),
+        sa.Column('timestamp', sa.DateTime(), nullable=True),
+        sa.Column('module', sa.String(length=128), nullable=True),
+        sa.Column('level', sa.String(length=32), nullable=True),
+        sa.Column('message', sa.Text(), nullable=True),
+        sa.Column('row_hash', pg.UUID(as_uuid=True), nullable=False),
+    )
+    op.execute(f"INSERT INTO logs ({COLUMNS}) SELECT {COLUMNS} FROM logs_old")
+    op.create_unique_constraint('uq_logs_row_hash', 'logs', ['row_hash'])
+    _create_indexes(id_index=False)
+    # Drops the partitions with it
+    op.drop_table('logs_old')
+    op.execute("ALTER SEQUENCE logs_id_seq OWNED BY logs.id")
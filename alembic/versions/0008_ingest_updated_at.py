@@ -0,0 +1,23 @@
+"""add ingests.updated_at heartbeat for safe resume
+
+Revision ID: 0008_ingest_updated_at
+Revises: 0007_partition_logs
+Create Date: 2026-10-17 00:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0008_ingest_updated_at'
+down_revision = '0007_partition_logs'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('ingests', sa.Column('updated_at', sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('ingests', 'updated_at')
@@ -0,0 +1,52 @@
+"""composite (ingest_id, id) index for per-ingest keyset pagination
+
+Revision ID: 0009_logs_ingest_id_id
+Revises: 0008_ingest_updated_at
+Create Date: 2026-10-17 00:00:00.000000
+
+`GET /api/ingests/{id}/logs` pages with `ingest_id = ? AND id > ? ORDER BY
+id LIMIT n`. With only single-column indexes Postgres must sort the rest of
+the ingest or walk `ix_logs_id` filtering out other ingests; an index on
+(ingest_id, id) reads just the page. It also serves every lookup by
+`ingest_id`, so it replaces `ix_logs_ingest_id`.
+
+A partitioned index cannot be built CONCURRENTLY, so it is created on the
+parent only, built concurrently on each partition and then attached.
+Partitions created later get it automatically.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0009_logs_ingest_id_id'
+down_revision = '0008_ingest_updated_at'
+branch_labels = None
+depends_on = None
+
+
+def _partitions() -> list:
+    result = op.get_bind().execute(
+        sa.text(
+            "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = 'logs'::regclass"
+        )
+    )
+    return [name for (name,) in result]
+
+
+def upgrade() -> None:
+    op.execute("CREATE INDEX IF NOT EXISTS ix_logs_ingest_id_id ON ONLY logs (ingest_id, id)")
+    partitions = _partitions()
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        for name in partitions:
+            op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name}_ingest_id_id_idx ON {name} (ingest_id, id)")
+    for name in partitions:
+        op.execute(f"ALTER INDEX ix_logs_ingest_id_id ATTACH PARTITION {name}_ingest_id_id_idx")
+    op.drop_index('ix_logs_ingest_id', table_name='logs')
+
+
+def downgrade() -> None:
+    op.create_index('ix_logs_ingest_id', 'logs', ['ingest_id'], unique=False)
+    op.drop_index('ix_logs_ingest_id_id', table_name='logs')
@@ -1,21 +1,31 @@
-from fastapi import FastAPI, UploadFile, File, HTTPException, Request
+from fastapi import FastAPI, UploadFile, File, HTTPException, Query, Request, Response
 from fastapi.responses import JSONResponse
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, StreamingResponse
 import os
+import asyncio
+import json
 import logging
+import tempfile
+from collections import deque
 from contextvars import ContextVar
+from datetime import datetime
 from pydantic import BaseModel
-from typing import Dict
-from uuid import uuid4
-from log_file import LogFile
-from user_analytics import UserAnalytics
-import io
-import ingest as ingest_mod
+from typing import Dict, List, Optional
+from uuid import UUID, uuid4
+from broadcaster import DROPPED, Broadcaster
+from compression import CompressionError
+from upload_pipeline import UploadPipeline, UploadTooLarge, aggregate_block
+from user_analytics import AnalyticsResult, summarize_levels, tables_from_pairs
+from cpu_executor import CpuExecutor, ExecutorBusy
+from ingest_queue import IngestQueue
+from Task_B1 import find_important_logs
+from rollups import series_query
+from timestamps import parse_timestamp
 from db import get_session, DB_AVAILABLE
 from db import check_db_connection
 from models import Ingest, Log
-from sqlalchemy import select
+from sqlalchemy import func, select
 
 logger = logging.getLogger(__name__)
 
@@ -75,9 +85,39 @@ async def serve_frontend_alias():
     raise HTTPException(status_code=404, detail="Frontend not found")
 
 
-MAX_UPLOAD_SIZE = 5 * 1024 * 1024  # 5 MB
+# Uploads are processed in blocks, so the limit no longer bounds memory use.
+MAX_UPLOAD_SIZE = int(os.getenv("MAX_UPLOAD_SIZE", str(1024 * 1024 * 1024)))  # 1 GB
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # 1 MB
+# Compressed uploads may expand to at most this many bytes
+MAX_DECOMPRESSED_SIZE = int(os.getenv("MAX_DECOMPRESSED_SIZE", str(16 * MAX_UPLOAD_SIZE)))
+# Parsing and analytics run here rather than on the event loop thread
+cpu_executor = CpuExecutor.from_env()
+# DB ingest runs in the background; uploads are spooled here until then
+ingest_queue = IngestQueue.from_env()
+# Live WARN/ERROR rows for /api/stream/important, fed by the ingest queue
+important_stream = Broadcaster(buffer=int(os.getenv("STREAM_BUFFER", "1000")))
+STREAM_KEEPALIVE = float(os.getenv("STREAM_KEEPALIVE", "15"))
+# Log query API: JSON page size when no limit is given, and rows fetched per
+# round trip by the NDJSON export's server-side cursor
+DEFAULT_LOGS_PAGE = 1000
+NDJSON_FETCH_SIZE = 1000
+LOG_COLUMNS = (Log.id, Log.timestamp, Log.module, Log.level, Log.message)
+# Message search: pg_trgm needs 3 characters to use the index
+MIN_SEARCH_LENGTH = 3
+MAX_SEARCH_PAGE = 1000
+UPLOAD_SPOOL_DIR = os.getenv("UPLOAD_SPOOL_DIR") or None
 # Allow common text/log content types; be lenient when the client doesn't set a content-type.
-ALLOWED_CONTENT_TYPES = {"text/plain", "text/x-log", "application/octet-stream"}
+ALLOWED_CONTENT_TYPES = {
+    "text/plain",
+    "text/x-log",
+    "application/octet-stream",
+    # Compressed uploads; the format itself is detected from magic bytes
+    "application/gzip",
+    "application/x-gzip",
+    "application/x-bzip2",
+    "application/x-xz",
+    "application/zstd",
+}
 
 
 class UploadResponse(BaseModel):
@@ -86,6 +126,55 @@ class UploadResponse(BaseModel):
     levels: Dict[str, int]
     modules: Dict[str, int]
     levels_per_module: Dict[str, Dict[str, int]]
+    ingest_id: Optional[str] = None
+
+
+def _discard_spool(spool) -> None:
+    if spool is not None:
+        try:
+            os.unlink(spool.name)
+        except OSError:
+            pass
+
+
+async def _run_pipeline(pipeline: UploadPipeline, file: UploadFile) -> AnalyticsResult:
+    """Feed the upload through `pipeline` with all CPU work on `cpu_executor`.
+
+    Small uploads are hashed and parsed block by block in the thread pool.
+    Large ones (per `cpu_executor.process_threshold`) are hashed and split
+    into line-aligned blocks in a thread, parsed in the process pool with up
+    to `process_workers` blocks in flight, and the aggregates merged here.
+    """
+    executor = cpu_executor
+    if not executor.use_processes(file.size):
+        while True:
+            chunk = await file.read(UPLOAD_CHUNK_SIZE)
+            if not chunk:
+                break
+            await executor.run(pipeline.feed, chunk)
+        return await executor.run(pipeline.close)
+
+    in_flight: deque = deque()
+
+    def submit(block: bytes) -> None:
+        if block:
+            in_flight.append(asyncio.ensure_future(executor.run(aggregate_block, block, processes=True)))
+
+    try:
+        while True:
+            chunk = await file.read(UPLOAD_CHUNK_SIZE)
+            if not chunk:
+                break
+            submit(await executor.run(pipeline.accept, chunk))
+            if len(in_flight) >= executor.process_workers:
+                pipeline.add(await in_flight.popleft())
+        submit(pipeline.finish())
+        while in_flight:
+            pipeline.add(await in_flight.popleft())
+    finally:
+        for fut in in_flight:
+            fut.cancel()
+    return await executor.run(pipeline.result)
 
 
 @app.post("/upload", response_model=UploadResponse)
@@ -94,38 +183,56 @@ async def upload_log(file: UploadFile = File(...)) -> UploadResponse:
 
     Expects a text file matching the project's log format. Returns overall level
     counts, per-module call counts, and a levels-per-module breakdown.
+
+    The upload is read in `UPLOAD_CHUNK_SIZE` blocks through an
+    `UploadPipeline` (size limit, SHA256, parsing, analytics), so memory use
+    does not grow with the file size. gzip/bzip2/xz/zstd uploads are
+    decompressed on the fly and spooled for ingest still compressed.
     """
     # Basic content-type check (lenient if client doesn't set it)
     if file.content_type and file.content_type not in ALLOWED_CONTENT_TYPES:
         raise HTTPException(status_code=400, detail=f"Unsupported content type: {file.content_type}")
 
-    # Read the uploaded file into memory (bounded by MAX_UPLOAD_SIZE)
+    # Reject early when the declared size is already over the limit
+    if file.size is not None and file.size > MAX_UPLOAD_SIZE:
+        raise HTTPException(status_code=413, detail="Uploaded file is too large")
+
+    # Spool the upload for the background ingest while it streams through
+    # the pipeline; without a running queue there is nothing to ingest into.
+    spool = None
+    if ingest_queue.running:
+        spool = tempfile.NamedTemporaryFile(prefix="upload-", suffix=".log", dir=UPLOAD_SPOOL_DIR, delete=False)
+    pipeline = UploadPipeline(max_size=MAX_UPLOAD_SIZE, sink=spool, max_expanded_size=MAX_DECOMPRESSED_SIZE)
     try:
-        contents = await file.read()
-    except Exception as exc:
+        try:
+            analytics = await _run_pipeline(pipeline, file)
+        finally:
+            if spool is not None:
+                spool.close()
+    except ExecutorBusy:
+        _discard_spool(spool)
+        raise HTTPException(status_code=503, detail="Server busy, retry later", headers={"Retry-After": "1"})
+    except UploadTooLarge:
+        _discard_spool(spool)
+        raise HTTPException(status_code=413, detail="Uploaded file is too large")
+    except CompressionError as exc:
+        _discard_spool(spool)
+        raise HTTPException(status_code=400, detail=f"Failed to decompress upload: {exc}")
+    except UnicodeDecodeError as exc:
+        _discard_spool(spool)
+        logger.exception("Failed to parse uploaded log: %s", getattr(file, "filename", "<unknown>"))
+        raise HTTPException(status_code=400, detail=f"Failed to parse log file: {str(exc)}")
+    except Exception:
+        _discard_spool(spool)
         logger.exception("Failed to read uploaded file: %r", getattr(file, "filename", None))
         raise HTTPException(status_code=400, detail="Failed to read uploaded file")
 
-    size = len(contents) if contents is not None else 0
+    size = pipeline.size
     if size == 0:
+        _discard_spool(spool)
         raise HTTPException(status_code=400, detail="Uploaded file is empty")
-    if size > MAX_UPLOAD_SIZE:
-        raise HTTPException(status_code=413, detail="Uploaded file is too large")
-
-    # Parse using LogFile which accepts raw bytes
-    try:
-        lf = LogFile(contents)
-        lf.parse_records()
-    except Exception as exc:
-        logger.exception("Failed to parse uploaded log: %s", getattr(file, "filename", "<unknown>"))
-        raise HTTPException(status_code=400, detail=f"Failed to parse log file: {str(exc)}")
 
     try:
-        ua = UserAnalytics(lf.logs)
-        stats = ua.calculate_stats()
-        module_counts = ua.calculate_module_stats()
-        levels_per_module = ua.calculate_levels_per_module()
-
         # Generate a server-side id for the uploaded file; do not echo back
         # the client's filename to avoid leaking client paths or sensitive info.
         file_id = uuid4().hex
@@ -137,22 +244,25 @@ async def upload_log(file: UploadFile = File(...)) -> UploadResponse:
             orig_name = None
             logger.info("Upload received: file_id=%s", file_id)
 
-        # Persist ingest to DB (best-effort). Failures here should not
-        # prevent returning analytics to the client, but they will be logged.
-        try:
-            # Pass a fresh BytesIO so the ingest reader can consume it.
-            bio = io.BytesIO(contents)
-            ingest_result = await ingest_mod.ingest_file_like(bio, filename=orig_name)
-            logger.info("Ingest result: %s", ingest_result)
-        except Exception:
-            logger.exception("Failed to persist ingest for file_id=%s", file_id)
+        # Queue the DB ingest (best-effort) and respond without waiting for
+        # it; progress is reported by GET /api/ingests/{ingest_id}.
+        ingest_id = None
+        if spool is not None:
+            try:
+                job = await ingest_queue.submit(spool.name, pipeline.file_hash, file_name=orig_name)
+                ingest_id = str(job.id)
+                logger.info("Ingest queued: file_id=%s ingest_id=%s", file_id, ingest_id)
+            except Exception:
+                _discard_spool(spool)
+                logger.exception("Failed to queue ingest for file_id=%s", file_id)
 
         resp = UploadResponse(
             file_id=file_id,
-            records=len(lf.logs.get("LEVEL", [])),
-            levels=stats,
-            modules=module_counts,
-            levels_per_module=levels_per_module,
+            records=analytics.records,
+            levels=analytics.levels,
+            modules=analytics.modules,
+            levels_per_module=analytics.levels_per_module,
+            ingest_id=ingest_id,
         )
         return resp
     except Exception:
@@ -198,42 +308,394 @@ async def list_ingests():
                     "created_at": it.created_at.isoformat() if it.created_at else None,
                     "total_rows": it.total_rows,
                     "inserted_rows": it.inserted_rows,
+                    "checkpoint_offset": it.checkpoint_offset,
                 }
             )
         return out
 
 
+@app.get("/api/ingests/{ingest_id}")
+async def get_ingest(ingest_id: str):
+    """Report status and progress of an ingest.
+
+    Combines the `Ingest` row (once the background job has created it) with
+    the in-memory job state, so queued and failed jobs are visible too. A
+    job that resumed an earlier ingest of the same file reports that row,
+    whose id it returns as `resumed_into`.
+    """
+    try:
+        key = UUID(ingest_id)
+    except ValueError:
+        raise HTTPException(status_code=404, detail="Ingest not found")
+
+    job = ingest_queue.get(key)
+    out = job.to_dict() if job is not None else None
+    if DB_AVAILABLE:
+        row_id = (job.resumed_into if job is not None else None) or key
+        async with get_session() as session:
+            it = await session.get(Ingest, row_id)
+        if it is not None:
+            out = out or {"id": str(it.id), "processed_rows": it.inserted_rows, "error": None}
+            out.update(
+                {
+                    "file_hash": it.file_hash,
+                    "file_name": it.file_name,
+                    # A job that died before marking its row leaves it "processing"
+                    "status": job.status if job is not None and job.status == "failed" else it.status,
+                    "created_at": it.created_at.isoformat() if it.created_at else None,
+                    "total_rows": it.total_rows,
+                    "inserted_rows": it.inserted_rows,
+                }
+            )
+    if out is None:
+        if not DB_AVAILABLE:
+            raise HTTPException(status_code=503, detail="Database not available")
+        raise HTTPException(status_code=404, detail="Ingest not found")
+    return out
+
+
+def _parse_time_param(name: str, value: Optional[str]) -> Optional[datetime]:
+    if value is None:
+        return None
+    parsed = parse_timestamp(value)
+    if parsed is None:
+        raise HTTPException(status_code=400, detail=f"Invalid {name} timestamp: {value!r}")
+    return parsed
+
+
+def log_filters(
+    ingest_id: Optional[UUID] = None,
+    levels: Optional[List[str]] = None,
+    modules: Optional[List[str]] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+) -> list:
+    """WHERE conditions shared by the log query, search and analytics APIs.
+
+    Each maps onto an index (`ix_logs_ingest_id_id`, `ix_logs_level`,
+    `ix_logs_module`, `ix_logs_timestamp`). `since` is inclusive and
+    `until` exclusive.
+    """
+    conditions = []
+    if ingest_id is not None:
+        conditions.append(Log.ingest_id == ingest_id)
+    if levels:
+        conditions.append(Log.level.in_(levels))
+    if modules:
+        conditions.append(Log.module.in_(modules))
+    if since is not None:
+        conditions.append(Log.timestamp >= since)
+    if until is not None:
+        conditions.append(Log.timestamp < until)
+    return conditions
+
+
+def logs_query(
+    ingest_id: Optional[UUID] = None,
+    after_id: Optional[int] = None,
+    levels: Optional[List[str]] = None,
+    modules: Optional[List[str]] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+):
+    """Core SELECT of log columns ordered by id, for keyset pagination.
+
+    The cursor is the unique `id`. For one ingest, `ix_logs_ingest_id_id`
+    (ingest_id, id) turns each page into a range scan of that index, so
+    later pages cost the same as the first; without an ingest, `ix_logs_id`
+    does.
+    """
+    stmt = select(*LOG_COLUMNS).where(*log_filters(ingest_id, levels, modules, since, until)).order_by(Log.id)
+    if after_id is not None:
+        stmt = stmt.where(Log.id > after_id)
+    return stmt
+
+
+def _log_row(row) -> dict:
+    return {
+        "id": row.id,
+        "timestamp": row.timestamp.isoformat() if row.timestamp else None,
+        "module": row.module,
+        "level": row.level,
+        "message": row.message,
+    }
+
+
 @app.get("/api/ingests/{ingest_id}/logs")
-async def get_ingest_logs(ingest_id: str, limit: int = 1000):
+async def get_ingest_logs(
+    ingest_id: str,
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1),
+    after_id: Optional[int] = None,
+    level: Optional[List[str]] = Query(None),
+    module: Optional[List[str]] = Query(None),
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    format: str = Query("json", pattern="^(json|ndjson)$"),
+):
+    """Rows of one ingest in id order, filtered and keyset-paginated.
+
+    `level` / `module` may be repeated; `since` / `until` accept any
+    timestamp format `timestamps.parse_timestamp` understands. Pass the
+    last row's id as `after_id` to get the next page; JSON responses set
+    `X-Next-After-Id` when a full page was returned.
+
+    `format=ndjson` streams one JSON object per line from a server-side
+    cursor (no `limit` needed), so exporting a large ingest keeps memory flat.
+    """
+    try:
+        key = UUID(ingest_id)
+    except ValueError:
+        raise HTTPException(status_code=404, detail="Ingest not found")
+    job = ingest_queue.get(key)
+    if job is not None and job.resumed_into is not None:
+        # The upload finished an earlier ingest; its rows carry that id
+        key = job.resumed_into
+    stmt = logs_query(
+        key,
+        after_id=after_id,
+        levels=level,
+        modules=module,
+        since=_parse_time_param("since", since),
+        until=_parse_time_param("until", until),
+    )
     if not DB_AVAILABLE:
         raise HTTPException(status_code=503, detail="Database not available")
+
+    if format == "ndjson":
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        return StreamingResponse(_stream_ndjson(stmt), media_type="application/x-ndjson")
+
+    limit = limit or DEFAULT_LOGS_PAGE
     async with get_session() as session:
-        stmt = select(Log).where(Log.ingest_id == ingest_id).order_by(Log.id).limit(limit)
-        res = await session.execute(stmt)
-        rows = res.scalars().all()
-        out = []
-        for r in rows:
-            out.append(
-                {
-                    "id": r.id,
-                    "timestamp": r.timestamp.isoformat() if r.timestamp else None,
-                    "module": r.module,
-                    "level": r.level,
-                    "message": r.message,
-                }
-            )
-        return out
+        res = await session.execute(stmt.limit(limit))
+        out = [_log_row(r) for r in res]
+    if len(out) == limit:
+        response.headers["X-Next-After-Id"] = str(out[-1]["id"])
+    return out
 
 
-if __name__ == "__main__":
-    # Run with: python api_server.py  
-    import uvicorn
+async def _stream_ndjson(stmt):
+    async with get_session() as session:
+        result = await session.stream(stmt.execution_options(yield_per=NDJSON_FETCH_SIZE))
+        async for rows in result.partitions():
+            yield "".join(json.dumps(_log_row(r)) + "\n" for r in rows)
+
+
+def search_query(
+    q: str,
+    ingest_id: Optional[UUID] = None,
+    levels: Optional[List[str]] = None,
+    modules: Optional[List[str]] = None,
+):
+    """Core SELECT of rows whose message contains `q`, best matches first.
+
+    The case-insensitive substring match is served by the
+    `ix_logs_message_trgm` index; rows are ranked by pg_trgm
+    `word_similarity`, newest first among equal ranks.
+    """
+    rank = func.word_similarity(q, Log.message).label("rank")
+    return (
+        select(*LOG_COLUMNS, rank)
+        .where(Log.message.icontains(q, autoescape=True), *log_filters(ingest_id, levels, modules))
+        .order_by(rank.desc(), Log.id.desc())
+    )
+
+
+@app.get("/api/logs/search")
+async def search_logs(
+    q: str,
+    limit: int = Query(100, ge=1, le=MAX_SEARCH_PAGE),
+    offset: int = Query(0, ge=0),
+    ingest_id: Optional[UUID] = None,
+    level: Optional[List[str]] = Query(None),
+    module: Optional[List[str]] = Query(None),
+):
+    """Search messages across all ingests (or one, with `ingest_id`).
+
+    Returns `{"results": [...], "next_offset": n}`; pass `next_offset` back
+    as `offset` for the next page (it is null on the last page).
+    """
+    q = q.strip()
+    if len(q) < MIN_SEARCH_LENGTH:
+        # Trigram indexes cannot serve shorter patterns; it would be a full scan
+        raise HTTPException(
+            status_code=400, detail=f"Search query must be at least {MIN_SEARCH_LENGTH} characters"
+        )
+    if not DB_AVAILABLE:
+        raise HTTPException(status_code=503, detail="Database not available")
+    stmt = search_query(q, ingest_id, levels=level, modules=module)
+    async with get_session() as session:
+        res = await session.execute(stmt.offset(offset).limit(limit))
+        results = [dict(_log_row(r), rank=round(r.rank, 4)) for r in res]
+    next_offset = offset + limit if len(results) == limit else None
+    return {"query": q, "results": results, "next_offset": next_offset}
+
+
+# NULL level/module are reported under "" rather than dropped
+_LEVEL = func.coalesce(Log.level, "").label("level")
+_MODULE = func.coalesce(Log.module, "").label("module")
+
+
+def counts_query(group_by: tuple, **filters):
+    """`SELECT <group_by>, count(*) FROM logs WHERE <filters> GROUP BY <group_by>`."""
+    return select(*group_by, func.count().label("n")).where(*log_filters(**filters)).group_by(*group_by)
+
+
+def _analytics_filters(
+    ingest_id: Optional[UUID],
+    module: Optional[List[str]],
+    since: Optional[str],
+    until: Optional[str],
+) -> dict:
+    filters = dict(
+        ingest_id=ingest_id,
+        modules=module,
+        since=_parse_time_param("since", since),
+        until=_parse_time_param("until", until),
+    )
+    if not DB_AVAILABLE:
+        raise HTTPException(status_code=503, detail="Database not available")
+    return filters
 
-    uvicorn.run("api_server:app", host="0.0.0.0", port=8000)
+
+async def _fetch_counts(stmt) -> list:
+    async with get_session() as session:
+        return (await session.execute(stmt)).all()
+
+
+@app.get("/api/analytics/levels")
+async def analytics_levels(
+    ingest_id: Optional[UUID] = None,
+    module: Optional[List[str]] = Query(None),
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+) -> Dict[str, int]:
+    """Level counts over stored logs, shaped like `UploadResponse.levels`."""
+    filters = _analytics_filters(ingest_id, module, since, until)
+    rows = await _fetch_counts(counts_query((_LEVEL,), **filters))
+    return summarize_levels({r.level: r.n for r in rows})
+
+
+@app.get("/api/analytics/modules")
+async def analytics_modules(
+    ingest_id: Optional[UUID] = None,
+    module: Optional[List[str]] = Query(None),
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+) -> Dict[str, int]:
+    """Row counts per module, shaped like `UploadResponse.modules`."""
+    filters = _analytics_filters(ingest_id, module, since, until)
+    rows = await _fetch_counts(counts_query((_MODULE,), **filters))
+    return {r.module: r.n for r in rows}
+
+
+@app.get("/api/analytics/levels-per-module")
+async def analytics_levels_per_module(
+    ingest_id: Optional[UUID] = None,
+    module: Optional[List[str]] = Query(None),
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+) -> Dict[str, Dict[str, int]]:
+    """Level counts within each module, shaped like `UploadResponse.levels_per_module`."""
+    filters = _analytics_filters(ingest_id, module, since, until)
+    rows = await _fetch_counts(counts_query((_MODULE, _LEVEL), **filters))
+    _, _, per_module = tables_from_pairs({(r.module, r.level): r.n for r in rows})
+    return per_module
+
+
+@app.get("/api/analytics/timeseries")
+async def analytics_timeseries(
+    resolution: str = Query("hour", pattern="^(minute|hour|day|week|month)$"),
+    module: Optional[List[str]] = Query(None),
+    level: Optional[List[str]] = Query(None),
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+):
+    """Row counts per (time bucket, module, level) across all ingests.
+
+    Served from the coarsest `log_rollups` resolution that answers the
+    request exactly (see `rollups.choose_resolution`); `source` in the
+    response says which one was used.
+    """
+    stmt, source = series_query(
+        resolution,
+        since=_parse_time_param("since", since),
+        until=_parse_time_param("until", until),
+        modules=module,
+        levels=level,
+    )
+    if not DB_AVAILABLE:
+        raise HTTPException(status_code=503, detail="Database not available")
+    rows = await _fetch_counts(stmt)
+    return {
+        "resolution": resolution,
+        "source": source,
+        "buckets": [
+            {"bucket": r.bucket.isoformat(), "module": r.module, "level": r.level, "count": int(r.count)}
+            for r in rows
+        ],
+    }
+
+
+
+def publish_important(rows: List[dict]) -> None:
+    """Ingest hook: broadcast the WARN/ERROR rows of a committed batch."""
+    if not important_stream.subscribers:
+        return
+    # All rows of a batch belong to the same ingest
+    ingest_id = str(rows[0]["ingest_id"])
+    records = (
+        (r["timestamp"].isoformat() if r["timestamp"] else None, r["level"], r["module"], r["message"])
+        for r in rows
+    )
+    for ts, level, module, message in find_important_logs(records):
+        important_stream.publish(
+            {"ingest_id": ingest_id, "timestamp": ts, "level": level, "module": module, "message": message}
+        )
+
+
+ingest_queue.on_rows = publish_important
+
+
+@app.get("/api/stream/important")
+async def stream_important(request: Request):
+    """Server-Sent Events stream of WARN/ERROR rows as ingests commit them.
+
+    Each event's `data` is a JSON object with `ingest_id`, `timestamp`,
+    `level`, `module` and `message`. A comment line is sent every
+    `STREAM_KEEPALIVE` seconds when idle. Clients whose buffer overflows are
+    sent a `dropped` event and disconnected; they should reconnect.
+    """
+    sub = important_stream.subscribe()
+
+    async def events():
+        try:
+            yield ": connected\n\n"
+            while not await request.is_disconnected():
+                try:
+                    event = await asyncio.wait_for(sub.get(), timeout=STREAM_KEEPALIVE)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                if event is DROPPED:
+                    yield "event: dropped\ndata: {}\n\n"
+                    return
+                yield f"data: {json.dumps(event)}\n\n"
+        finally:
+            important_stream.unsubscribe(sub)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @app.on_event("startup")
 async def on_startup():
+    ingest_queue.start()
     # Attempt to establish DB connectivity so `DB_AVAILABLE` is accurate.
     try:
         ok = await check_db_connection(retries=30, delay=1.0)
@@ -243,3 +705,16 @@ async def on_startup():
             logger.info("Database reachable at startup")
     except Exception:
         logger.exception("Error while checking database connectivity during startup")
+
+
+@app.on_event("shutdown")
+async def on_shutdown():
+    await ingest_queue.stop()
+    cpu_executor.shutdown()
+
+
+if __name__ == "__main__":
+    # Run with: python api_server.py  
+    import uvicorn
+
+    uvicorn.run("api_server:app", host="0.0.0.0", port=8000)
@@ -1,13 +1,37 @@
+from follow import DEFAULT_POLL_INTERVAL, FileFollower
 from log_file import LogFile
-from user_analytics import UserAnalytics
+from user_analytics import Aggregate, UserAnalytics
 import copy
 from pathlib import Path
 import logging
 import sys
+from typing import Callable, Optional
 
 
-def main(file_name: str | None = None) -> None:
+def follow_file(
+    file_name: str | Path,
+    interval: float = DEFAULT_POLL_INTERVAL,
+    stop: Optional[Callable[[], bool]] = None,
+) -> UserAnalytics:
+    """Follow a growing log file and reprint the report for every new batch.
+
+    Counts are updated incrementally from the appended records only.
+    Returns the analytics when `stop()` becomes true or on Ctrl-C.
+    """
+    analytics = UserAnalytics(aggregate=Aggregate())
+    try:
+        for records in FileFollower(file_name).follow(interval, stop):
+            analytics.update(records)
+            print(f"\n--- {len(records)} new records ({analytics.compute_all().records} total) ---")
+            analytics.generate_report()
+    except KeyboardInterrupt:
+        pass
+    return analytics
+
+
+def main(file_name: str | None = None, follow: bool = False) -> None:
     logger = logging.getLogger(__name__)
+    interval = DEFAULT_POLL_INTERVAL
     # If caller provided a filename programmatically, use it.
     # Otherwise try to read from CLI args, then prompt if stdin is a TTY,
     # and finally fall back to a sensible default for non-interactive runs.
@@ -16,7 +40,11 @@ def main(file_name: str | None = None) -> None:
         parser = argparse.ArgumentParser(add_help=False)
         parser.add_argument('file', nargs='?', help='Path to log file')
         parser.add_argument('--file', dest='file_arg', help='Path to log file')
+        parser.add_argument('--follow', action='store_true', help='Keep watching the file for new lines')
+        parser.add_argument('--interval', type=float, default=DEFAULT_POLL_INTERVAL, help='Follow poll interval (s)')
         args, _ = parser.parse_known_args()
+        follow = follow or args.follow
+        interval = args.interval
 
         # Prefer positional, then --file
         file_name = None
@@ -51,6 +79,11 @@ def main(file_name: str | None = None) -> None:
                 path = cwd_alt
                 file_name = str(cwd_alt)
 
+    if follow:
+        # A missing file is waited for, like `tail -F`
+        follow_file(path, interval)
+        return
+
     if not path.exists():
         logger.error("File not found: %s", file_name)
         raise FileNotFoundError(f"File not found: {file_name}")
@@ -60,7 +93,8 @@ def main(file_name: str | None = None) -> None:
     print(lf)
 
     try:
-        lf.parse_records()
+        # Only LEVEL and MODULE feed the report, so only those are stored
+        lf.parse_records(fields=("LEVEL", "MODULE"))
     except Exception as e:
         logger.exception("Failed to parse records for %s", file_name)
         raise RuntimeError(f"Failed to parse records: {e}") from e
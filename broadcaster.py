@@ -0,0 +1,73 @@
+"""Module broadcaster
+
+In-process fan-out of events to streaming API clients.
+
+Every subscriber gets its own bounded queue. `publish` never waits: when a
+subscriber's queue is full it is a slow consumer and is dropped (its
+buffered events are discarded and it receives `DROPPED`), so one stalled
+client cannot hold up ingest or grow memory without bound.
+
+Queues are created by `subscribe`, i.e. on the event loop of the request
+that subscribes; `publish` must be called from that same loop.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any, Set
+
+logger = logging.getLogger(__name__)
+
+# Default number of events buffered per subscriber
+DEFAULT_BUFFER = 1000
+
+# Sentinel delivered to a subscriber that fell too far behind
+DROPPED = object()
+
+
+class Subscription:
+    """One subscriber's bounded event buffer."""
+
+    def __init__(self, maxsize: int) -> None:
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.dropped = False
+
+    async def get(self) -> Any:
+        return await self.queue.get()
+
+    def _drop(self) -> None:
+        self.dropped = True
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.queue.put_nowait(DROPPED)
+
+
+class Broadcaster:
+    """Publish events to all current subscribers without blocking."""
+
+    def __init__(self, buffer: int = DEFAULT_BUFFER) -> None:
+        self.buffer = buffer
+        self.subscribers: Set[Subscription] = set()
+        self.dropped_total = 0
+
+    def subscribe(self, buffer: int | None = None) -> Subscription:
+        sub = Subscription(buffer or self.buffer)
+        self.subscribers.add(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        self.subscribers.discard(sub)
+
+    def publish(self, event: Any) -> int:
+        """Queue `event` for every subscriber; return how many received it."""
+        delivered = 0
+        for sub in list(self.subscribers):
+            try:
+                sub.queue.put_nowait(event)
+                delivered += 1
+            except asyncio.QueueFull:
+                self.subscribers.discard(sub)
+                sub._drop()
+                self.dropped_total += 1
+                logger.warning("Dropped slow stream subscriber (buffer=%d)", sub.queue.maxsize)
+        return delivered
@@ -0,0 +1,201 @@
+"""Module compression
+
+Transparent decompression of log input, detected from magic bytes.
+
+Two entry points:
+
+- `open_stream` / `open_path` wrap a readable binary stream so reads
+  return decompressed bytes (pull-based; used by `LogFile` and ingest).
+- `StreamDecompressor` takes compressed blocks as they arrive and returns
+  decompressed pieces (push-based; used by the upload pipeline).
+
+gzip, bzip2 and xz come from the standard library; zstd needs the optional
+`zstandard` package. Concatenated members/frames (as written by log
+rotation tools) are decompressed as one stream.
+"""
+from __future__ import annotations
+
+import bz2
+import gzip
+import lzma
+import zlib
+from pathlib import Path
+from typing import Any, BinaryIO, Iterator, Optional
+
+try:
+    import zstandard
+except ImportError:  # optional: only needed for .zst input
+    zstandard = None
+
+# Longest magic number below
+MAGIC_BYTES = 6
+MAGIC = {
+    "gzip": b"\x1f\x8b",
+    "bz2": b"BZh",
+    "xz": b"\xfd7zXZ\x00",
+    "zstd": b"\x28\xb5\x2f\xfd",
+}
+# Upper bound on one piece returned by `StreamDecompressor.feed` (1 MiB)
+DEFAULT_PIECE_SIZE = 1 << 20
+
+
+class CompressionError(ValueError):
+    """Raised for corrupt or truncated compressed input, or a missing codec."""
+
+
+def detect(head: bytes) -> Optional[str]:
+    """Return the compression format whose magic `head` starts with, if any."""
+    for kind, magic in MAGIC.items():
+        if head.startswith(magic):
+            return kind
+    return None
+
+
+def _require_zstd() -> None:
+    if zstandard is None:
+        raise CompressionError("zstd input requires the 'zstandard' package")
+
+
+class _Prefixed:
+    """Re-attach bytes already read from a non-seekable stream."""
+
+    def __init__(self, head: bytes, stream: BinaryIO) -> None:
+        self._head = head
+        self._stream = stream
+
+    def read(self, size: int = -1) -> bytes:
+        head, self._head = self._head, b""
+        if size is None or size < 0:
+            return head + self._stream.read()
+        if len(head) >= size:
+            self._head = head[size:]
+            return head[:size]
+        return head + self._stream.read(size - len(head))
+
+    def close(self) -> None:
+        self._stream.close()
+
+
+def open_stream(stream: BinaryIO) -> BinaryIO:
+    """Return `stream` itself if uncompressed, otherwise a decompressing reader.
+
+    The first bytes are peeked to detect the format; seekable streams are
+    rewound, others are wrapped so those bytes are not lost. Text streams
+    are returned unchanged.
+    """
+    seekable = getattr(stream, "seekable", lambda: False)()
+    start = stream.tell() if seekable else 0
+    head = stream.read(MAGIC_BYTES)
+    if not isinstance(head, (bytes, bytearray)):
+        # Text stream: cannot be compressed
+        if seekable:
+            stream.seek(start)
+            return stream
+        return _Prefixed(head, stream)  # type: ignore[arg-type]
+    if seekable:
+        stream.seek(start)
+        source: Any = stream
+    else:
+        source = _Prefixed(bytes(head), stream)
+    kind = detect(bytes(head))
+    if kind is None:
+        return source
+    if kind == "gzip":
+        return gzip.GzipFile(fileobj=source, mode="rb")
+    if kind == "bz2":
+        return bz2.BZ2File(source, mode="rb")
+    if kind == "xz":
+        return lzma.LZMAFile(source, mode="rb")
+    _require_zstd()
+    return zstandard.ZstdDecompressor().stream_reader(source, read_across_frames=True)
+
+
+def open_path(path: str | Path) -> BinaryIO:
+    """Open a file for binary reading, decompressing it if needed."""
+    fh = open(path, "rb")
+    try:
+        stream = open_stream(fh)
+    except BaseException:
+        fh.close()
+        raise
+    return stream
+
+
+def is_compressed(path: str | Path) -> bool:
+    with open(path, "rb") as fh:
+        return detect(fh.read(MAGIC_BYTES)) is not None
+
+
+class StreamDecompressor:
+    """Push-based decompressor for one compressed stream of format `kind`.
+
+    `feed` yields the decompressed bytes produced by a block of input, in
+    pieces of at most `piece_size` bytes for the standard-library formats
+    so a highly compressed block cannot expand all at once. Call `close`
+    after the last block to detect truncated input.
+    """
+
+    def __init__(self, kind: str, piece_size: int = DEFAULT_PIECE_SIZE) -> None:
+        if kind not in MAGIC:
+            raise ValueError(f"Unknown compression format {kind!r}")
+        if kind == "zstd":
+            _require_zstd()
+        self.kind = kind
+        self.piece_size = piece_size
+        self._obj = self._new()
+        # Input fed to the current member that has not reached its end yet
+        self._open = False
+
+    def _new(self) -> Any:
+        if self.kind == "gzip":
+            return zlib.decompressobj(wbits=16 + zlib.MAX_WBITS)
+        if self.kind == "bz2":
+            return bz2.BZ2Decompressor()
+        if self.kind == "xz":
+            return lzma.LZMADecompressor()
+        return zstandard.ZstdDecompressor().decompressobj()
+
+    def _step(self, data: bytes) -> tuple:
+        """Decompress some of `data`; return (output, input still to feed)."""
+        obj = self._obj
+        if self.kind == "gzip":
+            return obj.decompress(data, self.piece_size), obj.unconsumed_tail
+        if self.kind in ("bz2", "xz"):
+            return obj.decompress(data, max_length=self.piece_size), b""
+        return obj.decompress(data), b""
+
+    def _has_output(self, last: bytes) -> bool:
+        """Whether output is still buffered after a call that returned `last`."""
+        if self.kind == "zstd" or self._obj.eof:
+            return False
+        if self.kind == "gzip":
+            # zlib may hold more output whenever it stopped at max_length
+            return len(last) >= self.piece_size
+        return not self._obj.needs_input
+
+    def feed(self, data: bytes) -> Iterator[bytes]:
+        data = bytes(data)
+        out = b""
+        try:
+            while data or (self._open and self._has_output(out)):
+                self._open = True
+                out, data = self._step(data)
+                if out:
+                    yield out
+                if getattr(self._obj, "eof", False):
+                    # End of one member; anything left starts the next
+                    # (zlib also repeats it in unconsumed_tail)
+                    data = self._obj.unused_data
+                    self._obj = self._new()
+                    self._open = False
+        except (zlib.error, OSError, EOFError, lzma.LZMAError) as exc:
+            raise CompressionError(f"Corrupt {self.kind} input: {exc}") from exc
+        except Exception as exc:
+            if zstandard is not None and isinstance(exc, zstandard.ZstdError):
+                raise CompressionError(f"Corrupt {self.kind} input: {exc}") from exc
+            raise
+
+    def close(self) -> None:
+        # zstd decompressobj has no end-of-frame marker to check
+        if self._open and self.kind != "zstd":
+            raise CompressionError(f"Truncated {self.kind} input")
@@ -0,0 +1,102 @@
+"""Module cpu_executor
+
+Runs CPU-bound work (parsing, analytics) off the asyncio event loop.
+
+`CpuExecutor` owns a thread pool for small inputs and a lazily created
+process pool for large ones. Admission is bounded: at most `max_pending`
+jobs may be queued or running, and further submissions fail fast with
+`ExecutorBusy` so callers can shed load (e.g. HTTP 503) instead of piling
+work up behind the event loop.
+"""
+from __future__ import annotations
+
+import asyncio
+import functools
+import logging
+import os
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ExecutorBusy(Exception):
+    """Raised when the pending-job limit of a `CpuExecutor` is reached."""
+
+
+class CpuExecutor:
+    """Thread/process pool pair with a bounded number of pending jobs."""
+
+    def __init__(
+        self,
+        thread_workers: int = 4,
+        process_workers: Optional[int] = None,
+        max_pending: int = 64,
+        process_threshold: int = 8 * 1024 * 1024,
+    ) -> None:
+        self.thread_workers = thread_workers
+        self.process_workers = process_workers or os.cpu_count() or 1
+        self.max_pending = max_pending
+        # Inputs of at least this many bytes are sent to the process pool
+        self.process_threshold = process_threshold
+        self._threads: Optional[ThreadPoolExecutor] = None
+        self._processes: Optional[ProcessPoolExecutor] = None
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "CpuExecutor":
+        """Build an executor configured by `CPU_*` environment variables."""
+        procs = os.getenv("CPU_PROCESS_WORKERS")
+        return cls(
+            thread_workers=int(os.getenv("CPU_THREAD_WORKERS", "4")),
+            process_workers=int(procs) if procs else None,
+            max_pending=int(os.getenv("CPU_MAX_PENDING", "64")),
+            process_threshold=int(os.getenv("CPU_PROCESS_THRESHOLD", str(8 * 1024 * 1024))),
+        )
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def use_processes(self, size: Optional[int]) -> bool:
+        """Whether an input of `size` bytes should be handled by the process pool."""
+        return size is not None and size >= self.process_threshold
+
+    def _pool(self, processes: bool) -> Executor:
+        with self._lock:
+            if processes:
+                if self._processes is None:
+                    self._processes = ProcessPoolExecutor(max_workers=self.process_workers)
+                return self._processes
+            if self._threads is None:
+                self._threads = ThreadPoolExecutor(max_workers=self.thread_workers, thread_name_prefix="cpu")
+            return self._threads
+
+    async def run(self, fn: Callable[..., Any], *args: Any, processes: bool = False) -> Any:
+        """Run `fn(*args)` in the thread (or process) pool and await the result.
+
+        Raises `ExecutorBusy` without queueing when `max_pending` jobs are
+        already outstanding. Functions sent to the process pool and their
+        arguments must be picklable.
+        """
+        with self._lock:
+            if self._pending >= self.max_pending:
+                raise ExecutorBusy(f"{self._pending} CPU jobs pending")
+            self._pending += 1
+        try:
+            pool = self._pool(processes)
+            return await asyncio.get_running_loop().run_in_executor(pool, functools.partial(fn, *args))
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    def shutdown(self) -> None:
+        with self._lock:
+            threads, self._threads = self._threads, None
+            processes, self._processes = self._processes, None
+        if threads is not None:
+            threads.shutdown(wait=False, cancel_futures=True)
+        if processes is not None:
+            processes.shutdown(wait=False, cancel_futures=True)
@@ -161,4 +161,9 @@ async def init_db() -> None:
     if not DB_AVAILABLE or engine is None:
         raise RuntimeError("Database is not available in this environment")
     async with engine.begin() as conn:
+        # logs.message has a trigram index (see models.Log)
+        await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
         await conn.run_sync(Base.metadata.create_all)
+        # logs is partitioned (see partitions.py); rows without a timestamp
+        # land in the default partition, monthly ones are added at ingest
+        await conn.execute(text("CREATE TABLE IF NOT EXISTS logs_default PARTITION OF logs DEFAULT"))
@@ -0,0 +1,120 @@
+"""Module follow
+
+`tail -F`-style following of a growing log file.
+
+`FileFollower` keeps the file open at a byte offset and, on each `poll`,
+parses only the bytes appended since the last one (a partial last line is
+held until its newline arrives). It reopens the path when the file is
+rotated (the path now names a different inode) after draining the old
+file, and starts over when the file is truncated in place. A missing file
+is waited for rather than treated as an error.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import time
+from pathlib import Path
+from typing import BinaryIO, Callable, Iterator, List, Optional
+
+from log_file import DEFAULT_CHUNK_SIZE, IncrementalParser, Record
+
+logger = logging.getLogger(__name__)
+
+# Seconds between polls in `FileFollower.follow`
+DEFAULT_POLL_INTERVAL = 1.0
+
+
+class FileFollower:
+    """Incrementally parse records appended to `path`.
+
+    With `from_start=False` the content present when the file is first
+    opened is skipped, like `tail -n 0 -F`; files that appear or replace
+    it later are always read from the start.
+    """
+
+    def __init__(self, path: str | Path, from_start: bool = True, chunk_size: int = DEFAULT_CHUNK_SIZE) -> None:
+        self.path = Path(path)
+        self.from_start = from_start
+        self.chunk_size = chunk_size
+        self.offset = 0
+        self._fh: Optional[BinaryIO] = None
+        self._parser = IncrementalParser()
+        self._opened_once = False
+
+    def _open(self) -> bool:
+        try:
+            self._fh = self.path.open("rb")
+        except FileNotFoundError:
+            return False
+        self._parser = IncrementalParser()
+        self.offset = 0
+        if not self._opened_once and not self.from_start:
+            self.offset = self._fh.seek(0, os.SEEK_END)
+        self._opened_once = True
+        return True
+
+    def _drain(self) -> List[Record]:
+        assert self._fh is not None
+        records: List[Record] = []
+        while True:
+            block = self._fh.read(self.chunk_size)
+            if not block:
+                return records
+            self.offset += len(block)
+            records.extend(self._parser.feed(block))
+
+    def _replaced(self) -> bool:
+        """Whether the path now names a different file than the open one."""
+        assert self._fh is not None
+        try:
+            current = os.stat(self.path)
+        except FileNotFoundError:
+            # Rotated away and not recreated yet
+            return True
+        opened = os.fstat(self._fh.fileno())
+        return (current.st_ino, current.st_dev) != (opened.st_ino, opened.st_dev)
+
+    def poll(self) -> List[Record]:
+        """Return the records completed since the previous call."""
+        if self._fh is None and not self._open():
+            return []
+        assert self._fh is not None
+        if os.fstat(self._fh.fileno()).st_size < self.offset:
+            logger.info("%s was truncated; reading from the start", self.path)
+            self._fh.seek(0)
+            self.offset = 0
+            self._parser = IncrementalParser()
+        records = self._drain()
+        if self._replaced():
+            # The old file is complete; its last line needs no newline
+            records.extend(self._parser.close())
+            logger.info("%s was rotated; reopening", self.path)
+            self.close()
+            if self._open():
+                records.extend(self._drain())
+        return records
+
+    def follow(
+        self,
+        interval: float = DEFAULT_POLL_INTERVAL,
+        stop: Optional[Callable[[], bool]] = None,
+    ) -> Iterator[List[Record]]:
+        """Yield each non-empty batch of new records until `stop()` is true.
+
+        Runs forever (until interrupted) when `stop` is not given.
+        """
+        try:
+            while stop is None or not stop():
+                records = self.poll()
+                if records:
+                    yield records
+                else:
+                    time.sleep(interval)
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
@@ -171,6 +171,25 @@ async function loadDB() {
   }
 }
 
+// --- Live Alerts (Server-Sent Events) ---
+const MAX_ALERT_LINES = 200;
+
+function startAlertStream() {
+  const box = el('live-alerts');
+  if (!box || !window.EventSource) return;
+  const source = new EventSource('/api/stream/important');
+  source.onmessage = (ev) => {
+    const r = JSON.parse(ev.data);
+    const div = document.createElement('div');
+    div.className = r.level === 'ERROR' ? 'log-err' : 'log-warn';
+    div.textContent = `${r.timestamp || ''} [${r.level}] ${r.module || ''} - ${r.message || ''}`;
+    box.prepend(div);
+    while (box.childElementCount > MAX_ALERT_LINES) box.lastElementChild.remove();
+  };
+  // Server dropped us for falling behind; EventSource reconnects on its own
+  source.addEventListener('dropped', () => console.warn('Alert stream dropped; reconnecting'));
+}
+
 // --- Initialization ---
 async function checkDbAvailable() {
   try {
@@ -194,4 +213,5 @@ async function checkDbAvailable() {
 checkDbAvailable().finally(() => {
     // Determine default view
     showPanel('upload');
+    startAlertStream();
 });
\ No newline at end of file
@@ -1,131 +1,744 @@
 from __future__ import annotations
 
+import argparse
+import asyncio
+import glob
 import hashlib
-from typing import BinaryIO
-from sqlalchemy import select
+import io
+import itertools
+import os
+import sys
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from sqlalchemy import and_, column, or_, select, table, text, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from db import get_session
 from models import Ingest, Log
-from log_file import LogFile
+from compression import open_path, open_stream
+from log_file import RecordReader
+from partitions import ensure_partitions, list_partitions
+from rollups import with_rollups
+from timestamps import TimestampParser
 import logging
-from datetime import datetime
-from dateutil import parser as dateparser
 
 logger = logging.getLogger(__name__)
 
 
-async def ingest_bytes(session: AsyncSession, raw_bytes: bytes, filename: str | None = None) -> dict:
+# Block size used when hashing or re-reading file-like inputs (1 MiB).
+READ_CHUNK_SIZE = 1 << 20
+# Rows per INSERT statement / commit; override with INGEST_BATCH_SIZE.
+INSERT_BATCH_SIZE = int(os.getenv("INGEST_BATCH_SIZE", "5000"))
+# asyncpg allows at most 32767 bind parameters per statement and each row
+# binds one per `logs` column.
+MAX_BATCH_ROWS = 32767 // 6
+# "insert" (multi-row INSERT ... ON CONFLICT) or "copy" (COPY into a staging
+# table, then INSERT ... SELECT); override per call with `mode=`.
+INGEST_MODE = os.getenv("INGEST_MODE", "insert")
+INGEST_MODES = ("insert", "copy")
+
+# Columns written per row, in COPY order
+COPY_COLUMNS = ("ingest_id", "timestamp", "module", "level", "message", "row_hash")
+STAGING_TABLE = "logs_staging"
+# Conflict target of `uq_logs_row_hash`; it includes the partition key
+DEDUP_KEY = ["row_hash", "timestamp"]
+
+# `logs.row_hash` is a 16-byte digest stored as a Postgres UUID
+ROW_HASH_BYTES = 16
+# Length prefix that stands for a NULL field in `row_hash`
+NULL_FIELD = b"\xff\xff\xff\xff"
+# Row hashes remembered by the process-local dedup cache (0 disables it)
+DEDUP_CACHE_SIZE = int(os.getenv("INGEST_DEDUP_CACHE_SIZE", "0"))
+# Number of most recent ingests whose hashes warm the cache
+DEDUP_WARM_INGESTS = int(os.getenv("INGEST_DEDUP_WARM_INGESTS", "5"))
+# A `processing` ingest with no batch committed for this long is presumed
+# abandoned and may be resumed by another worker
+INGEST_STALE_SECONDS = int(os.getenv("INGEST_STALE_SECONDS", "300"))
+
+ProgressCallback = Callable[[int], None]
+# Called with the `logs` rows (dicts keyed by column) each committed batch
+# actually inserted
+RowsCallback = Callable[[List[dict]], None]
+
+
+async def ingest_bytes(
+    session: AsyncSession,
+    raw_bytes: bytes,
+    filename: str | None = None,
+    batch_size: Optional[int] = None,
+    mode: Optional[str] = None,
+) -> dict:
     """Ingest raw bytes of a log file into the DB.
 
     - Computes a file-level SHA256 hash to detect duplicate uploads.
     - Creates an `Ingest` row (status updated as work proceeds).
-    - Parses the file using `LogFile` and bulk-inserts into `logs` using
-      PostgreSQL `ON CONFLICT DO NOTHING` on the `row_hash` unique index.
+    - Parses the file with a `RecordReader` and bulk-inserts into `logs` in
+      batches of `batch_size` rows using PostgreSQL `ON CONFLICT DO NOTHING`
+      on `uq_logs_row_hash` (or via COPY when `mode="copy"`), creating
+      monthly `logs` partitions as needed.
 
     Returns a summary dict with `file_hash`, `ingest_id`, `total_rows`, `inserted_rows`.
     """
-    # Compute file hash
     file_hash = hashlib.sha256(raw_bytes).hexdigest()
+    return await ingest_records(
+        session, RecordReader(io.BytesIO(raw_bytes)), file_hash, filename, batch_size=batch_size, mode=mode
+    )
+
+
+async def ingest_stream(
+    session: AsyncSession,
+    file_like: BinaryIO,
+    file_hash: str,
+    filename: str | None = None,
+    ingest_id: Optional[uuid.UUID] = None,
+    on_progress: Optional[ProgressCallback] = None,
+    mode: Optional[str] = None,
+    batch_size: Optional[int] = None,
+    on_rows: Optional[RowsCallback] = None,
+) -> dict:
+    """Ingest a seekable file-like object whose SHA256 `file_hash` is already known.
+
+    The stream is parsed in `READ_CHUNK_SIZE` blocks, so only the rows being
+    prepared are held in memory rather than the file contents. Compressed
+    streams are decompressed on the fly (`file_hash` is of the stream as
+    given). A retry of an interrupted ingest seeks straight to its
+    checkpoint.
+    """
+    records = RecordReader(open_stream(file_like), chunk_size=READ_CHUNK_SIZE)
+    return await ingest_records(
+        session,
+        records,
+        file_hash,
+        filename,
+        ingest_id=ingest_id,
+        on_progress=on_progress,
+        batch_size=batch_size,
+        mode=mode,
+        on_rows=on_rows,
+    )
+
+
+async def ingest_records(
+    session: AsyncSession,
+    records: Iterable[Tuple[str, str, str, str]] | RecordReader,
+    file_hash: str,
+    filename: str | None = None,
+    ingest_id: Optional[uuid.UUID] = None,
+    on_progress: Optional[ProgressCallback] = None,
+    batch_size: Optional[int] = None,
+    mode: Optional[str] = None,
+    on_rows: Optional[RowsCallback] = None,
+) -> dict:
+    """Insert parsed `records` under an `Ingest` row keyed by `file_hash`.
+
+    Skips (and reports `skipped=True`) when a complete ingest with the same
+    hash exists. An unfinished one (failed, or left `processing` with no
+    progress for `INGEST_STALE_SECONDS`) is claimed and resumed instead:
+    with a `RecordReader` reading starts at the row's `checkpoint_offset`,
+    otherwise the first `total_rows` records are skipped without being
+    inserted again. Either way the result has `resumed=True`. An ingest
+    that another worker is still running is not touched; the result has
+    `skipped=True` and `reason="in_progress"`.
+    `ingest_id` lets callers pick the new row's id up front (e.g. a queued
+    job that already reported it); `on_progress` is called with the number
+    of rows processed so far, and `on_rows` with the rows each batch
+    inserted once it is committed (e.g. to stream them to live
+    subscribers); duplicates the database skipped are left out.
+
+    Rows are inserted in batches of `batch_size` (default
+    `INSERT_BATCH_SIZE`, capped by the driver's bind-parameter limit). Each
+    batch is committed together with the running `total_rows` /
+    `inserted_rows` and the byte `checkpoint_offset` on the `Ingest` row,
+    so large ingests can be monitored and resumed. On error the row is
+    marked `failed` before the exception propagates.
+
+    `mode="copy"` loads each batch with `copy_rows` instead of
+    `insert_rows`; it is much faster for large files, is not bound by the
+    parameter limit, and reports exact inserted counts. Defaults to
+    `INGEST_MODE`.
+
+    When the process-local `dedup_cache` is enabled, rows whose hash it
+    already holds are counted but not sent to the database.
+    """
+    mode = mode or INGEST_MODE
+    if mode not in INGEST_MODES:
+        raise ValueError(f"Unknown ingest mode {mode!r}; expected one of {INGEST_MODES}")
 
     # Check for existing ingest
-    existing = await session.scalar(select(Ingest).where(Ingest.file_hash == file_hash))
-    if existing:
+    ingest = await session.scalar(select(Ingest).where(Ingest.file_hash == file_hash))
+    resumed = ingest is not None
+    if ingest is not None and ingest.status == "complete":
         return {
             "file_hash": file_hash,
-            "ingest_id": existing.id,
-            "total_rows": existing.total_rows,
-            "inserted_rows": existing.inserted_rows,
+            "ingest_id": ingest.id,
+            "total_rows": ingest.total_rows,
+            "inserted_rows": ingest.inserted_rows,
             "skipped": True,
         }
 
-    # Create ingest row
-    ingest = Ingest(file_hash=file_hash, file_name=filename, status="processing")
-    session.add(ingest)
-    await session.flush()  # populate ingest.id
+    if ingest is None:
+        ingest = Ingest(
+            id=ingest_id or uuid.uuid4(),
+            file_hash=file_hash,
+            file_name=filename,
+            total_rows=0,
+            inserted_rows=0,
+            checkpoint_offset=0,
+        )
+        session.add(ingest)
+    elif not await _claim(session, ingest):
+        logger.info("Ingest %s is in progress elsewhere; not resuming", ingest.id)
+        return _in_progress(file_hash, ingest.id)
+    else:
+        logger.info(
+            "Resuming ingest %s at row %s (offset %s)", ingest.id, ingest.total_rows, ingest.checkpoint_offset
+        )
+        if isinstance(records, RecordReader) and ingest.checkpoint_offset is not None:
+            records.start = ingest.checkpoint_offset
+        else:
+            records = itertools.islice(records, ingest.total_rows or 0, None)
+    # Commit the ingest row first so per-batch progress is visible
+    ingest.status = "processing"
+    try:
+        await session.commit()
+    except IntegrityError:
+        # Another worker created the row for this file first
+        await session.rollback()
+        return _in_progress(file_hash, None)
 
-    # Parse records using LogFile (we pass raw bytes to avoid consuming streams twice)
-    lf = LogFile(raw_bytes)
-    parsed = lf.parse_records()
+    try:
+        await _load_batches(session, ingest, records, batch_size, mode, on_progress, on_rows)
+    except Exception:
+        await _mark_failed(session, ingest)
+        raise
 
-    ts_list = parsed.get("TIMESTAMP", [])
-    lvl_list = parsed.get("LEVEL", [])
-    mod_list = parsed.get("MODULE", [])
-    msg_list = parsed.get("MESSAGE", [])
+    total_rows = ingest.total_rows
+    inserted_rows = ingest.inserted_rows
+    logger.info("Bulk %s finished: total_rows=%s inserted=%s", mode, total_rows, inserted_rows)
 
-    total_rows = len(lvl_list)
+    ingest.status = "complete"
+    await session.commit()
+    if on_progress is not None:
+        on_progress(total_rows)
 
-    # Prepare rows for bulk insert
-    rows = []
-    for ts, lvl, mod, msg in zip(ts_list, lvl_list, mod_list, msg_list):
-        # Normalize/parse timestamp where possible
-        ts_val = None
+    return {
+        "file_hash": file_hash,
+        "ingest_id": ingest.id,
+        "total_rows": total_rows,
+        "inserted_rows": inserted_rows,
+        "skipped": False,
+        "resumed": resumed,
+    }
+
+
+async def _claim(session: AsyncSession, ingest: Ingest) -> bool:
+    """Atomically take over an unfinished ingest; False if another worker has it.
+
+    Only `failed` rows and `processing` rows whose `updated_at` heartbeat
+    (bumped by every batch commit) is older than `INGEST_STALE_SECONDS`
+    qualify, so two workers can never resume the same ingest at once.
+    """
+    stale = datetime.utcnow() - timedelta(seconds=INGEST_STALE_SECONDS)
+    result = await session.execute(
+        update(Ingest)
+        .where(
+            Ingest.id == ingest.id,
+            or_(
+                Ingest.status.in_(("pending", "failed")),
+                and_(
+                    Ingest.status == "processing",
+                    or_(Ingest.updated_at.is_(None), Ingest.updated_at < stale),
+                ),
+            ),
+        )
+        .values(status="processing", updated_at=datetime.utcnow())
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount != 1:
+        await session.rollback()
+        return False
+    return True
+
+
+def _in_progress(file_hash: str, ingest_id: Optional[uuid.UUID]) -> dict:
+    return {
+        "file_hash": file_hash,
+        "ingest_id": ingest_id,
+        "total_rows": None,
+        "inserted_rows": 0,
+        "skipped": True,
+        "reason": "in_progress",
+    }
+
+
+async def _load_batches(
+    session: AsyncSession,
+    ingest: Ingest,
+    records: Iterable[Tuple[str, str, str, str]] | RecordReader,
+    batch_size: Optional[int],
+    mode: str,
+    on_progress: Optional[ProgressCallback],
+    on_rows: Optional[RowsCallback] = None,
+) -> None:
+    """Prepare and load `records` batch by batch, checkpointing each commit."""
+    size = max(1, batch_size or INSERT_BATCH_SIZE)
+    if mode == "insert":
+        size = min(size, MAX_BATCH_ROWS)
+    load = copy_rows if mode == "copy" else insert_rows
+    cache = dedup_cache
+    if cache is not None:
+        await cache.sync(session)
+    reader = records if isinstance(records, RecordReader) else None
+    records = iter(records)
+    # One parser per file so the timestamp format is detected once
+    parse_ts = TimestampParser().parse
+
+    def prepare() -> Tuple[List[dict], Optional[int]]:
+        rows = prepare_rows(records, ingest.id, size, parse_ts)
+        # Byte offset just past the batch, read before the next batch starts
+        return rows, reader.offset if reader is not None else None
+
+    # Parse/prepare the next batch in a worker thread while the current one
+    # is being inserted, so parsing overlaps DB round trips.
+    rows, offset = await asyncio.to_thread(prepare)
+    while rows:
+        next_rows = asyncio.ensure_future(asyncio.to_thread(prepare))
         try:
-            if ts and dateparser is not None:
-                ts_val = dateparser.parse(ts)
-            else:
-                ts_val = None
-        except Exception:
-            ts_val = None
-
-        # Compute row-level hash to deduplicate identical lines across ingests
-        row_hash = hashlib.sha256("|".join([str(ts_val), str(lvl), str(mod), str(msg)]).encode("utf-8")).hexdigest()
+            batch = rows if cache is None else cache.filter(rows)
+            inserted = set(await load(session, batch)) if batch else set()
+            ingest.total_rows += len(rows)
+            ingest.inserted_rows += len(inserted)
+            ingest.checkpoint_offset = offset
+            await session.commit()
+            if cache is not None:
+                # Only remember hashes once they are committed
+                cache.add(row["row_hash"] for row in batch)
+        except BaseException:
+            # Let the reader thread finish before the stream is closed
+            await asyncio.gather(next_rows, return_exceptions=True)
+            raise
+        if on_progress is not None:
+            on_progress(ingest.total_rows)
+        if on_rows is not None and inserted:
+            on_rows(_inserted_rows(batch, inserted))
+        rows, offset = await next_rows
+
+
+def _inserted_rows(batch: List[dict], inserted: Set[uuid.UUID]) -> List[dict]:
+    """The rows of `batch` the database inserted, each hash once.
+
+    A hash repeated within the batch was inserted only the first time.
+    """
+    pending = set(inserted)
+    rows = []
+    for row in batch:
+        if row["row_hash"] in pending:
+            pending.discard(row["row_hash"])
+            rows.append(row)
+    return rows
+
+
+async def _mark_failed(session: AsyncSession, ingest: Ingest) -> None:
+    """Record a failed ingest so a retry resumes it; never raises."""
+    ingest_id = ingest.id
+    try:
+        await session.rollback()
+        ingest.status = "failed"
+        await session.commit()
+    except Exception:
+        logger.exception("Could not mark ingest %s as failed", ingest_id)
+
+
+def prepare_rows(
+    records: Iterator[Tuple[str, str, str, str]],
+    ingest_id: uuid.UUID,
+    limit: int,
+    parse_ts: Optional[Callable[[str], Optional[datetime]]] = None,
+) -> List[dict]:
+    """Take up to `limit` records from `records` and build `logs` insert rows.
+
+    `parse_ts` turns the timestamp text into a datetime (None if unparseable);
+    defaults to a fresh `TimestampParser`.
+    """
+    parse_ts = parse_ts or TimestampParser().parse
+    rows = []
+    for record in itertools.islice(records, limit):
+        ts, lvl, mod, msg = record
+        parsed = parse_ts(ts)
         rows.append(
             {
-                "ingest_id": ingest.id,
-                "timestamp": ts_val,
+                "ingest_id": ingest_id,
+                "timestamp": parsed,
                 "module": mod,
                 "level": lvl,
                 "message": msg,
-                "row_hash": row_hash,
+                # Row-level hash to deduplicate identical lines across ingests
+                "row_hash": row_hash(parsed, lvl, mod, msg),
             }
         )
+    return rows
 
-    inserted_rows = 0
-    if rows:
-        # Use the mapped table for bulk insert so SQLAlchemy Core targets the table
-        stmt = pg_insert(Log.__table__).values(rows)
-        stmt = stmt.on_conflict_do_nothing(index_elements=["row_hash"])
-        result = await session.execute(stmt)
-        # `rowcount` is best-effort; reflect inserted rows conservatively
-        try:
-            inserted_rows = result.rowcount or 0
-        except Exception:
-            inserted_rows = 0
-        logger.info("Bulk insert attempted: total_rows=%s inserted_estimate=%s", total_rows, inserted_rows)
-
-    # Update ingest record
-    ingest.total_rows = total_rows
-    ingest.inserted_rows = inserted_rows
-    ingest.status = "complete"
-    await session.commit()
 
-    return {
-        "file_hash": file_hash,
-        "ingest_id": ingest.id,
-        "total_rows": total_rows,
-        "inserted_rows": inserted_rows,
-        "skipped": False,
-    }
+class RowHashCache:
+    """Bounded LRU set of row hashes known to be in `logs`.
+
+    Overlapping uploads repeat most of their rows; filtering those out here
+    saves shipping them to Postgres only to be discarded by
+    `ON CONFLICT DO NOTHING`. The cache is exact (no false positives), so a
+    miss just means the database makes the decision as before.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self.warmed = False
+        self.hits = 0
+        self._hashes: "OrderedDict[uuid.UUID, None]" = OrderedDict()
+        # `logs` partitions present when the cache was last synced
+        self._partitions: Set[str] = set()
+
+    @classmethod
+    def from_env(cls) -> Optional["RowHashCache"]:
+        return cls(DEDUP_CACHE_SIZE) if DEDUP_CACHE_SIZE > 0 else None
+
+    def __len__(self) -> int:
+        return len(self._hashes)
+
+    def __contains__(self, h: uuid.UUID) -> bool:
+        return h in self._hashes
+
+    def add(self, hashes: Iterable[uuid.UUID]) -> None:
+        store = self._hashes
+        for h in hashes:
+            store[h] = None
+            store.move_to_end(h)
+        while len(store) > self.maxsize:
+            store.popitem(last=False)
+
+    def clear(self) -> None:
+        self._hashes.clear()
+
+    def filter(self, rows: List[dict]) -> List[dict]:
+        """Return `rows` minus known hashes and repeats within the batch."""
+        store = self._hashes
+        seen = set()
+        kept = []
+        for row in rows:
+            h = row["row_hash"]
+            if h in store:
+                store.move_to_end(h)
+                self.hits += 1
+            elif h not in seen:
+                seen.add(h)
+                kept.append(row)
+        return kept
+
+    async def sync(self, session: AsyncSession) -> None:
+        """Warm the cache once, and start over after retention dropped rows.
+
+        Hashes of dropped rows must not stay known, or re-uploading those
+        rows would skip them. Retention usually runs in another process
+        (`python -m partitions`), so the partitions are compared with the
+        last sync instead of relying on it to clear this cache.
+        """
+        partitions = set(await list_partitions(session))
+        if self._partitions - partitions:
+            logger.info("logs partitions were dropped; clearing the dedup cache")
+            self.clear()
+            self.warmed = False
+        self._partitions = partitions
+        if not self.warmed:
+            await self.warm(session)
+
+    async def warm(self, session: AsyncSession, ingests: int = DEDUP_WARM_INGESTS) -> int:
+        """Load hashes of the `ingests` most recent ingests; return how many."""
+        self.warmed = True
+        recent = select(Ingest.id).order_by(Ingest.created_at.desc()).limit(ingests)
+        result = await session.execute(
+            select(Log.row_hash).where(Log.ingest_id.in_(recent)).limit(self.maxsize)
+        )
+        hashes = result.scalars().all()
+        self.add(hashes)
+        logger.info("Dedup cache warmed with %d row hashes", len(hashes))
+        return len(hashes)
+
+
+dedup_cache: Optional[RowHashCache] = RowHashCache.from_env()
+
+
+def row_hash(
+    timestamp: Optional[datetime],
+    level: Optional[str],
+    module: Optional[str],
+    message: Optional[str],
+) -> uuid.UUID:
+    """128-bit BLAKE2b digest of a row's stored `logs` column values.
+
+    It depends only on what is stored, so it can be recomputed from the
+    table (see migration 0002). Each field is fed to the digest separately,
+    prefixed with its byte length (`NULL_FIELD` for None), so no joined
+    string is built and field boundaries stay unambiguous.
+    """
+    digest = hashlib.blake2b(digest_size=ROW_HASH_BYTES)
+    for value in (None if timestamp is None else timestamp.isoformat(), level, module, message):
+        if value is None:
+            digest.update(NULL_FIELD)
+            continue
+        data = value.encode("utf-8")
+        digest.update(len(data).to_bytes(4, "little"))
+        digest.update(data)
+    return uuid.UUID(bytes=digest.digest())
+
+
+async def insert_rows(session: AsyncSession, rows: List[dict]) -> List[uuid.UUID]:
+    """Insert one batch with `ON CONFLICT DO NOTHING`.
+
+    Returns the `row_hash` of each row inserted; the same statement adds
+    those rows to `log_rollups`.
+    """
+    await ensure_partitions(session, rows)
+    # Use the mapped table for bulk insert so SQLAlchemy Core targets the table
+    stmt = pg_insert(Log.__table__).values(rows)
+    stmt = stmt.on_conflict_do_nothing(index_elements=DEDUP_KEY)
+    result = await session.execute(with_rollups(stmt))
+    return list(result.scalars())
+
+
+async def copy_rows(session: AsyncSession, rows: List[dict]) -> List[uuid.UUID]:
+    """COPY one batch into a staging table and merge it into `logs`.
+
+    The temporary staging table lives for the session's connection and is
+    emptied on commit. Returns the `row_hash` of each row inserted, i.e.
+    not already present; those rows are also added to `log_rollups`.
+    """
+    await ensure_partitions(session, rows)
+    conn = await session.connection()
+    await conn.execute(
+        text(
+            f"CREATE TEMP TABLE IF NOT EXISTS {STAGING_TABLE} ON COMMIT DELETE ROWS AS "
+            f"SELECT {', '.join(COPY_COLUMNS)} FROM logs WITH NO DATA"
+        )
+    )
+    raw = await conn.get_raw_connection()
+    # Underlying asyncpg connection
+    driver = raw.driver_connection
+    await driver.copy_records_to_table(
+        STAGING_TABLE,
+        records=[tuple(row[c] for c in COPY_COLUMNS) for row in rows],
+        columns=COPY_COLUMNS,
+    )
+    staging = table(STAGING_TABLE, *(column(c) for c in COPY_COLUMNS))
+    stmt = pg_insert(Log.__table__).from_select(COPY_COLUMNS, select(*staging.c))
+    stmt = stmt.on_conflict_do_nothing(index_elements=DEDUP_KEY)
+    result = await session.execute(with_rollups(stmt))
+    return list(result.scalars())
 
 
-async def ingest_file_like(file_like: BinaryIO, filename: str | None = None) -> dict:
-    """Helper that reads a file-like object into bytes and calls `ingest_bytes`."""
-    raw = file_like.read()
-    if isinstance(raw, str):
-        raw = raw.encode("utf-8")
+def hash_file_like(file_like: BinaryIO) -> str:
+    """SHA256 of a file-like object read in blocks; rewinds it afterwards."""
+    digest = hashlib.sha256()
+    while True:
+        block = file_like.read(READ_CHUNK_SIZE)
+        if not block:
+            break
+        digest.update(block.encode("utf-8") if isinstance(block, str) else block)
+    file_like.seek(0)
+    return digest.hexdigest()
+
+
+async def ingest_file_like(
+    file_like: BinaryIO,
+    filename: str | None = None,
+    file_hash: str | None = None,
+    ingest_id: Optional[uuid.UUID] = None,
+    on_progress: Optional[ProgressCallback] = None,
+    mode: Optional[str] = None,
+    on_rows: Optional[RowsCallback] = None,
+) -> dict:
+    """Ingest a seekable file-like object without reading it into memory.
+
+    Pass `file_hash` when the caller already hashed the stream (e.g. the
+    upload pipeline); otherwise it is computed with an extra block-wise read.
+    """
+    if file_hash is None:
+        file_hash = hash_file_like(file_like)
     try:
         async with get_session() as session:
-            return await ingest_bytes(session, raw, filename=filename)
+            return await ingest_stream(
+                session,
+                file_like,
+                file_hash,
+                filename=filename,
+                ingest_id=ingest_id,
+                on_progress=on_progress,
+                mode=mode,
+                on_rows=on_rows,
+            )
     except RuntimeError:
         # Database not available; return a clear non-fatal result so callers
         # (e.g., the upload endpoint) can continue to return analytics to the user.
         return {
-            "file_hash": hashlib.sha256(raw).hexdigest(),
+            "file_hash": file_hash,
             "ingest_id": None,
             "total_rows": None,
             "inserted_rows": 0,
             "skipped": True,
             "reason": "database_unavailable",
         }
+
+
+# --- Batch ingest CLI: python -m ingest PATH_OR_GLOB... ---------------------
+
+def expand_paths(args: Iterable[str]) -> List[Path]:
+    """Resolve files, directories (their files) and glob patterns, deduplicated."""
+    paths: Dict[Path, None] = {}
+    for arg in args:
+        p = Path(arg)
+        if p.is_dir():
+            matches = sorted(c for c in p.iterdir() if c.is_file())
+        elif glob.has_magic(arg):
+            matches = sorted(Path(m) for m in glob.glob(arg, recursive=True) if os.path.isfile(m))
+        else:
+            matches = [p]
+        for m in matches:
+            paths[m.resolve()] = None
+    return list(paths)
+
+
+def file_stat(path: Path) -> Tuple[int, datetime]:
+    st = path.stat()
+    return st.st_size, datetime.utcfromtimestamp(st.st_mtime)
+
+
+async def unchanged_ingested(session: AsyncSession, paths: List[Path]) -> Set[Path]:
+    """Paths whose complete ingest recorded the same size and mtime they have now."""
+    stats = {str(p): file_stat(p) for p in paths}
+    result = await session.execute(
+        select(Ingest.file_name, Ingest.file_size, Ingest.file_mtime).where(
+            Ingest.status == "complete", Ingest.file_name.in_(list(stats))
+        )
+    )
+    return {Path(name) for name, size, mtime in result if stats.get(name) == (size, mtime)}
+
+
+async def ingest_path(
+    path: Path,
+    mode: Optional[str] = None,
+    batch_size: Optional[int] = None,
+) -> dict:
+    """Hash and ingest one (possibly compressed) file, recording its stat."""
+    size, mtime = file_stat(path)
+    with open(path, "rb") as raw:
+        file_hash = await asyncio.to_thread(hash_file_like, raw)
+    with open_path(path) as fh:
+        async with get_session() as session:
+            result = await ingest_stream(
+                session, fh, file_hash, filename=str(path), mode=mode, batch_size=batch_size
+            )
+            if not result["skipped"]:
+                # Lets the next run skip this file without reading it
+                await session.execute(
+                    update(Ingest)
+                    .where(Ingest.id == result["ingest_id"])
+                    .values(file_size=size, file_mtime=mtime)
+                )
+                await session.commit()
+    result["path"] = str(path)
+    result["bytes"] = size
+    return result
+
+
+async def ingest_paths(
+    paths: List[Path],
+    jobs: int = 4,
+    mode: Optional[str] = None,
+    batch_size: Optional[int] = None,
+) -> List[dict]:
+    """Ingest `paths` with up to `jobs` files in flight on the shared engine."""
+    async with get_session() as session:
+        unchanged = await unchanged_ingested(session, paths)
+    results = [{"path": str(p), "skipped": True, "reason": "unchanged"} for p in paths if p in unchanged]
+    sem = asyncio.Semaphore(max(1, jobs))
+
+    async def run(path: Path) -> dict:
+        async with sem:
+            started = time.perf_counter()
+            try:
+                result = await ingest_path(path, mode=mode, batch_size=batch_size)
+            except Exception as exc:
+                logger.exception("Ingest of %s failed", path)
+                result = {"path": str(path), "skipped": False, "error": repr(exc)}
+            result["seconds"] = time.perf_counter() - started
+            _print_result(result)
+            return result
+
+    results += await asyncio.gather(*(run(p) for p in paths if p not in unchanged))
+    return results
+
+
+def _print_result(result: dict) -> None:
+    if result.get("error"):
+        print(f"FAILED  {result['path']}: {result['error']}")
+    elif result.get("skipped"):
+        print(f"skipped {result['path']} (already ingested)")
+    else:
+        print(
+            f"ok      {result['path']}: {result['total_rows']} rows, "
+            f"{result['inserted_rows']} new in {result['seconds']:.2f}s"
+        )
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m ingest",
+        description="Ingest log files (plain or gzip/bzip2/xz/zstd compressed) into the database",
+    )
+    parser.add_argument("paths", nargs="+", help="Files, directories or glob patterns")
+    parser.add_argument("--jobs", type=int, default=4, help="Files ingested concurrently (default: 4)")
+    parser.add_argument("--mode", choices=INGEST_MODES, default=None, help="Load mode (default: INGEST_MODE)")
+    parser.add_argument("--batch-size", type=int, default=None, help="Rows per batch (default: INGEST_BATCH_SIZE)")
+    args = parser.parse_args(argv)
+
+    paths = expand_paths(args.paths)
+    missing = [p for p in paths if not p.is_file()]
+    if missing:
+        for p in missing:
+            print(f"File not found: {p}", file=sys.stderr)
+        return 1
+    if not paths:
+        print("No files matched", file=sys.stderr)
+        return 1
+
+    started = time.perf_counter()
+    try:
+        results = asyncio.run(ingest_paths(paths, jobs=args.jobs, mode=args.mode, batch_size=args.batch_size))
+    except (RuntimeError, OSError) as exc:
+        # No async driver, or the database is unreachable
+        print(f"Ingest failed: {exc!r}", file=sys.stderr)
+        return 1
+    elapsed = time.perf_counter() - started
+
+    done = [r for r in results if not r.get("skipped") and not r.get("error")]
+    rows = sum(r["total_rows"] for r in done)
+    size = sum(r["bytes"] for r in done)
+    failed = sum(1 for r in results if r.get("error"))
+    print(
+        f"{len(done)} ingested, {len(results) - len(done) - failed} skipped, {failed} failed: "
+        f"{rows} rows ({sum(r['inserted_rows'] for r in done)} new), {size / 1e6:.1f} MB "
+        f"in {elapsed:.2f}s = {rows / elapsed if elapsed else 0:.0f} rows/s, "
+        f"{size / 1e6 / elapsed if elapsed else 0:.1f} MB/s"
+    )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s %(levelname)s %(name)s: %(message)s"
+    )
+    raise SystemExit(main())
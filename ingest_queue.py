@@ -0,0 +1,200 @@
+"""Module ingest_queue
+
+Background DB ingest for uploaded files.
+
+`/upload` spools the upload to a temporary file while it streams through
+the pipeline, then hands it to `IngestQueue.submit` and responds with the
+ingest id straight away. A fixed number of worker tasks drain the bounded
+queue and run `ingest.ingest_file_like`, so upload latency no longer
+includes the Postgres insert. `submit` waits for queue space, which applies
+backpressure to uploads when ingest falls behind.
+
+Job state is kept in memory (most recent `history` jobs) so
+`GET /api/ingests/{id}` can report jobs that are still queued or have
+failed before an `Ingest` row was written.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import ingest as ingest_mod
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class IngestJob:
+    """One queued ingest and its progress."""
+
+    path: str
+    file_hash: str
+    file_name: Optional[str] = None
+    id: uuid.UUID = field(default_factory=uuid.uuid4)
+    status: str = "queued"
+    processed_rows: int = 0
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    created_at: datetime = field(default_factory=datetime.utcnow)
+
+    @property
+    def resumed_into(self) -> Optional[uuid.UUID]:
+        """Id of the `Ingest` row holding this job's rows, if not `id`.
+
+        Set when the upload was a retry that finished an earlier, unfinished
+        ingest of the same file (see `ingest.ingest_records`).
+        """
+        ingest_id = (self.result or {}).get("ingest_id")
+        if self.status != "complete" or ingest_id is None or ingest_id == self.id:
+            return None
+        return ingest_id
+
+    def to_dict(self) -> Dict[str, Any]:
+        duplicate_of = (self.result or {}).get("ingest_id") if self.status == "duplicate" else None
+        resumed_into = self.resumed_into
+        return {
+            "id": str(self.id),
+            "status": self.status,
+            "file_hash": self.file_hash,
+            "file_name": self.file_name,
+            "created_at": self.created_at.isoformat(),
+            "processed_rows": self.processed_rows,
+            "total_rows": (self.result or {}).get("total_rows"),
+            "inserted_rows": (self.result or {}).get("inserted_rows"),
+            "duplicate_of": str(duplicate_of) if duplicate_of else None,
+            "resumed_into": str(resumed_into) if resumed_into else None,
+            "error": self.error,
+        }
+
+
+class IngestQueue:
+    """Bounded queue of `IngestJob`s drained by `workers` asyncio tasks."""
+
+    def __init__(
+        self,
+        workers: int = 2,
+        maxsize: int = 100,
+        history: int = 1000,
+        on_rows: Optional[ingest_mod.RowsCallback] = None,
+    ) -> None:
+        self.workers = workers
+        self.maxsize = maxsize
+        self.history = history
+        # Passed through to the ingest; sees each committed batch of rows
+        self.on_rows = on_rows
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._jobs: "OrderedDict[uuid.UUID, IngestJob]" = OrderedDict()
+
+    @classmethod
+    def from_env(cls) -> "IngestQueue":
+        return cls(
+            workers=int(os.getenv("INGEST_WORKERS", "2")),
+            maxsize=int(os.getenv("INGEST_QUEUE_SIZE", "100")),
+        )
+
+    @property
+    def running(self) -> bool:
+        return self._queue is not None
+
+    def start(self) -> None:
+        """Create the queue and worker tasks on the running event loop."""
+        if self._queue is not None:
+            return
+        self._queue = asyncio.Queue(maxsize=self.maxsize)
+        self._tasks = [asyncio.create_task(self._worker(i)) for i in range(self.workers)]
+
+    async def stop(self) -> None:
+        """Cancel the workers and fail every job they had not finished.
+
+        Jobs still waiting in the queue are marked failed with error
+        "cancelled" and their spooled files removed; the client has to
+        upload them again.
+        """
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        queue, self._queue = self._queue, None
+        while queue is not None and not queue.empty():
+            job = queue.get_nowait()
+            queue.task_done()
+            job.status = "failed"
+            job.error = "cancelled"
+            self._remove_spool(job)
+
+    def get(self, job_id: uuid.UUID) -> Optional[IngestJob]:
+        return self._jobs.get(job_id)
+
+    async def submit(self, path: str, file_hash: str, file_name: Optional[str] = None) -> IngestJob:
+        """Queue the spooled file at `path`; the worker deletes it when done.
+
+        Waits while the queue is full. Raises RuntimeError if not started.
+        """
+        if self._queue is None:
+            raise RuntimeError("Ingest queue is not running")
+        job = IngestJob(path=path, file_hash=file_hash, file_name=file_name)
+        self._jobs[job.id] = job
+        while len(self._jobs) > self.history:
+            self._jobs.popitem(last=False)
+        await self._queue.put(job)
+        return job
+
+    async def _worker(self, n: int) -> None:
+        queue = self._queue
+        assert queue is not None
+        while True:
+            job = await queue.get()
+            try:
+                await self._process(job)
+            except asyncio.CancelledError:
+                # Shutting down mid-ingest; a retry resumes from the checkpoint
+                job.status = "failed"
+                job.error = "cancelled"
+                raise
+            except Exception as exc:
+                job.status = "failed"
+                job.error = repr(exc)
+                logger.exception("Ingest job %s failed in worker %d", job.id, n)
+            finally:
+                queue.task_done()
+                self._remove_spool(job)
+
+    @staticmethod
+    def _remove_spool(job: IngestJob) -> None:
+        try:
+            os.unlink(job.path)
+        except OSError:
+            logger.warning("Could not remove spooled upload %s", job.path)
+
+    async def _process(self, job: IngestJob) -> None:
+        job.status = "processing"
+
+        def on_progress(rows: int) -> None:
+            job.processed_rows = rows
+
+        with open(job.path, "rb") as fh:
+            result = await ingest_mod.ingest_file_like(
+                fh,
+                filename=job.file_name,
+                file_hash=job.file_hash,
+                ingest_id=job.id,
+                on_progress=on_progress,
+                on_rows=self.on_rows,
+            )
+        job.result = result
+        if result.get("reason") == "database_unavailable":
+            job.status = "failed"
+            job.error = "database_unavailable"
+        elif result.get("skipped"):
+            # Same file already ingested (or being ingested) under another id
+            job.status = "duplicate"
+        else:
+            job.status = "complete"
+        logger.info("Ingest job %s finished: %s", job.id, result)
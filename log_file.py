@@ -1,17 +1,321 @@
 from __future__ import annotations
 
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
 from pathlib import Path
+import codecs
+import io
+import itertools
 import logging
-from typing import Dict, List, Any
+import mmap
+from operator import itemgetter
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
 import re
 
+from compression import MAGIC_BYTES, detect, is_compressed, open_path, open_stream
+from log_records import COLUMNS, LogRecords
+
 logger = logging.getLogger(__name__)
 
+# Size of the byte blocks read by the streaming parser (1 MiB).
+DEFAULT_CHUNK_SIZE = 1 << 20
+# Number of records per columnar batch yielded by `LogFile.iter_batches`.
+DEFAULT_BATCH_SIZE = 10_000
+# Smallest byte range handed to a parallel parse worker (4 MiB). Smaller
+# files are parsed in-process since pool startup would dominate.
+MIN_RANGE_BYTES = 4 << 20
+
+# Regex: timestamp (non-space), level (non-space), module (non-space), message (rest)
+LINE_PATTERN = re.compile(r"^(\S+)\s+(\S+)\s+(\S+)\s+(.*)$")
+
+# What `str.splitlines` (which the original parser used) ends a line on
+LINE_BREAKS = ("\n", "\r", "\x0b", "\x0c", "\x1c", "\x1d", "\x1e", "\x85", "\u2028", "\u2029")
+
+# Byte-level counterpart of LINE_PATTERN used by the buffer scanner. Field
+# separators are restricted to spaces and tabs so a match never crosses a
+# line boundary when run over a whole file in MULTILINE mode.
+# The fast alternative only accepts lines whose fields (and the first byte
+# of the message) are free of anything `\s` matches in a str pattern but not
+# in a bytes one (\x1c-\x1f, and non-ASCII such as U+00A0), and whose
+# message holds none of LINE_BREAKS (nor the lead bytes \xc2/\xe2 of the
+# non-ASCII ones); every other line is captured whole by the last group and
+# re-parsed with `str.splitlines` and LINE_PATTERN, so both parsers always
+# agree.
+_FIELD = rb"[^\s\x1c-\x1f\x80-\xff]+"
+_SEP = rb"[ \t]+"
+LINE_PATTERN_BYTES = re.compile(
+    rb"^(?:(" + _FIELD + rb")" + _SEP + rb"(" + _FIELD + rb")" + _SEP + rb"(" + _FIELD + rb")" + _SEP
+    + rb"((?:[^\s\x1c-\x1f\x80-\xff][^\n\r\x0b\x0c\x1c-\x1e\xc2\xe2]*)?)\r?$|([^\n]*)$)",
+    re.MULTILINE,
+)
+
+Record = Tuple[str, str, str, str]
+
+
+def parse_line(line: str) -> Record | None:
+    """Split a single log line into (timestamp, level, module, message).
+
+    Returns None for blank or malformed lines.
+    """
+    line = line.rstrip("\r\n")
+    if not line.strip():
+        return None
+    m = LINE_PATTERN.match(line)
+    if not m:
+        return None
+    return m.groups()
+
+
+def scan_buffer(
+    buf: bytes | bytearray | memoryview | mmap.mmap,
+    fields: Iterable[str] = COLUMNS,
+    start: int = 0,
+    end: int | None = None,
+) -> Iterator[Tuple[str, ...]]:
+    """Scan a bytes-like buffer for records without splitting it into lines.
+
+    Line and field boundaries are located by `LINE_PATTERN_BYTES` directly on
+    the buffer (which may be an mmap), and only the requested `fields` are
+    copied out and decoded. Lines outside its fast path are decoded and
+    parsed with `parse_line`. Yields tuples ordered like `fields`.
+    """
+    idx = [COLUMNS.index(f) for f in fields]
+    groups = [i + 1 for i in idx]
+    if end is None:
+        end = len(buf)
+    for m in LINE_PATTERN_BYTES.finditer(buf, start, end):
+        line = m.group(5)
+        if line is None:
+            if len(groups) == 1:
+                yield (m.group(groups[0]).decode("utf-8"),)
+            else:
+                yield tuple(v.decode("utf-8") for v in m.group(*groups))
+        elif line.strip():
+            for part in line.decode("utf-8").splitlines():
+                rec = parse_line(part)
+                if rec is not None:
+                    yield tuple(rec[i] for i in idx)
+
+
+class IncrementalParser:
+    """Push-based line parser for input that arrives in arbitrary blocks.
+
+    Bytes are decoded with an incremental UTF-8 decoder so multi-byte
+    characters split across block boundaries are handled, and the partial
+    last line of each block is carried over to the next one. Lines end
+    wherever `str.splitlines` ends them (`LINE_BREAKS`, with "\\r\\n" as
+    one break), so CR-only files parse line by line. Call `feed` for every
+    block and `close` once at the end of input.
+    """
+
+    def __init__(self) -> None:
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._pending = ""
+        self.line_count = 0
+
+    def feed_lines(self, block: bytes | bytearray | memoryview | str) -> List[str]:
+        """Return the complete lines (without newline) finished by `block`."""
+        text = block if isinstance(block, str) else self._decoder.decode(block)
+        if not text:
+            return []
+        text = self._pending + text
+        lines = text.splitlines()
+        if text.endswith("\r"):
+            # May be the first half of a "\r\n" split across blocks
+            self._pending = lines.pop() + "\r"
+        elif text.endswith(LINE_BREAKS):
+            self._pending = ""
+        else:
+            self._pending = lines.pop()
+        self.line_count += len(lines)
+        return lines
+
+    def close_lines(self) -> List[str]:
+        """Flush the decoder and return the final unterminated line, if any."""
+        lines = (self._pending + self._decoder.decode(b"", final=True)).splitlines()
+        self._pending = ""
+        self.line_count += len(lines)
+        return lines
+
+    def _parse(self, lines: List[str]) -> List[Record]:
+        records: List[Record] = []
+        first = self.line_count - len(lines) + 1
+        for idx, line in enumerate(lines, start=first):
+            rec = parse_line(line)
+            if rec is None:
+                if line.strip():
+                    logger.debug("Skipping malformed line %d (no match): %r", idx, line)
+                continue
+            records.append(rec)
+        return records
+
+    def feed(self, block: bytes | bytearray | memoryview | str) -> List[Record]:
+        """Return the records completed by `block`; malformed lines are skipped."""
+        return self._parse(self.feed_lines(block))
+
+    def close(self) -> List[Record]:
+        """Return the record on the final unterminated line, if any."""
+        return self._parse(self.close_lines())
+
+
+class RecordReader:
+    """Iterate the records of a seekable binary stream, tracking byte offsets.
+
+    Reading starts at byte `start` (which must be a line start). While
+    iterating, `offset` is the position just past the line of the last
+    record yielded, so a consumer that stops after any record can resume
+    later with `RecordReader(stream, start=reader.offset)`. Lines are split
+    like `IncrementalParser` splits them.
+    """
+
+    def __init__(self, stream: Any, start: int = 0, chunk_size: int = DEFAULT_CHUNK_SIZE) -> None:
+        self.stream = stream
+        self.start = start
+        self.chunk_size = chunk_size
+        self.offset = start
+
+    def __iter__(self) -> Iterator[Record]:
+        self.stream.seek(self.start)
+        pos = self.offset = self.start
+        carry = b""
+        while True:
+            block = self.stream.read(self.chunk_size)
+            if not block:
+                break
+            data = carry + block
+            cut = data.rfind(b"\n") + 1
+            carry = data[cut:]
+            lines = data[:cut]
+            if not _has_other_breaks(lines):
+                for line in lines.split(b"\n")[:-1]:
+                    pos += len(line) + 1
+                    rec = parse_line(line.decode("utf-8"))
+                    if rec is not None:
+                        self.offset = pos
+                        yield rec
+                continue
+            for line in lines.split(b"\n")[:-1]:
+                end = pos + len(line) + 1
+                for rec, self.offset in _line_records(line, pos, end):
+                    yield rec
+                pos = end
+        if carry:
+            for rec, self.offset in _line_records(carry, pos, pos + len(carry)):
+                yield rec
+
+
+def _has_other_breaks(data: bytes) -> bool:
+    """Whether UTF-8 `data` holds any of LINE_BREAKS besides "\\n" and "\\r\\n".
+
+    Single bytes are looked for first since `in` finds those fastest.
+    """
+    if b"\r" in data and data.count(b"\r") != data.count(b"\r\n"):
+        return True
+    if any(b in data for b in (b"\x0b", b"\x0c", b"\x1c", b"\x1d", b"\x1e")):
+        return True
+    return (b"\x85" in data and b"\xc2\x85" in data) or (
+        (b"\xa8" in data or b"\xa9" in data) and (b"\xe2\x80\xa8" in data or b"\xe2\x80\xa9" in data)
+    )
+
+
+def _line_records(line: bytes, start: int, end: int) -> Iterator[Tuple[Record, int]]:
+    """Parse the newline-free bytes `line` spanning [start, end) of a stream.
+
+    `str.splitlines` may find more line breaks inside it (a lone "\\r",
+    "\\x0c", U+2028...). Each record is paired with the offset just past its
+    own line; the last one's is `end`.
+    """
+    text = line.decode("utf-8")
+    parts = text.splitlines(True)
+    if len(parts) <= 1:
+        rec = parse_line(text)
+        if rec is not None:
+            yield rec, end
+        return
+    for i, part in enumerate(parts, start=1):
+        start += len(part.encode("utf-8"))
+        rec = parse_line(part.splitlines()[0])
+        if rec is not None:
+            yield rec, end if i == len(parts) else start
+
+
+def split_ranges(buf: bytes | mmap.mmap, parts: int) -> List[Tuple[int, int]]:
+    """Split `buf` into at most `parts` (start, end) byte ranges.
+
+    Every boundary is moved forward to just past the next newline so no
+    line straddles two ranges. Ranges are never smaller than
+    `MIN_RANGE_BYTES` (except the last).
+    """
+    size = len(buf)
+    parts = max(1, min(parts, size // MIN_RANGE_BYTES or 1))
+    bounds = [0]
+    for i in range(1, parts):
+        nl = buf.find(b"\n", max(size * i // parts, bounds[-1]))
+        if nl == -1 or nl + 1 >= size:
+            break
+        bounds.append(nl + 1)
+    bounds.append(size)
+    return list(zip(bounds, bounds[1:]))
+
+
+def fill_columns(
+    logs: LogRecords | Dict[str, List[str]],
+    fields: Tuple[str, ...],
+    records: Iterable[Tuple[str, ...]],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> None:
+    """Append `records` (tuples ordered like `fields`) to the matching columns.
+
+    Records are transposed in batches so each column is extended in bulk.
+    """
+    columns = [(logs[f], itemgetter(i)) for i, f in enumerate(fields)]
+    records = iter(records)
+    while True:
+        batch = list(itertools.islice(records, batch_size))
+        if not batch:
+            return
+        # Much faster than zip(*batch) for batches this wide
+        for column, get in columns:
+            column.extend(list(map(get, batch)))
+
+
+def _project(records: Iterable[Record], fields: Tuple[str, ...]) -> Iterable[Tuple[str, ...]]:
+    """Narrow full records to tuples ordered like `fields`."""
+    if fields == COLUMNS:
+        return records
+    get = itemgetter(*(COLUMNS.index(f) for f in fields))
+    return ((get(rec),) for rec in records) if len(fields) == 1 else map(get, records)
+
+
+def _read_range(path: str, start: int, end: int, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Record]:
+    parser = IncrementalParser()
+    with open(path, "rb") as fh:
+        fh.seek(start)
+        remaining = end - start
+        while remaining > 0:
+            block = fh.read(min(chunk_size, remaining))
+            if not block:
+                break
+            remaining -= len(block)
+            yield from parser.feed(block)
+    yield from parser.close()
+
+
+def _parse_range(path: str, start: int, end: int, fields: Tuple[str, ...]) -> LogRecords:
+    """Worker entry point: parse one newline-aligned byte range of `path`.
+
+    The range is read in blocks and parsed by `IncrementalParser`, the same
+    str path `iter_records` uses. Returns a `LogRecords`, which pickles as
+    a handful of arrays rather than one object per field.
+    """
+    out = LogRecords()
+    fill_columns(out, fields, _project(_read_range(path, start, end), fields))
+    return out
+
 
 @dataclass
 class LogFile:
-    """Parse a simple whitespace-delimited log file into columnar lists.
+    """Parse a simple whitespace-delimited log file into columns.
 
     Expected line format (minimum):
         <TIMESTAMP> <LEVEL> <MODULE> <MESSAGE...>
@@ -19,18 +323,17 @@ class LogFile:
     The parser recognizes standard levels including DEBUG, INFO, WARN, ERROR
     and treats any other token as a level as well (grouped as INVALID by analytics).
     The parser is tolerant to extra whitespace and skips malformed lines.
+
+    Parsed records are kept in `logs`, a compact `LogRecords` store that
+    reads like a dict of four string lists.
+
+    gzip, bzip2, xz and zstd input (paths, bytes or binary streams) is
+    detected from its magic bytes and decompressed while streaming.
     """
 
     # Accept a path (str/Path), raw bytes, or a file-like object with `read()`.
     file_name: str | Path | bytes | Any
-    logs: Dict[str, List[str]] = field(
-        default_factory=lambda: {
-            "TIMESTAMP": [],
-            "LEVEL": [],
-            "MODULE": [],
-            "MESSAGE": [],
-        }
-    )
+    logs: LogRecords = field(default_factory=LogRecords)
 
     def __str__(self) -> str:
         return f"LogFile('{self.file_name}') | Records: {len(self.logs['LEVEL'])}" 
@@ -39,6 +342,17 @@ class LogFile:
     def path(self) -> Path:
         return self.file_name if isinstance(self.file_name, Path) else Path(self.file_name)
 
+    def _is_compressed(self) -> bool:
+        """Whether a path or bytes input is compressed (streams are checked when read)."""
+        if isinstance(self.file_name, (bytes, bytearray)):
+            return detect(bytes(self.file_name[:MAGIC_BYTES])) is not None
+        if hasattr(self.file_name, "read"):
+            return False
+        try:
+            return is_compressed(self.path)
+        except OSError:
+            return False
+
     def load_file(self) -> list[str]:
         """Load raw lines.
 
@@ -47,16 +361,19 @@ class LogFile:
         - `file_name` as raw bytes
         - `file_name` as a file-like object (must implement `read()`)
 
-        Returns an empty list if file is missing.
+        Compressed input is decompressed. Returns an empty list if file is missing.
         """
         try:
             # Raw bytes have highest precedence
             if isinstance(self.file_name, (bytes, bytearray)):
-                return self.file_name.decode("utf-8").splitlines(True)
+                raw = self.file_name
+                if self._is_compressed():
+                    raw = open_stream(io.BytesIO(raw)).read()
+                return raw.decode("utf-8").splitlines(True)
 
             # File-like objects (streams)
             if hasattr(self.file_name, "read"):
-                raw = self.file_name.read()
+                raw = open_stream(self.file_name).read()
                 if isinstance(raw, (bytes, bytearray)):
                     text = raw.decode("utf-8")
                 else:
@@ -64,7 +381,8 @@ class LogFile:
                 return text.splitlines(True)
 
             # Fallback to path-based reading
-            return self.path.read_text(encoding="utf-8").splitlines(True)
+            with open_path(self.path) as fh:
+                return fh.read().decode("utf-8").splitlines(True)
         except FileNotFoundError:
             logger.error("Log file not found: %s", self.path)
             return []
@@ -72,64 +390,186 @@ class LogFile:
             logger.exception("Failed to load log content from %r", self.file_name)
             raise
 
-    def parse_records(self) -> Dict[str, List[str]]:
-        """Parse input into `self.logs` and return it.
+    def iter_chunks(self, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[bytes | str]:
+        """Yield the raw input as blocks of at most `chunk_size` bytes.
+
+        Raw bytes are sliced through a `memoryview` so no copy of the whole
+        buffer is made. File-like objects and paths are read with
+        `read(chunk_size)`; text streams yield `str` blocks instead of bytes.
+        Compressed input yields decompressed blocks.
+        A missing path is logged and yields nothing, mirroring `load_file`.
+        """
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be positive")
+
+        if isinstance(self.file_name, (bytes, bytearray)) and not self._is_compressed():
+            view = memoryview(self.file_name)
+            for start in range(0, len(view), chunk_size):
+                yield view[start:start + chunk_size]
+            return
+
+        if isinstance(self.file_name, (bytes, bytearray)) or hasattr(self.file_name, "read"):
+            stream = open_stream(
+                io.BytesIO(self.file_name) if isinstance(self.file_name, (bytes, bytearray)) else self.file_name
+            )
+            while True:
+                block = stream.read(chunk_size)
+                if not block:
+                    return
+                yield block
+
+        try:
+            fh = open_path(self.path)
+        except FileNotFoundError:
+            logger.error("Log file not found: %s", self.path)
+            return
+        with fh:
+            while True:
+                block = fh.read(chunk_size)
+                if not block:
+                    return
+                yield block
+
+    def iter_lines(self, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[str]:
+        """Yield decoded lines (without the trailing newline) chunk by chunk.
+
+        See `IncrementalParser` for how block boundaries are handled.
+        """
+        parser = IncrementalParser()
+        for block in self.iter_chunks(chunk_size):
+            yield from parser.feed_lines(block)
+        yield from parser.close_lines()
 
-        This method avoids loading entire files into memory for file-like
-        objects by iterating over the stream line-by-line. Supported input
-        types for `file_name`:
-        - filesystem path (str / Path)
-        - raw bytes or bytearray
-        - file-like object supporting iteration over lines (e.g. open file,
-          io.BytesIO, SpooledTemporaryFile)
+    def iter_records(self, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Record]:
+        """Stream parsed records as (timestamp, level, module, message) tuples.
 
+        Only one block of input plus the current line is held in memory, so
+        this is the entry point to use for files too large to materialize.
         Malformed lines are skipped with a debug log message.
         """
+        parser = IncrementalParser()
+        for block in self.iter_chunks(chunk_size):
+            yield from parser.feed(block)
+        yield from parser.close()
 
-        # Regex: timestamp (non-space), level (non-space), module (non-space), message (rest)
-        pattern = re.compile(r"^(\S+)\s+(\S+)\s+(\S+)\s+(.*)$")
+    def iter_batches(
+        self,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> Iterator[Dict[str, List[str]]]:
+        """Stream parsed records as columnar dicts of at most `batch_size` rows.
 
-        def process_line(idx: int, line: str) -> None:
-            if not line.strip():
-                return
-            m = pattern.match(line.rstrip('\n'))
-            if not m:
-                logger.debug("Skipping malformed line %d (no match): %r", idx, line)
+        Each batch has the same shape as `self.logs`, so it can be handed to
+        anything that accepts a parsed logs dict.
+        """
+        records = self.iter_records(chunk_size)
+        while True:
+            batch = list(itertools.islice(records, batch_size))
+            if not batch:
                 return
-            ts, lvl, mod, msg = m.groups()
-            self.logs["TIMESTAMP"].append(ts)
-            self.logs["LEVEL"].append(lvl)
-            self.logs["MODULE"].append(mod)
-            self.logs["MESSAGE"].append(msg)
+            yield {col: list(values) for col, values in zip(COLUMNS, zip(*batch))}
+
+    def iter_mmap_records(self, fields: Iterable[str] = COLUMNS) -> Iterator[Tuple[str, ...]]:
+        """Yield records by scanning a memory-mapped file in place.
 
-        # If raw bytes were provided, decode and iterate lines
+        The file is never copied into a `str` or a list of lines: the
+        mapping is scanned with `scan_buffer` and only the requested
+        `fields` are decoded. Raw bytes input is scanned the same way.
+        File pages are mapped rather than copied into the Python heap, but
+        each line costs more than with `iter_records`, so use it to save
+        memory, not time.
+        A missing path is logged and yields nothing.
+        """
+        fields = tuple(fields)
+        if self._is_compressed():
+            # Compressed data cannot be scanned in place; stream it instead
+            yield from _project(self.iter_records(), fields)
+            return
         if isinstance(self.file_name, (bytes, bytearray)):
-            text = self.file_name.decode("utf-8")
-            for idx, line in enumerate(text.splitlines(True), start=1):
-                process_line(idx, line)
-            return self.logs
+            yield from scan_buffer(self.file_name, fields)
+            return
 
-        # If a file-like object was provided, iterate it line by line
-        if hasattr(self.file_name, "read") and hasattr(self.file_name, "readline"):
+        try:
+            fh = self.path.open("rb")
+        except FileNotFoundError:
+            logger.error("Log file not found: %s", self.path)
+            return
+        with fh:
             try:
-                # Some file-like objects are binary; ensure text
-                for idx, raw in enumerate(self.file_name, start=1):
-                    # raw may be bytes
-                    if isinstance(raw, (bytes, bytearray)):
-                        line = raw.decode("utf-8")
-                    else:
-                        line = raw
-                    process_line(idx, line)
-                return self.logs
-            except Exception:
-                # Fall back to load_file behavior if iteration fails
-                logger.exception("Falling back to full-load parsing for %r", self.file_name)
-
-        # Otherwise, treat as path or fallback to loading file contents
-        lines = self.load_file()
-        for idx, line in enumerate(lines, start=1):
-            process_line(idx, line)
+                mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # Empty files cannot be mapped; there is nothing to parse.
+                return
+            with mm:
+                yield from scan_buffer(mm, fields)
+
+    def parse_records(
+        self,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        fields: Iterable[str] | None = None,
+        use_mmap: bool = False,
+        workers: int = 1,
+    ) -> LogRecords:
+        """Parse input into `self.logs` and return it.
+
+        Input is read through `iter_records`, so paths, raw bytes and
+        file-like objects (open files, io.BytesIO, SpooledTemporaryFile) are
+        all consumed in `chunk_size` blocks rather than loaded whole. Only
+        the parsed columns are kept.
+
+        `fields` restricts which columns are filled (the others stay empty).
+        With `use_mmap=True`, paths and raw bytes are parsed by
+        `iter_mmap_records` instead, which avoids the streaming parser's
+        block copies at some cost in speed; file-like objects always use
+        the streaming parser.
+
+        `workers > 1` parses a path input on several cores: the file is split
+        into newline-aligned byte ranges, each range is parsed in a
+        `ProcessPoolExecutor`, and the columns are merged in file order.
+        Process startup and shipping the columns back cost real time, so
+        measure it first (`python scripts/bench_parse.py`).
+
+        Malformed lines are skipped with a debug log message.
+        """
+        fields = tuple(fields) if fields else COLUMNS
+        if (
+            workers > 1
+            and not isinstance(self.file_name, (bytes, bytearray))
+            and not hasattr(self.file_name, "read")
+            and not self._is_compressed()
+        ):
+            return self._parse_parallel(fields, workers)
+        if use_mmap and not hasattr(self.file_name, "read"):
+            records: Iterable[Tuple[str, ...]] = self.iter_mmap_records(fields)
+        else:
+            records = _project(self.iter_records(chunk_size), fields)
+
+        fill_columns(self.logs, fields, records)
+        return self.logs
+
+    def _parse_parallel(self, fields: Tuple[str, ...], workers: int) -> LogRecords:
+        path = str(self.path)
+        try:
+            with open(path, "rb") as fh:
+                try:
+                    with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        ranges = split_ranges(mm, workers)
+                except ValueError:
+                    # Empty file
+                    return self.logs
+        except FileNotFoundError:
+            logger.error("Log file not found: %s", self.path)
+            return self.logs
 
+        if len(ranges) == 1:
+            parts = [_parse_range(path, *ranges[0], fields)]
+        else:
+            with ProcessPoolExecutor(max_workers=min(workers, len(ranges))) as pool:
+                futures = [pool.submit(_parse_range, path, start, end, fields) for start, end in ranges]
+                parts = [fut.result() for fut in futures]
+        for part in parts:
+            for f in fields:
+                self.logs[f].extend(part[f])
         return self.logs
 
 
@@ -0,0 +1,232 @@
+"""Module log_records
+
+Compact columnar storage for parsed log records.
+
+`LogRecords` replaces the dict of four `list[str]` columns that `LogFile`
+used to build. It is a read-only mapping from column name to a column
+object, and each column behaves like a list of strings (indexing,
+iteration, `len`, `append`, `extend`, equality with lists), so code written
+against the old dict-of-lists keeps working. Internally:
+
+- LEVEL and MODULE are dictionary-encoded: an `array('H')` of codes plus a
+  string table (widened to `array('I')` past 65535 distinct values).
+- TIMESTAMP and MESSAGE are each a single UTF-8 `bytearray` with an
+  `array('Q')` of offsets. `TimestampColumn.epochs` converts timestamps to
+  an int64 epoch-microsecond array in bulk on first use, so parsing does
+  not pay for a datetime per row; `datetimes()` yields parsed datetimes.
+"""
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from array import array
+import itertools
+from collections.abc import Mapping, Sequence
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from timestamps import TimestampParser
+
+COLUMNS = ("TIMESTAMP", "LEVEL", "MODULE", "MESSAGE")
+
+# `TimestampColumn.epochs` value for timestamps that cannot be parsed
+NO_EPOCH = -(2 ** 63)
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+class _Column(Sequence, ABC):
+    """Shared list-like behaviour for the column types below."""
+
+    @abstractmethod
+    def _decode(self, i: int) -> str:
+        """Return the value of row `i` (already bounds-checked)."""
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._decode(i) for i in range(*index.indices(len(self)))]
+        n = len(self)
+        if index < 0:
+            index += n
+        if not 0 <= index < n:
+            raise IndexError("column index out of range")
+        return self._decode(index)
+
+    def __iter__(self) -> Iterator[str]:
+        return map(self._decode, range(len(self)))
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (_Column, list, tuple)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({list(self)!r})"
+
+    def extend(self, values: Iterable[str]) -> None:
+        for v in values:
+            self.append(v)
+
+    @abstractmethod
+    def append(self, value: str) -> None:
+        """Append one value."""
+
+
+class CodedColumn(_Column):
+    """Dictionary-encoded string column (used for LEVEL and MODULE)."""
+
+    def __init__(self, values: Iterable[str] = ()) -> None:
+        self.codes = array("H")
+        self.values: List[str] = []
+        self._index: Dict[str, int] = {}
+        self.extend(values)
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def _decode(self, i: int) -> str:
+        return self.values[self.codes[i]]
+
+    def __iter__(self) -> Iterator[str]:
+        return map(self.values.__getitem__, self.codes)
+
+    def code_for(self, value: str) -> int:
+        """Return the code for `value`, adding it to the string table if new."""
+        code = self._index.get(value)
+        if code is None:
+            code = len(self.values)
+            self.values.append(value)
+            self._index[value] = code
+            if code > 0xFFFF and self.codes.typecode == "H":
+                self.codes = array("I", self.codes)
+        return code
+
+    def append(self, value: str) -> None:
+        self.codes.append(self.code_for(value))
+
+    def extend(self, values: Iterable[str]) -> None:
+        if isinstance(values, CodedColumn):
+            # Remap the other table's codes instead of re-hashing every row
+            remap = [self.code_for(v) for v in values.values]
+            self.codes.extend(remap[c] for c in values.codes)
+            return
+        values = values if isinstance(values, (list, tuple)) else list(values)
+        codes = list(map(self._index.get, values))
+        if None in codes:
+            code_for = self.code_for
+            codes = [code_for(v) if c is None else c for v, c in zip(values, codes)]
+        self.codes.fromlist(codes)
+
+
+class TextColumn(_Column):
+    """Strings concatenated into one UTF-8 buffer with an offsets array."""
+
+    def __init__(self, values: Iterable[str] = ()) -> None:
+        self.buffer = bytearray()
+        self.offsets = array("Q", [0])
+        self.extend(values)
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def _decode(self, i: int) -> str:
+        return self.buffer[self.offsets[i]:self.offsets[i + 1]].decode("utf-8")
+
+    def append(self, value: str) -> None:
+        self.buffer += value.encode("utf-8")
+        self.offsets.append(len(self.buffer))
+
+    def extend(self, values: Iterable[str]) -> None:
+        if isinstance(values, TextColumn):
+            base = len(self.buffer)
+            self.buffer += values.buffer
+            self.offsets.extend(base + o for o in values.offsets[1:])
+            return
+        values = values if isinstance(values, (list, tuple)) else list(values)
+        text = "".join(values)
+        if text.isascii():
+            # One byte per character: no need to encode values one by one
+            lengths, data = map(len, values), text.encode("ascii")
+        else:
+            encoded = [v.encode("utf-8") for v in values]
+            lengths, data = map(len, encoded), b"".join(encoded)
+        ends = itertools.accumulate(lengths, initial=len(self.buffer))
+        next(ends)  # skip the initial value, already the last offset
+        self.offsets.fromlist(list(ends))
+        self.buffer += data
+
+
+class MessageColumn(TextColumn):
+    """Messages, stored as one UTF-8 buffer (see `TextColumn`)."""
+
+
+class TimestampColumn(TextColumn):
+    """Timestamps kept as their original text, with epochs computed lazily.
+
+    Appending only copies the text into the shared buffer, so parsing pays
+    nothing per row for timestamps. `epochs` converts them to int64 epoch
+    microseconds in bulk, once, on first access (and then only the rows
+    appended since).
+    """
+
+    def __init__(self, values: Iterable[str] = ()) -> None:
+        self._epochs = array("q")
+        super().__init__(values)
+
+    @property
+    def epochs(self) -> array:
+        """Epoch microseconds of each row (naive UTC), `NO_EPOCH` if unparseable."""
+        done = len(self._epochs)
+        if done < len(self):
+            parse = TimestampParser().parse
+            self._epochs.extend(
+                NO_EPOCH if dt is None else (dt - _EPOCH) // _MICROSECOND for dt in map(parse, self[done:])
+            )
+        return self._epochs
+
+    def datetimes(self) -> Iterator[Optional[datetime]]:
+        """Yield each value as a naive datetime (None when unparseable)."""
+        for epoch in self.epochs:
+            yield None if epoch == NO_EPOCH else _EPOCH + epoch * _MICROSECOND
+
+
+class LogRecords(Mapping):
+    """Columnar record store with a read-only dict-like view.
+
+    `records["LEVEL"]` returns a list-like column, so `UserAnalytics(records)`
+    and other consumers of the old dict-of-lists work unchanged. Columns
+    may be appended to independently.
+    """
+
+    def __init__(self) -> None:
+        self._columns: Dict[str, _Column] = {
+            "TIMESTAMP": TimestampColumn(),
+            "LEVEL": CodedColumn(),
+            "MODULE": CodedColumn(),
+            "MESSAGE": MessageColumn(),
+        }
+
+    def __getitem__(self, key: str) -> _Column:
+        return self._columns[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._columns)
+
+    def __len__(self) -> int:
+        return len(self._columns)
+
+    def __repr__(self) -> str:
+        return f"LogRecords(rows={len(self._columns['LEVEL'])})"
+
+    def append(self, ts: str, level: str, module: str, message: str) -> None:
+        """Append one full record to all four columns."""
+        self._columns["TIMESTAMP"].append(ts)
+        self._columns["LEVEL"].append(level)
+        self._columns["MODULE"].append(module)
+        self._columns["MESSAGE"].append(message)
+
+    def extend(self, other: Mapping) -> None:
+        """Append every column of `other` (a LogRecords or dict of lists)."""
+        for key, column in self._columns.items():
+            if key in other:
+                column.extend(other[key])
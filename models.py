@@ -8,7 +8,10 @@ from sqlalchemy import (
     Text,
     ForeignKey,
     BigInteger,
+    Index,
+    Sequence,
     UniqueConstraint,
+    text,
 )
 from sqlalchemy.dialects.postgresql import UUID as PGUUID
 from db import Base
@@ -24,17 +27,78 @@ class Ingest(Base):
     created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
     total_rows = Column(Integer, default=0)
     inserted_rows = Column(Integer, default=0)
+    # Byte offset just past the last committed batch, for resuming
+    checkpoint_offset = Column(BigInteger, nullable=True, default=0)
+    # Source file size/mtime, so batch ingest can skip unchanged files unread
+    file_size = Column(BigInteger, nullable=True)
+    file_mtime = Column(DateTime, nullable=True)
+    # Heartbeat: bumped with every committed batch, so a `processing` row
+    # that stops changing can be told apart from one still being ingested
+    updated_at = Column(DateTime, nullable=True, default=datetime.utcnow, onupdate=datetime.utcnow)
 
 
 class Log(Base):
+    """One parsed log line.
+
+    The table is range-partitioned by month on `timestamp` (see
+    partitions.py). Postgres only allows unique keys that include the
+    partition key, so `id` is indexed rather than a primary key constraint;
+    it is still unique, being drawn from `logs_id_seq`.
+    """
+
     __tablename__ = "logs"
 
-    id = Column(BigInteger, primary_key=True, autoincrement=True)
-    ingest_id = Column(PGUUID(as_uuid=True), ForeignKey("ingests.id"), nullable=False, index=True)
+    id = Column(
+        BigInteger,
+        Sequence("logs_id_seq"),
+        server_default=text("nextval('logs_id_seq')"),
+        nullable=False,
+        index=True,
+    )
+    # Indexed together with id, see ix_logs_ingest_id_id below
+    ingest_id = Column(PGUUID(as_uuid=True), ForeignKey("ingests.id"), nullable=False)
     timestamp = Column(DateTime, index=True, nullable=True)
     module = Column(String(128), index=True, nullable=True)
     level = Column(String(32), index=True, nullable=True)
     message = Column(Text, nullable=True)
-    row_hash = Column(String(128), nullable=False, index=True)
+    # 128-bit BLAKE2b of timestamp/level/module/message (see ingest.row_hash)
+    row_hash = Column(PGUUID(as_uuid=True), nullable=False, index=True)
+
+    __table_args__ = (
+        # Equal row hashes imply equal timestamps, so this still dedups by
+        # row_hash; NULLS NOT DISTINCT covers rows without a timestamp.
+        UniqueConstraint("row_hash", "timestamp", name="uq_logs_row_hash", postgresql_nulls_not_distinct=True),
+        # Per-ingest keyset pages (`ingest_id = ? AND id > ? ORDER BY id`)
+        # read just the page; also serves plain lookups by ingest_id.
+        Index("ix_logs_ingest_id_id", "ingest_id", "id"),
+        # Trigram GIN index for substring search (/api/logs/search); needs
+        # pg_trgm. New entries queue in the GIN pending list (fastupdate is
+        # on by default); a 16 MB list instead of the 4 MB default
+        # (gin_pending_list_limit, in kB) makes ingest batches flush it into
+        # the index less often, at the cost of searches scanning more of it.
+        Index(
+            "ix_logs_message_trgm",
+            "message",
+            postgresql_using="gin",
+            postgresql_ops={"message": "gin_trgm_ops"},
+            postgresql_with={"gin_pending_list_limit": 16384},
+        ),
+        {"postgresql_partition_by": "RANGE (timestamp)"},
+    )
+    __mapper_args__ = {"primary_key": [id]}
+
+
+class LogRollup(Base):
+    """Count of `logs` rows per (resolution, time bucket, module, level).
+
+    Maintained at ingest by `rollups.with_rollups`; NULL module/level are
+    stored as "" and rows without a timestamp are not counted.
+    """
+
+    __tablename__ = "log_rollups"
 
-    __table_args__ = (UniqueConstraint("row_hash", name="uq_logs_row_hash"),)
+    resolution = Column(String(8), primary_key=True)
+    bucket = Column(DateTime, primary_key=True)
+    module = Column(String(128), primary_key=True)
+    level = Column(String(32), primary_key=True)
+    count = Column(BigInteger, nullable=False, default=0)
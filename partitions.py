@@ -0,0 +1,202 @@
+"""Module partitions
+
+Monthly range partitions of the `logs` table, and retention.
+
+`logs` is partitioned by `timestamp` into one table per calendar month
+(`logs_y2026m01` holds [2026-01-01, 2026-02-01)); rows without a timestamp
+go to the `logs_default` partition. Ingest calls `ensure_partitions` for
+each batch before inserting it, so partitions appear as data arrives. A
+month's rows are only ever in `logs_default` for a moment (e.g. inserted
+while retention dropped its partition); they are moved into the month's
+partition when it is created.
+
+Old data is removed a whole month at a time by detaching and dropping its
+partition, instead of a `DELETE` over the table. Ingest's `dedup_cache`
+notices the dropped partitions and starts over (see
+`ingest.RowHashCache.sync`), so re-uploaded old rows are not skipped:
+
+    python -m partitions --keep-months 6
+    python -m partitions --before 2026-01-01 --dry-run
+
+`log_rollups` is not touched, so dashboards keep history that raw rows no
+longer have. Dedup is unchanged: `uq_logs_row_hash` is unique on
+(row_hash, timestamp) because a partitioned table's unique keys must
+include the partition key, and equal row hashes imply equal timestamps.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import re
+import sys
+from datetime import datetime
+from typing import Iterable, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from db import get_session
+from timestamps import parse_timestamp
+
+logger = logging.getLogger(__name__)
+
+_NAME = re.compile(r"^logs_y(\d{4})m(\d{2})$")
+# Serializes partition DDL across concurrent ingests (any stable key)
+_DDL_LOCK_KEY = 0x6C6F6773
+COLUMNS = "id, ingest_id, timestamp, module, level, message, row_hash"
+
+
+def month_start(value: datetime) -> datetime:
+    return value.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def next_month(month: datetime) -> datetime:
+    return month.replace(year=month.year + 1, month=1) if month.month == 12 else month.replace(month=month.month + 1)
+
+
+def partition_name(month: datetime) -> str:
+    return f"logs_y{month.year:04d}m{month.month:02d}"
+
+
+def partition_month(name: str) -> Optional[datetime]:
+    """Inverse of `partition_name`; None for other tables (e.g. the default)."""
+    match = _NAME.match(name)
+    if match is None:
+        return None
+    return datetime(int(match.group(1)), int(match.group(2)), 1)
+
+
+async def _missing(session: AsyncSession, months: Iterable[datetime]) -> List[datetime]:
+    existing = set(await list_partitions(session))
+    return sorted(m for m in months if partition_name(m) not in existing)
+
+
+async def _create_partition(session: AsyncSession, month: datetime) -> None:
+    """Create `month`'s partition, moving its rows out of `logs_default`.
+
+    A partition cannot be added while the default one holds rows of its
+    range, so it is built as a plain table, filled from the default
+    partition and then attached.
+    """
+    name, end = partition_name(month), next_month(month)
+    await session.execute(text(f"CREATE TABLE {name} (LIKE logs INCLUDING DEFAULTS)"))
+    await session.execute(
+        text(
+            f"WITH moved AS (DELETE FROM logs_default WHERE timestamp >= :start AND timestamp < :end "
+            f"RETURNING {COLUMNS}) INSERT INTO {name} ({COLUMNS}) SELECT {COLUMNS} FROM moved"
+        ),
+        {"start": month, "end": end},
+    )
+    await session.execute(
+        text(f"ALTER TABLE logs ATTACH PARTITION {name} FOR VALUES FROM ('{month:%Y-%m-%d}') TO ('{end:%Y-%m-%d}')")
+    )
+
+
+async def ensure_partitions(session: AsyncSession, rows: Iterable[dict]) -> List[str]:
+    """Create the monthly partitions `rows` need; return the names created.
+
+    Existing partitions are looked up on every call, since another process
+    may have created or dropped one since the last batch. Missing ones are
+    created under an advisory lock, and committed at once because partition
+    DDL locks `logs`, rather than held for the rest of the batch.
+    """
+    months = {month_start(row["timestamp"]) for row in rows if row["timestamp"] is not None}
+    if not months or not await _missing(session, months):
+        return []
+    await session.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": _DDL_LOCK_KEY})
+    # Another ingest may have created them while we waited for the lock
+    created = []
+    for month in await _missing(session, months):
+        await _create_partition(session, month)
+        created.append(partition_name(month))
+    await session.commit()
+    if created:
+        logger.info("Created logs partitions %s", ", ".join(created))
+    return created
+
+
+async def list_partitions(session: AsyncSession) -> List[str]:
+    """Names of the monthly partitions of `logs`, oldest first."""
+    result = await session.execute(
+        text(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = 'logs'::regclass"
+        )
+    )
+    names = [name for (name,) in result if partition_month(name) is not None]
+    return sorted(names, key=partition_month)
+
+
+def expired(names: Iterable[str], before: datetime) -> List[str]:
+    """Partitions whose whole month ends on or before `before`."""
+    return [n for n in names if next_month(partition_month(n)) <= before]
+
+
+async def drop_partitions_before(session: AsyncSession, before: datetime, dry_run: bool = False) -> List[str]:
+    """Detach and drop every monthly partition entirely older than `before`.
+
+    Rows older than `before` that are still in `logs_default` go too.
+    """
+    names = expired(await list_partitions(session), before)
+    if dry_run:
+        return names
+    for name in names:
+        await session.execute(text(f"ALTER TABLE logs DETACH PARTITION {name}"))
+        await session.execute(text(f"DROP TABLE {name}"))
+        logger.info("Dropped logs partition %s", name)
+    await session.execute(text("DELETE FROM logs_default WHERE timestamp < :before"), {"before": before})
+    await session.commit()
+    return names
+
+
+def retention_cutoff(keep_months: int, now: Optional[datetime] = None) -> datetime:
+    """Start of the oldest month kept when keeping `keep_months` months.
+
+    The current month counts as one, so `keep_months=1` keeps only it.
+    """
+    month = month_start(now or datetime.utcnow())
+    index = month.year * 12 + month.month - 1 - (max(keep_months, 1) - 1)
+    return datetime(index // 12, index % 12 + 1, 1)
+
+
+async def _retain(before: datetime, dry_run: bool) -> List[str]:
+    async with get_session() as session:
+        return await drop_partitions_before(session, before, dry_run=dry_run)
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m partitions",
+        description="Drop monthly logs partitions older than the retention window",
+    )
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument("--keep-months", type=int, help="Months to keep, including the current one")
+    group.add_argument("--before", help="Drop partitions whose month ends on or before this date")
+    parser.add_argument("--dry-run", action="store_true", help="List the partitions that would be dropped")
+    args = parser.parse_args(argv)
+
+    if args.before is not None:
+        before = parse_timestamp(args.before)
+        if before is None:
+            parser.error(f"invalid date: {args.before!r}")
+    else:
+        before = retention_cutoff(args.keep_months)
+    try:
+        names = asyncio.run(_retain(before, args.dry_run))
+    except (RuntimeError, OSError) as exc:
+        # No async driver, or the database is unreachable
+        print(f"Retention failed: {exc!r}", file=sys.stderr)
+        return 1
+    verb = "Would drop" if args.dry_run else "Dropped"
+    print(f"{verb} {len(names)} partition(s) before {before:%Y-%m-%d}" + (": " + ", ".join(names) if names else ""))
+    return 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s %(levelname)s %(name)s: %(message)s"
+    )
+    raise SystemExit(main())
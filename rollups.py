@@ -0,0 +1,133 @@
+"""Module rollups
+
+Pre-aggregated log counts per (time bucket, module, level).
+
+`log_rollups` holds one counter row per bucket at each stored resolution
+(minute, hour, day). Ingest maintains it in the same statement that
+inserts a batch (`with_rollups`), counting only rows that were actually
+inserted, so dedup and resume never double count and the counters commit
+atomically with the batch.
+
+`choose_resolution` picks the coarsest stored rollup that can answer a
+time-series query exactly; `series_query` builds that query, falling back
+to `GROUP BY` over raw `logs` when no rollup fits (e.g. a range that does
+not start on a minute boundary).
+"""
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from sqlalchemy import String, column, func, literal_column, select, values
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from models import Log, LogRollup
+
+# Stored rollup resolutions, finest first, with their bucket width
+RESOLUTIONS = {
+    "minute": timedelta(minutes=1),
+    "hour": timedelta(hours=1),
+    "day": timedelta(days=1),
+}
+# Resolutions a query may ask for; week/month are summed from day buckets
+QUERY_RESOLUTIONS = ("minute", "hour", "day", "week", "month")
+
+# Constants are rendered inline so the wrapped INSERT keeps the whole
+# bind-parameter budget (see ingest.MAX_BATCH_ROWS)
+_STORED = values(column("resolution", String), name="resolutions", literal_binds=True).data(
+    [(r,) for r in RESOLUTIONS]
+)
+_EMPTY = literal_column("''")
+
+
+def with_rollups(insert_stmt):
+    """Wrap a `logs` INSERT so the same statement also updates `log_rollups`.
+
+    `insert_stmt` must be an `INSERT ... ON CONFLICT DO NOTHING` into
+    `logs`. Returns a SELECT of the `row_hash` of every row inserted (rows
+    skipped as duplicates are not returned).
+    """
+    inserted = insert_stmt.returning(Log.timestamp, Log.module, Log.level, Log.row_hash).cte("inserted")
+    bucket = func.date_trunc(_STORED.c.resolution, inserted.c.timestamp)
+    module = func.coalesce(inserted.c.module, _EMPTY)
+    level = func.coalesce(inserted.c.level, _EMPTY)
+    counts = (
+        select(_STORED.c.resolution, bucket, module, level, func.count())
+        .select_from(inserted)
+        .join(_STORED, literal_column("true"))
+        .where(inserted.c.timestamp.isnot(None))
+        .group_by(_STORED.c.resolution, bucket, module, level)
+        # A consistent lock order keeps concurrent ingests from deadlocking
+        .order_by(_STORED.c.resolution, bucket, module, level)
+    )
+    table = LogRollup.__table__
+    upsert = pg_insert(table).from_select(["resolution", "bucket", "module", "level", "count"], counts)
+    upsert = upsert.on_conflict_do_update(
+        index_elements=["resolution", "bucket", "module", "level"],
+        set_={"count": table.c.count + upsert.excluded.count},
+    )
+    return select(inserted.c.row_hash).add_cte(upsert.cte("rolled_up"))
+
+
+def _aligned(value: Optional[datetime], resolution: str) -> bool:
+    if value is None:
+        return True
+    width = RESOLUTIONS[resolution]
+    return (value - datetime(2000, 1, 1)) % width == timedelta(0)
+
+
+def choose_resolution(resolution: str, since: Optional[datetime] = None, until: Optional[datetime] = None) -> Optional[str]:
+    """Coarsest stored rollup that answers `resolution` over [since, until).
+
+    It must be no coarser than `resolution` and the range ends must fall on
+    its bucket boundaries, otherwise partial buckets would be miscounted.
+    Returns None when only the raw `logs` table can answer exactly.
+    """
+    if resolution not in QUERY_RESOLUTIONS:
+        raise ValueError(f"Unknown resolution {resolution!r}; expected one of {QUERY_RESOLUTIONS}")
+    stored = list(RESOLUTIONS)
+    finest_allowed = stored if resolution not in RESOLUTIONS else stored[: stored.index(resolution) + 1]
+    for candidate in reversed(finest_allowed):
+        if _aligned(since, candidate) and _aligned(until, candidate):
+            return candidate
+    return None
+
+
+def series_query(
+    resolution: str,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    modules: Optional[List[str]] = None,
+    levels: Optional[List[str]] = None,
+):
+    """SELECT (bucket, module, level, count) ordered by bucket, and its source.
+
+    The source is `"log_rollups:<resolution>"` or `"logs"`.
+    """
+    source = choose_resolution(resolution, since, until)
+    if source is None:
+        ts, count = Log.timestamp, func.count()
+        module, level = func.coalesce(Log.module, _EMPTY), func.coalesce(Log.level, _EMPTY)
+        conditions = [Log.timestamp.isnot(None)]
+    else:
+        table = LogRollup.__table__
+        ts, count = table.c.bucket, func.sum(table.c.count)
+        module, level = table.c.module, table.c.level
+        conditions = [table.c.resolution == source]
+    if since is not None:
+        conditions.append(ts >= since)
+    if until is not None:
+        conditions.append(ts < until)
+    if modules:
+        conditions.append(module.in_(modules))
+    if levels:
+        conditions.append(level.in_(levels))
+    # `resolution` is validated above; inline it so SELECT and GROUP BY match
+    bucket = ts if resolution == source else func.date_trunc(literal_column(f"'{resolution}'"), ts)
+    stmt = (
+        select(bucket.label("bucket"), module.label("module"), level.label("level"), count.label("count"))
+        .where(*conditions)
+        .group_by(bucket, module, level)
+        .order_by(bucket, module, level)
+    )
+    return stmt, ("logs" if source is None else f"log_rollups:{source}")
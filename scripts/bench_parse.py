@@ -0,0 +1,64 @@
+"""Time LogFile.parse_records with and without worker processes.
+
+    python scripts/bench_parse.py                     # 1M generated lines
+    python scripts/bench_parse.py big.log --jobs 2 4 8
+
+Run it on the host that would use `workers=` (multi-core speedup cannot
+show on a single core) and compare against the `workers=1` line.
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from log_file import LogFile  # noqa: E402
+
+LEVELS = ["INFO", "DEBUG", "WARN", "ERROR"]
+
+
+def generate(path: Path, lines: int) -> None:
+    rng = random.Random(1)
+    with path.open("w", encoding="utf-8") as fh:
+        for i in range(lines):
+            fh.write(
+                f"2026-01-12_10:{i // 60 % 60:02d}:{i % 60:02d} {rng.choice(LEVELS)} "
+                f"mod.{rng.randrange(40)} user {i} did something  with  value={rng.random():.4f}\n"
+            )
+
+
+def timed(path: Path, workers: int, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        LogFile(path).parse_records(workers=workers)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("file", nargs="?", help="Log file to parse (default: generate one)")
+    parser.add_argument("--lines", type=int, default=1_000_000, help="Lines to generate")
+    parser.add_argument("--jobs", type=int, nargs="+", default=[2, 4], help="Worker counts to try")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per setting; the best is reported")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(args.file) if args.file else Path(tmp) / "bench.log"
+        if not args.file:
+            generate(path, args.lines)
+        print(f"{path}: {path.stat().st_size / 1e6:.1f} MB, {os.cpu_count()} CPU(s)")
+        base = timed(path, 1, args.repeat)
+        print(f"workers=1: {base:.2f}s")
+        for jobs in args.jobs:
+            took = timed(path, jobs, args.repeat)
+            print(f"workers={jobs}: {took:.2f}s ({base / took:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
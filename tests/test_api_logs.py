@@ -0,0 +1,128 @@
+from datetime import datetime
+from uuid import uuid4
+
+from fastapi.testclient import TestClient
+from sqlalchemy.dialects import postgresql
+
+import api_server
+from api_server import app, logs_query
+from models import Log
+
+client = TestClient(app)
+
+
+def _sql(stmt):
+    return str(stmt.compile(dialect=postgresql.dialect()))
+
+
+def test_logs_query_keyset_and_filters():
+    stmt = logs_query(
+        uuid4(),
+        after_id=41,
+        levels=["ERROR", "WARN"],
+        modules=["auth"],
+        since=datetime(2026, 1, 1),
+        until=datetime(2026, 2, 1),
+    )
+    sql = _sql(stmt)
+    assert "logs.id > " in sql
+    assert "logs.level IN" in sql
+    assert "logs.module IN" in sql
+    assert "logs.timestamp >= " in sql and "logs.timestamp < " in sql
+    assert sql.rstrip().endswith("ORDER BY logs.id")
+    # Only the columns the API returns, not the whole ORM entity
+    assert "row_hash" not in sql and "ingest_id," not in sql
+
+
+def test_logs_query_without_filters_has_no_where():
+    assert "WHERE" not in _sql(logs_query())
+
+
+def test_ingest_logs_rejects_bad_params():
+    ingest_id = uuid4()
+    assert client.get("/api/ingests/not-a-uuid/logs").status_code == 404
+    resp = client.get(f"/api/ingests/{ingest_id}/logs", params={"since": "yesterday-ish"})
+    assert resp.status_code == 400
+    assert "since" in resp.json()["detail"]
+    assert client.get(f"/api/ingests/{ingest_id}/logs", params={"format": "csv"}).status_code == 422
+    assert client.get(f"/api/ingests/{ingest_id}/logs", params={"limit": 0}).status_code == 422
+
+
+def test_ingest_logs_needs_database(monkeypatch):
+    monkeypatch.setattr(api_server, "DB_AVAILABLE", False)
+    resp = client.get(f"/api/ingests/{uuid4()}/logs", params={"since": "2026-01-01T00:00:00"})
+    assert resp.status_code == 503
+
+
+def test_ingest_pages_have_a_composite_index():
+    # `ingest_id = ? AND id > ? ORDER BY id` needs both columns, in this order
+    indexes = {index.name: [c.name for c in index.columns] for index in Log.__table__.indexes}
+    assert indexes["ix_logs_ingest_id_id"] == ["ingest_id", "id"]
+    assert not any(cols == ["ingest_id"] for cols in indexes.values())
+
+
+def test_search_query_escapes_and_ranks():
+    sql = _sql(api_server.search_query("order_id=1042", levels=["ERROR"]))
+    assert "ILIKE" in sql.upper()
+    assert "word_similarity" in sql
+    assert "ORDER BY rank DESC, logs.id DESC" in sql
+    stmt = api_server.search_query("50%_off")
+    params = stmt.compile(dialect=postgresql.dialect()).params
+    # LIKE wildcards in the query are matched literally
+    assert any("50/%/_off" in str(v) for v in params.values())
+
+
+def test_search_rejects_short_query():
+    resp = client.get("/api/logs/search", params={"q": " ab "})
+    assert resp.status_code == 400
+    assert client.get("/api/logs/search").status_code == 422
+
+
+def test_counts_query_groups_in_sql():
+    sql = _sql(api_server.counts_query((api_server._MODULE, api_server._LEVEL), modules=["auth"]))
+    assert "count(*)" in sql
+    assert "GROUP BY coalesce(logs.module" in sql
+    assert "logs.module IN" in sql
+
+
+def test_analytics_endpoints_match_upload_shapes(monkeypatch):
+    from types import SimpleNamespace as Row
+
+    pairs = [("auth", "INFO", 3), ("auth", "ERROR", 1), ("db", "FATAL", 2)]
+
+    async def fake_counts(stmt):
+        names = [c.name for c in stmt.selected_columns][:-1]
+        totals = {}
+        for mod, lvl, n in pairs:
+            key = tuple({"module": mod, "level": lvl}[name] for name in names)
+            totals[key] = totals.get(key, 0) + n
+        return [Row(n=n, **dict(zip(names, key))) for key, n in totals.items()]
+
+    monkeypatch.setattr(api_server, "DB_AVAILABLE", True)
+    monkeypatch.setattr(api_server, "_fetch_counts", fake_counts)
+
+    levels = client.get("/api/analytics/levels").json()
+    assert levels["INFO"] == 3 and levels["ERROR"] == 1
+    assert levels["INVALID"] == 2
+    assert client.get("/api/analytics/modules").json() == {"auth": 4, "db": 2}
+    assert client.get("/api/analytics/levels-per-module").json() == {
+        "auth": {"INFO": 3, "ERROR": 1},
+        "db": {"FATAL": 2},
+    }
+    assert client.get("/api/analytics/levels", params={"until": "soon"}).status_code == 400
+
+
+def test_timeseries_reports_rollup_source(monkeypatch):
+    from types import SimpleNamespace as Row
+
+    async def fake_counts(stmt):
+        return [Row(bucket=datetime(2026, 1, 1, 6), module="auth", level="ERROR", count=7)]
+
+    monkeypatch.setattr(api_server, "DB_AVAILABLE", True)
+    monkeypatch.setattr(api_server, "_fetch_counts", fake_counts)
+    resp = client.get("/api/analytics/timeseries", params={"resolution": "day", "since": "2026-01-01T06:00:00"})
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["source"] == "log_rollups:hour"
+    assert body["buckets"] == [{"bucket": "2026-01-01T06:00:00", "module": "auth", "level": "ERROR", "count": 7}]
+    assert client.get("/api/analytics/timeseries", params={"resolution": "year"}).status_code == 422
@@ -1,7 +1,9 @@
 import io
 import pytest
 from fastapi.testclient import TestClient
-from api_server import app, MAX_UPLOAD_SIZE
+import api_server
+from api_server import app
+from upload_pipeline import UploadPipeline
 
 client = TestClient(app)
 
@@ -43,16 +45,89 @@ def test_upload_wrong_content_type():
     assert "unsupported content type" in resp.json().get("detail", "").lower()
 
 
-def test_upload_oversize_file():
+def test_upload_oversize_file(monkeypatch):
+    # The default limit is 1 GB; shrink it so the test payload stays small
+    monkeypatch.setattr(api_server, "MAX_UPLOAD_SIZE", 4096)
     # construct a payload slightly larger than MAX_UPLOAD_SIZE
-    big = b"A" * (MAX_UPLOAD_SIZE + 1)
+    big = b"A" * (api_server.MAX_UPLOAD_SIZE + 1)
     files = {"file": ("big.txt", io.BytesIO(big), "text/plain")}
     resp = client.post("/upload", files=files)
     assert resp.status_code == 413
 
 
+def test_upload_streams_in_chunks(monkeypatch):
+    # Force many small blocks so lines straddle chunk boundaries
+    monkeypatch.setattr(api_server, "UPLOAD_CHUNK_SIZE", 7)
+    files = {"file": ("sample.txt", io.BytesIO(SAMPLE_LOG.encode("utf-8")), "text/plain")}
+    resp = client.post("/upload", files=files)
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["records"] == 3
+    assert data["modules"] == {"moduleA": 2, "moduleB": 1}
+    assert data["levels_per_module"]["moduleB"] == {"ERROR": 1}
+
+
+def test_pipeline_joins_a_long_line_only_at_its_newline():
+    pipeline = UploadPipeline(max_size=1 << 20)
+    line = SAMPLE_LOG.splitlines(keepends=True)[1].encode()
+    pieces = [line[i:i + 3] for i in range(0, len(line), 3)]
+    assert [pipeline.accept(p) for p in pieces[:-1]] == [b""] * (len(pieces) - 1)
+    assert pipeline.accept(pieces[-1] + b"tail") == line
+    assert pipeline.finish() == b"tail"
+    assert pipeline.finish() == b""
+
+
 def test_upload_malformed_file():
     files = {"file": ("bad.txt", io.BytesIO(MALFORMED_LOG.encode("utf-8")), "text/plain")}
     resp = client.post("/upload", files=files)
     # Parsing malformed lines should not crash; it may return 200 with zero counts
     assert resp.status_code in (200, 400)
+
+
+def test_upload_large_file_uses_process_pool(monkeypatch):
+    monkeypatch.setattr(api_server, "UPLOAD_CHUNK_SIZE", 16)
+    monkeypatch.setattr(api_server.cpu_executor, "process_threshold", 1)
+    files = {"file": ("sample.txt", io.BytesIO(SAMPLE_LOG.encode("utf-8")), "text/plain")}
+    resp = client.post("/upload", files=files)
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["records"] == 3
+    assert data["levels"]["ERROR"] == 1
+    assert data["levels_per_module"]["moduleA"] == {"INFO": 1, "DEBUG": 1}
+
+
+def test_upload_busy_executor_returns_503(monkeypatch):
+    monkeypatch.setattr(api_server.cpu_executor, "max_pending", 0)
+    files = {"file": ("sample.txt", io.BytesIO(SAMPLE_LOG.encode("utf-8")), "text/plain")}
+    resp = client.post("/upload", files=files)
+    assert resp.status_code == 503
+    assert resp.headers.get("Retry-After") == "1"
+
+
+@pytest.mark.parametrize("threshold", [None, 1])
+def test_upload_gzip_is_decompressed(monkeypatch, threshold):
+    import gzip
+
+    monkeypatch.setattr(api_server, "UPLOAD_CHUNK_SIZE", 5)
+    if threshold:
+        monkeypatch.setattr(api_server.cpu_executor, "process_threshold", threshold)
+    payload = gzip.compress(SAMPLE_LOG.encode("utf-8"))
+    files = {"file": ("sample.log.gz", io.BytesIO(payload), "application/gzip")}
+    resp = client.post("/upload", files=files)
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["records"] == 3
+    assert data["levels_per_module"]["moduleA"] == {"INFO": 1, "DEBUG": 1}
+
+
+def test_upload_corrupt_or_bomb_compressed(monkeypatch):
+    import gzip
+
+    truncated = gzip.compress(SAMPLE_LOG.encode("utf-8"))[:-6]
+    resp = client.post("/upload", files={"file": ("t.gz", io.BytesIO(truncated), "application/gzip")})
+    assert resp.status_code == 400
+
+    monkeypatch.setattr(api_server, "MAX_DECOMPRESSED_SIZE", 10_000)
+    bomb = gzip.compress(b"\n" * 100_000)
+    resp = client.post("/upload", files={"file": ("b.gz", io.BytesIO(bomb), "application/gzip")})
+    assert resp.status_code == 413
@@ -0,0 +1,56 @@
+import asyncio
+import sys
+import uuid
+from datetime import datetime
+from pathlib import Path
+
+CHICMIC_TEST_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(CHICMIC_TEST_DIR))
+
+import api_server
+from broadcaster import DROPPED, Broadcaster
+
+
+def test_fan_out_and_slow_consumer_dropped():
+    async def scenario():
+        hub = Broadcaster(buffer=2)
+        fast, slow = hub.subscribe(), hub.subscribe()
+        assert hub.publish("a") == 2
+        assert await fast.get() == "a"
+        assert hub.publish("b") == 2
+        assert await fast.get() == "b"
+        # `slow` never read: its third event overflows the buffer
+        assert hub.publish("c") == 1
+        assert slow.dropped and await slow.get() is DROPPED
+        assert hub.subscribers == {fast} and hub.dropped_total == 1
+        hub.unsubscribe(fast)
+        assert hub.publish("d") == 0
+
+    asyncio.run(scenario())
+
+
+def test_ingest_batches_publish_only_important_rows(monkeypatch):
+    async def scenario():
+        hub = Broadcaster()
+        monkeypatch.setattr(api_server, "important_stream", hub)
+        sub = hub.subscribe()
+        ingest_id = uuid.uuid4()
+        rows = [
+            {"ingest_id": ingest_id, "timestamp": datetime(2026, 1, 12, 10, 15, i), "level": level,
+             "module": "mod", "message": f"m{i}"}
+            for i, level in enumerate(["INFO", "WARN", "DEBUG", "ERROR"])
+        ]
+        api_server.publish_important(rows)
+        first, second = await sub.get(), await sub.get()
+        assert sub.queue.empty()
+        assert (first["level"], first["message"]) == ("WARN", "m1")
+        assert second == {
+            "ingest_id": str(ingest_id),
+            "timestamp": "2026-01-12T10:15:03",
+            "level": "ERROR",
+            "module": "mod",
+            "message": "m3",
+        }
+
+    asyncio.run(scenario())
+    assert api_server.ingest_queue.on_rows is api_server.publish_important
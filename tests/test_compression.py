@@ -0,0 +1,65 @@
+import bz2
+import gzip
+import io
+import lzma
+import sys
+from pathlib import Path
+
+import pytest
+
+CHICMIC_TEST_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(CHICMIC_TEST_DIR))
+
+from compression import CompressionError, StreamDecompressor, detect, open_stream
+from log_file import LogFile
+
+SAMPLE_LOGS = CHICMIC_TEST_DIR / "sample_logs"
+CODECS = {"gzip": gzip.compress, "bz2": bz2.compress, "xz": lzma.compress}
+
+
+class NonSeekable:
+    def __init__(self, data):
+        self._buf = io.BytesIO(data)
+
+    def read(self, n=-1):
+        return self._buf.read(n)
+
+
+@pytest.mark.parametrize("kind", sorted(CODECS))
+def test_detect_and_stream_decompress(kind):
+    data = (SAMPLE_LOGS / "unicode.log").read_bytes() * 50
+    # Two members, as produced by appending rotated chunks
+    packed = CODECS[kind](data) + CODECS[kind](b"tail\n")
+    assert detect(packed) == kind
+
+    assert open_stream(io.BytesIO(packed)).read() == data + b"tail\n"
+    assert open_stream(NonSeekable(packed)).read() == data + b"tail\n"
+
+    dec = StreamDecompressor(kind, piece_size=256)
+    pieces = [p for i in range(0, len(packed), 100) for p in dec.feed(packed[i:i + 100])]
+    dec.close()
+    assert max(map(len, pieces)) <= 256
+    assert b"".join(pieces) == data + b"tail\n"
+
+
+def test_truncated_and_plain_input():
+    dec = StreamDecompressor("gzip")
+    list(dec.feed(gzip.compress(b"x" * 1000)[:-4]))
+    with pytest.raises(CompressionError):
+        dec.close()
+    assert detect(b"2026-01-12_10:15:01 INFO") is None
+    assert open_stream(io.BytesIO(b"plain")).read() == b"plain"
+
+
+def test_logfile_reads_compressed_paths_and_bytes(tmp_path):
+    raw = (SAMPLE_LOGS / "standard.log").read_bytes()
+    expected = LogFile(raw).parse_records()
+
+    gz = tmp_path / "standard.log.gz"
+    gz.write_bytes(gzip.compress(raw))
+    assert LogFile(gz).parse_records() == expected
+    assert LogFile(gz).parse_records(fields=("LEVEL",), use_mmap=True)["LEVEL"] == expected["LEVEL"]
+    assert LogFile(gz).parse_records(workers=2) == expected
+    assert LogFile(bz2.compress(raw)).parse_records(chunk_size=5) == expected
+    assert LogFile(io.BytesIO(lzma.compress(raw))).parse_records() == expected
+    assert "".join(LogFile(gz).load_file()) == raw.decode("utf-8")
@@ -0,0 +1,73 @@
+import os
+import sys
+from pathlib import Path
+
+CHICMIC_TEST_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(CHICMIC_TEST_DIR))
+
+import base_processor
+import Task_B1 as task_b1
+from follow import FileFollower
+
+
+def line(i, level="INFO"):
+    return f"2026-01-12_10:15:{i:02d} {level} mod.{i % 2} message {i}\n"
+
+
+def test_follow_reads_appends_partial_lines_rotation_and_truncation(tmp_path):
+    path = tmp_path / "app.log"
+    follower = FileFollower(path)
+    assert follower.poll() == []  # waits for the file to appear
+
+    path.write_text(line(0) + line(1)[:10])
+    assert [r[3] for r in follower.poll()] == ["message 0"]
+    with path.open("a") as fh:
+        fh.write(line(1)[10:] + line(2))
+    assert [r[3] for r in follower.poll()] == ["message 1", "message 2"]
+    assert follower.poll() == []
+
+    # Rotation: old file gets a final unterminated line, then is moved away
+    with path.open("a") as fh:
+        fh.write(line(3).rstrip("\n"))
+    os.rename(path, tmp_path / "app.log.1")
+    path.write_text(line(4))
+    assert [r[3] for r in follower.poll()] == ["message 3", "message 4"]
+
+    # Truncation in place (detected because the file got shorter)
+    path.write_text("2026-01-12_10:15:05 INFO m short\n")
+    assert [r[3] for r in follower.poll()] == ["short"]
+    follower.close()
+
+
+def test_follow_from_end_skips_existing(tmp_path):
+    path = tmp_path / "app.log"
+    path.write_text(line(0))
+    follower = FileFollower(path, from_start=False)
+    assert follower.poll() == []
+    with path.open("a") as fh:
+        fh.write(line(1))
+    assert [r[3] for r in follower.poll()] == ["message 1"]
+    follower.close()
+
+
+def test_follow_clis_update_incrementally(tmp_path, capsys):
+    path = tmp_path / "app.log"
+    path.write_text(line(0) + line(1, "ERROR"))
+    polls = iter(range(3))
+
+    def stop():
+        n = next(polls, None)
+        if n == 1:
+            with path.open("a") as fh:
+                fh.write(line(2, "WARN"))
+        return n is None
+
+    analytics = base_processor.follow_file(path, interval=0, stop=stop)
+    result = analytics.compute_all()
+    assert result.records == 3
+    assert result.levels["WARN"] == 1 and result.levels["ERROR"] == 1
+
+    polls = iter(range(3))
+    assert task_b1.follow_important_logs(path, interval=0, stop=stop) == 3
+    out = capsys.readouterr().out
+    assert "ALERT: 2026-01-12_10:15:01 ERROR" in out
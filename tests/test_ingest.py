@@ -0,0 +1,322 @@
+import asyncio
+import io
+import sys
+import uuid
+from datetime import datetime
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+CHICMIC_TEST_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(CHICMIC_TEST_DIR))
+
+import ingest
+
+
+class FakeSession:
+    """Just enough of AsyncSession for ingest_records without a database."""
+
+    def __init__(self, existing=None, claimable=True, partitions=()):
+        self.existing = existing
+        # Whether `ingest._claim`'s conditional UPDATE matches the row
+        self.claimable = claimable
+        self.partitions = list(partitions)
+        self.added = []
+        self.commits = 0
+        self.rollbacks = 0
+
+    async def scalar(self, stmt):
+        return self.existing
+
+    async def execute(self, stmt):
+        if "pg_inherits" in str(stmt):
+            return [(name,) for name in self.partitions]
+        return SimpleNamespace(rowcount=1 if self.claimable else 0)
+
+    def add(self, obj):
+        self.added.append(obj)
+
+    async def commit(self):
+        self.commits += 1
+
+    async def rollback(self):
+        self.rollbacks += 1
+
+
+def sample_bytes(n):
+    return "".join(f"2026-01-12_10:15:{i % 60:02d} INFO mod.{i % 3} message {i}\n" for i in range(n)).encode("utf-8")
+
+
+def test_ingest_bytes_inserts_in_committed_batches(monkeypatch):
+    batches = []
+
+    async def fake_insert(session, rows):
+        batches.append(len(rows))
+        return [r["row_hash"] for r in rows[1:]]
+
+    monkeypatch.setattr(ingest, "insert_rows", fake_insert)
+    session = FakeSession()
+    progress = []
+
+    async def scenario():
+        return await ingest.ingest_records(
+            session,
+            ingest.RecordReader(io.BytesIO(sample_bytes(12))),
+            "hash",
+            batch_size=5,
+            on_progress=progress.append,
+        )
+
+    result = asyncio.run(scenario())
+    assert batches == [5, 5, 2]
+    assert result["total_rows"] == 12 and result["inserted_rows"] == 9
+    # ingest row + one commit per batch + final status
+    assert session.commits == 5
+    assert progress[:3] == [5, 10, 12]
+    assert session.added[0].status == "complete"
+
+
+def test_copy_mode_uses_copy_loader_without_parameter_cap(monkeypatch):
+    batches = []
+
+    async def fake_copy(session, rows):
+        batches.append(len(rows))
+        return [r["row_hash"] for r in rows]
+
+    async def fail_insert(session, rows):
+        raise AssertionError("insert path used in copy mode")
+
+    monkeypatch.setattr(ingest, "copy_rows", fake_copy)
+    monkeypatch.setattr(ingest, "insert_rows", fail_insert)
+    n = ingest.MAX_BATCH_ROWS + 10
+    result = asyncio.run(
+        ingest.ingest_bytes(FakeSession(), sample_bytes(n), batch_size=n, mode="copy")
+    )
+    assert batches == [n]
+    assert result["inserted_rows"] == n
+
+
+def test_on_rows_gets_only_rows_the_database_inserted(monkeypatch):
+    stored = set()
+
+    async def fake_insert(session, rows):
+        # ON CONFLICT DO NOTHING: the first copy of each new hash wins
+        new = [r["row_hash"] for r in rows if r["row_hash"] not in stored]
+        stored.update(new)
+        return list(dict.fromkeys(new))
+
+    monkeypatch.setattr(ingest, "insert_rows", fake_insert)
+    published = []
+
+    def load(data):
+        reader = ingest.RecordReader(io.BytesIO(data))
+        return asyncio.run(ingest.ingest_records(FakeSession(), reader, "hash", on_rows=published.append))
+
+    load(sample_bytes(4))
+    result = load(sample_bytes(6) + sample_bytes(6))
+    assert result["inserted_rows"] == 2
+    assert [[r["message"] for r in rows] for rows in published] == [
+        [f"message {i}" for i in range(4)],
+        ["message 4", "message 5"],
+    ]
+
+
+def test_unknown_ingest_mode_rejected():
+    with pytest.raises(ValueError):
+        asyncio.run(ingest.ingest_bytes(FakeSession(), sample_bytes(1), mode="bogus"))
+
+
+def test_row_hash_is_128_bit_and_field_sensitive():
+    ts = datetime(2026, 1, 12, 10, 15, 1)
+    a = ingest.row_hash(ts, "INFO", "mod", "hello world")
+    assert a.bytes and len(a.bytes) == 16
+    assert a == ingest.row_hash(ts, "INFO", "mod", "hello world")
+    assert a != ingest.row_hash(ts, "INFO", "mod hello", "world")
+    assert a != ingest.row_hash(ts, "INFOmod", "", "hello world")
+    assert ingest.row_hash(None, "INFO", "", "x") != ingest.row_hash(None, "INFO", None, "x")
+
+
+def test_row_hash_recomputable_from_stored_columns():
+    rows = ingest.prepare_rows(iter([("2026-01-12_10:15:01", "INFO", "mod", "hi")]), uuid.uuid4(), 1)
+    (row,) = rows
+    assert row["row_hash"] == ingest.row_hash(row["timestamp"], row["level"], row["module"], row["message"])
+
+
+def test_dedup_cache_filters_known_and_repeated_rows(monkeypatch):
+    sent = []
+
+    async def fake_insert(session, rows):
+        sent.append(len(rows))
+        return [r["row_hash"] for r in rows]
+
+    cache = ingest.RowHashCache(maxsize=100)
+    cache.warmed = True
+    monkeypatch.setattr(ingest, "insert_rows", fake_insert)
+    monkeypatch.setattr(ingest, "dedup_cache", cache)
+
+    first = asyncio.run(ingest.ingest_bytes(FakeSession(), sample_bytes(10) + sample_bytes(3)))
+    assert sent == [10] and first["total_rows"] == 13 and first["inserted_rows"] == 10
+    assert len(cache) == 10
+
+    # An overlapping upload only ships the new rows
+    second = asyncio.run(ingest.ingest_bytes(FakeSession(), sample_bytes(12)))
+    assert sent == [10, 2] and second["inserted_rows"] == 2
+    assert cache.hits == 10
+
+
+def test_dedup_cache_starts_over_when_partitions_are_dropped(monkeypatch):
+    warms = []
+
+    async def fake_warm(session):
+        warms.append(len(cache))
+        cache.warmed = True
+        return 0
+
+    cache = ingest.RowHashCache(maxsize=10)
+    monkeypatch.setattr(cache, "warm", fake_warm)
+    h = ingest.row_hash(datetime(2025, 12, 1), "INFO", "m", "x")
+
+    asyncio.run(cache.sync(FakeSession(partitions=["logs_y2025m12", "logs_y2026m01"])))
+    cache.add([h])
+    # A new month's partition leaves the cache alone
+    asyncio.run(cache.sync(FakeSession(partitions=["logs_y2025m12", "logs_y2026m01", "logs_y2026m02"])))
+    assert h in cache and warms == [0]
+
+    # Retention (in another process) dropped December
+    asyncio.run(cache.sync(FakeSession(partitions=["logs_y2026m01", "logs_y2026m02"])))
+    assert h not in cache and warms == [0, 0]
+
+
+def test_dedup_cache_evicts_least_recent():
+    cache = ingest.RowHashCache(maxsize=2)
+    a, b, c = (ingest.row_hash(datetime(2026, 1, 1, 0, 0, i), "INFO", "m", "x") for i in range(3))
+    cache.add([a, b])
+    cache.filter([{"row_hash": a}])  # touch a
+    cache.add([c])
+    assert a in cache and c in cache and b not in cache
+
+
+def test_failed_ingest_is_marked_and_resumed_from_checkpoint(monkeypatch):
+    data = sample_bytes(12)
+    batches = []
+
+    async def flaky_insert(session, rows):
+        if len(batches) == 2:
+            raise ConnectionError("db went away")
+        batches.append([r["message"] for r in rows])
+        return [r["row_hash"] for r in rows]
+
+    monkeypatch.setattr(ingest, "insert_rows", flaky_insert)
+    session = FakeSession()
+    with pytest.raises(ConnectionError):
+        asyncio.run(ingest.ingest_bytes(session, data, batch_size=5))
+    row = session.added[0]
+    assert row.status == "failed" and session.rollbacks == 1
+    assert row.total_rows == 10
+    assert row.checkpoint_offset == len(b"".join(data.splitlines(keepends=True)[:10]))
+
+    # The retry finds the failed row and only loads what is left
+    batches.clear()
+    batches.append(None)  # past the failure trigger
+    result = asyncio.run(ingest.ingest_bytes(FakeSession(existing=row), data, batch_size=5))
+    assert batches[1:] == [["message 10", "message 11"]]
+    assert result["resumed"] and result["ingest_id"] == row.id
+    assert result["total_rows"] == 12 and result["inserted_rows"] == 12
+    assert row.status == "complete" and row.checkpoint_offset == len(data)
+
+
+def test_running_ingest_is_not_resumed_twice(monkeypatch):
+    async def fail_insert(session, rows):
+        raise AssertionError("must not load rows of an ingest another worker owns")
+
+    monkeypatch.setattr(ingest, "insert_rows", fail_insert)
+    row = ingest.Ingest(id=uuid.uuid4(), file_hash="h", status="processing", total_rows=5, inserted_rows=5)
+    session = FakeSession(existing=row, claimable=False)
+    result = asyncio.run(ingest.ingest_bytes(session, sample_bytes(12)))
+    assert result["skipped"] and result["reason"] == "in_progress"
+    assert result["ingest_id"] == row.id
+    assert row.status == "processing" and row.total_rows == 5 and session.commits == 0
+
+
+def test_concurrent_first_ingest_reports_in_progress(monkeypatch):
+    from sqlalchemy.exc import IntegrityError
+
+    class RacingSession(FakeSession):
+        async def commit(self):
+            raise IntegrityError("INSERT INTO ingests", {}, Exception("duplicate key"))
+
+    session = RacingSession()
+    result = asyncio.run(ingest.ingest_bytes(session, sample_bytes(3)))
+    assert result["skipped"] and result["reason"] == "in_progress"
+    assert session.rollbacks == 1
+
+
+def test_complete_ingest_is_skipped():
+    row = ingest.Ingest(file_hash="h", status="complete", total_rows=3, inserted_rows=3)
+    result = asyncio.run(ingest.ingest_bytes(FakeSession(existing=row), sample_bytes(3)))
+    assert result["skipped"] and result["total_rows"] == 3
+
+
+def test_expand_paths_and_compressed_open(tmp_path):
+    import bz2
+    import gzip
+
+    data = sample_bytes(4)
+    (tmp_path / "a.log").write_bytes(data)
+    (tmp_path / "b.log.gz").write_bytes(gzip.compress(data))
+    (tmp_path / "c.log.bz2").write_bytes(bz2.compress(data))
+    (tmp_path / "sub").mkdir()
+
+    by_dir = ingest.expand_paths([str(tmp_path)])
+    assert [p.name for p in by_dir] == ["a.log", "b.log.gz", "c.log.bz2"]
+    assert ingest.expand_paths([str(tmp_path / "*.gz"), str(tmp_path / "b.log.gz")]) == [by_dir[1]]
+    for path in by_dir:
+        with ingest.open_path(path) as fh:
+            assert len(list(ingest.RecordReader(fh))) == 4
+
+
+def test_batch_ingest_skips_unchanged_files(tmp_path, monkeypatch, capsys):
+    paths = []
+    for name in ("old.log", "new.log"):
+        (tmp_path / name).write_bytes(sample_bytes(3))
+        paths.append((tmp_path / name).resolve())
+
+    class NullSession:
+        async def __aenter__(self):
+            return None
+
+        async def __aexit__(self, *exc):
+            return False
+
+    async def fake_unchanged(session, candidates):
+        return {p for p in candidates if p.name == "old.log"}
+
+    ingested = []
+
+    async def fake_ingest_path(path, mode=None, batch_size=None):
+        ingested.append(path)
+        return {"path": str(path), "bytes": 10, "total_rows": 3, "inserted_rows": 3, "skipped": False}
+
+    monkeypatch.setattr(ingest, "get_session", NullSession)
+    monkeypatch.setattr(ingest, "unchanged_ingested", fake_unchanged)
+    monkeypatch.setattr(ingest, "ingest_path", fake_ingest_path)
+
+    assert ingest.main([str(tmp_path / "*.log"), "--jobs", "2"]) == 0
+    assert ingested == [paths[1]]
+    out = capsys.readouterr().out
+    assert "1 ingested, 1 skipped, 0 failed: 3 rows (3 new)" in out
+
+
+def test_row_hash_migration_copy_matches_ingest():
+    import importlib.util
+
+    path = CHICMIC_TEST_DIR / "alembic" / "versions" / "0002_binary_row_hash.py"
+    spec = importlib.util.spec_from_file_location("migration_0002", path)
+    migration = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(migration)
+    for args in [
+        (datetime(2026, 1, 12, 10, 15, 1, 250000), "INFO", "mod", "héllo"),
+        (None, "ERROR", None, ""),
+    ]:
+        assert migration._row_hash(*args) == ingest.row_hash(*args)
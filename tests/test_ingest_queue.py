@@ -0,0 +1,88 @@
+import asyncio
+import sys
+import uuid
+from pathlib import Path
+
+CHICMIC_TEST_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(CHICMIC_TEST_DIR))
+
+import ingest_queue
+from ingest_queue import IngestQueue
+
+
+def test_jobs_run_in_background_and_clean_up(tmp_path, monkeypatch):
+    calls = []
+
+    async def fake_ingest(fh, filename=None, file_hash=None, ingest_id=None, on_progress=None, on_rows=None):
+        calls.append((fh.read(), filename, file_hash, ingest_id))
+        on_progress(2)
+        return {"ingest_id": ingest_id, "total_rows": 2, "inserted_rows": 2, "skipped": False}
+
+    monkeypatch.setattr(ingest_queue.ingest_mod, "ingest_file_like", fake_ingest)
+    spooled = tmp_path / "upload.log"
+    spooled.write_bytes(b"payload")
+
+    async def scenario():
+        queue = IngestQueue(workers=1, maxsize=1)
+        queue.start()
+        job = await queue.submit(str(spooled), "abc123", file_name="app.log")
+        assert job.status == "queued"
+        await queue._queue.join()
+        await queue.stop()
+        return job, queue
+
+    job, queue = asyncio.run(scenario())
+    assert calls == [(b"payload", "app.log", "abc123", job.id)]
+    assert queue.get(job.id) is job
+    assert job.to_dict()["status"] == "complete"
+    assert job.processed_rows == 2 and job.to_dict()["inserted_rows"] == 2
+    assert not spooled.exists()
+
+
+def test_resumed_ingest_reports_the_row_it_completed(tmp_path, monkeypatch):
+    earlier = uuid.uuid4()
+
+    async def fake_ingest(fh, filename=None, file_hash=None, ingest_id=None, on_progress=None, on_rows=None):
+        return {"ingest_id": earlier, "total_rows": 2, "inserted_rows": 1, "skipped": False, "resumed": True}
+
+    monkeypatch.setattr(ingest_queue.ingest_mod, "ingest_file_like", fake_ingest)
+    spooled = tmp_path / "upload.log"
+    spooled.write_bytes(b"payload")
+
+    async def scenario():
+        queue = IngestQueue(workers=1)
+        queue.start()
+        job = await queue.submit(str(spooled), "abc123")
+        await queue._queue.join()
+        await queue.stop()
+        return job
+
+    job = asyncio.run(scenario())
+    assert job.status == "complete" and job.resumed_into == earlier
+    assert job.to_dict()["resumed_into"] == str(earlier)
+
+
+def test_stop_fails_unfinished_jobs_and_removes_their_files(tmp_path, monkeypatch):
+    started = asyncio.Event()
+
+    async def slow_ingest(fh, filename=None, file_hash=None, ingest_id=None, on_progress=None, on_rows=None):
+        started.set()
+        await asyncio.sleep(3600)
+
+    monkeypatch.setattr(ingest_queue.ingest_mod, "ingest_file_like", slow_ingest)
+    spooled = [tmp_path / f"upload{i}.log" for i in range(3)]
+    for path in spooled:
+        path.write_bytes(b"payload")
+
+    async def scenario():
+        queue = IngestQueue(workers=1, maxsize=5)
+        queue.start()
+        jobs = [await queue.submit(str(path), f"hash{i}") for i, path in enumerate(spooled)]
+        await started.wait()
+        await queue.stop()
+        return jobs, queue
+
+    jobs, queue = asyncio.run(scenario())
+    assert not queue.running
+    assert [(job.status, job.error) for job in jobs] == [("failed", "cancelled")] * 3
+    assert not any(path.exists() for path in spooled)
@@ -0,0 +1,85 @@
+import copy
+import pickle
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+CHICMIC_TEST_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(CHICMIC_TEST_DIR))
+
+from log_records import NO_EPOCH, CodedColumn, LogRecords, MessageColumn, TimestampColumn
+
+
+def test_columns_round_trip_values():
+    stamps = ["2026-01-12_10:15:01", "2026-01-12_10:15:01", "2023-01-01T00:00:00", "2023-01-01 00:00:00.123456",
+              "2023-01-01T00:00:00Z", "this", "2023-01-01T00:00:00.100"]
+    ts = TimestampColumn(stamps)
+    assert list(ts) == stamps
+    assert ts[0] == ts[1] and ts[-1] == stamps[-1]
+    assert ts.epochs[2] == 1672531200 * 10**6
+
+    msgs = MessageColumn(["Ошибка", "", "plain text"])
+    msgs.append("😊")
+    assert msgs == ["Ошибка", "", "plain text", "😊"]
+    assert msgs[1:3] == ["", "plain text"]
+
+
+def test_coded_column_interns_and_widens():
+    col = CodedColumn(["INFO", "WARN", "INFO"])
+    assert col.values == ["INFO", "WARN"]
+    assert list(col.codes) == [0, 1, 0]
+
+    wide = CodedColumn(f"mod.{i}" for i in range(70000))
+    assert wide.codes.typecode == "I"
+    assert wide[-1] == "mod.69999"
+
+
+def test_log_records_dict_view_merge_and_copy():
+    a = LogRecords()
+    a.append("2023-01-01T00:00:00", "INFO", "moduleA", "first")
+    b = LogRecords()
+    b.append("2023-01-01T00:00:01", "ERROR", "moduleB", "second")
+    b.append("bogus", "INFO", "moduleA", "third")
+
+    a.extend(b)
+    assert a == {
+        "TIMESTAMP": ["2023-01-01T00:00:00", "2023-01-01T00:00:01", "bogus"],
+        "LEVEL": ["INFO", "ERROR", "INFO"],
+        "MODULE": ["moduleA", "moduleB", "moduleA"],
+        "MESSAGE": ["first", "second", "third"],
+    }
+    assert a["LEVEL"].values == ["INFO", "ERROR"]
+    assert a.get("MISSING", []) == []
+
+    clone = copy.deepcopy(a)
+    clone["LEVEL"].append("DEBUG")
+    assert len(a["LEVEL"]) == 3 and len(clone["LEVEL"]) == 4
+    assert pickle.loads(pickle.dumps(a)) == a
+
+
+def test_timestamp_epochs_are_converted_lazily_in_bulk():
+    ts = TimestampColumn(["2026-01-12_10:15:01"])
+    # Appending only stores the text
+    assert len(ts._epochs) == 0
+    assert list(ts.epochs) == [1768212901 * 10**6]
+
+    ts.extend(["2026-01-12_10:15:02", "garbage"])
+    assert list(ts.epochs) == [1768212901 * 10**6, 1768212902 * 10**6, NO_EPOCH]
+    assert list(ts.datetimes())[1:] == [datetime(2026, 1, 12, 10, 15, 2), None]
+    assert ts == ["2026-01-12_10:15:01", "2026-01-12_10:15:02", "garbage"]
+
+
+def test_text_columns_handle_non_ascii_batches():
+    msgs = MessageColumn(["plain"])
+    msgs.extend(["Ошибка", "ascii", "😊"])
+    msgs.extend(("a", "b"))
+    assert msgs == ["plain", "Ошибка", "ascii", "😊", "a", "b"]
+
+
+def test_column_base_is_abstract():
+    from log_records import _Column
+
+    with pytest.raises(TypeError):
+        _Column()
@@ -0,0 +1,110 @@
+import asyncio
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+CHICMIC_TEST_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(CHICMIC_TEST_DIR))
+
+import partitions
+from partitions import ensure_partitions, expired, partition_month, partition_name, retention_cutoff
+
+
+class FakeSession:
+    """Records executed SQL; `logs` starts with the given partitions.
+
+    `created_meanwhile` are added once the DDL lock is taken, as if another
+    ingest had created them while this one waited.
+    """
+
+    def __init__(self, existing=(), created_meanwhile=()):
+        self.existing = list(existing)
+        self.created_meanwhile = list(created_meanwhile)
+        self.sql = []
+        self.commits = 0
+
+    async def execute(self, stmt, params=None):
+        sql = str(stmt)
+        self.sql.append(sql)
+        if "pg_advisory_xact_lock" in sql:
+            self.existing += self.created_meanwhile
+        if "pg_inherits" in sql:
+            return [(name,) for name in self.existing + ["logs_default"]]
+        return None
+
+    async def commit(self):
+        self.commits += 1
+
+
+def test_partition_names_round_trip():
+    assert partition_name(datetime(2026, 1, 1)) == "logs_y2026m01"
+    assert partition_month("logs_y2026m12") == datetime(2026, 12, 1)
+    assert partition_month("logs_default") is None
+
+
+def test_expired_keeps_partitions_overlapping_cutoff():
+    names = ["logs_y2025m11", "logs_y2025m12", "logs_y2026m01"]
+    assert expired(names, datetime(2026, 1, 1)) == ["logs_y2025m11", "logs_y2025m12"]
+    assert expired(names, datetime(2025, 12, 15)) == ["logs_y2025m11"]
+
+
+def test_retention_cutoff_counts_current_month():
+    now = datetime(2026, 3, 17, 12)
+    assert retention_cutoff(1, now) == datetime(2026, 3, 1)
+    assert retention_cutoff(6, now) == datetime(2025, 10, 1)
+
+
+ROWS = [
+    {"timestamp": datetime(2026, 1, 31, 23, 59)},
+    {"timestamp": datetime(2025, 12, 1)},
+    {"timestamp": None},
+]
+
+
+def test_ensure_partitions_moves_default_rows_into_new_month():
+    session = FakeSession(existing=["logs_y2026m01"])
+    created = asyncio.run(ensure_partitions(session, ROWS))
+    assert created == ["logs_y2025m12"]
+    ddl = [s for s in session.sql if "logs_y2025m12" in s]
+    assert ddl[0] == "CREATE TABLE logs_y2025m12 (LIKE logs INCLUDING DEFAULTS)"
+    assert "DELETE FROM logs_default" in ddl[1] and "INSERT INTO logs_y2025m12" in ddl[1]
+    assert ddl[2] == (
+        "ALTER TABLE logs ATTACH PARTITION logs_y2025m12 "
+        "FOR VALUES FROM ('2025-12-01') TO ('2026-01-01')"
+    )
+    assert session.commits == 1
+
+
+def test_ensure_partitions_checks_the_catalog_every_batch():
+    # Nothing cached per process: a partition dropped by retention is seen
+    session = FakeSession(existing=["logs_y2025m12", "logs_y2026m01"])
+    assert asyncio.run(ensure_partitions(session, ROWS)) == []
+    assert len(session.sql) == 1 and "pg_inherits" in session.sql[0]
+    assert session.commits == 0
+
+    session.existing.remove("logs_y2025m12")
+    assert asyncio.run(ensure_partitions(session, ROWS)) == ["logs_y2025m12"]
+
+
+def test_ensure_partitions_rechecks_under_the_lock():
+    session = FakeSession(existing=["logs_y2026m01"], created_meanwhile=["logs_y2025m12"])
+    assert asyncio.run(ensure_partitions(session, ROWS)) == []
+    assert not any(s.startswith(("CREATE", "ALTER")) for s in session.sql)
+    # Releases the advisory lock
+    assert session.commits == 1
+
+
+def test_retention_also_clears_expired_default_rows():
+    session = FakeSession(existing=["logs_y2025m11", "logs_y2026m01"])
+    dropped = asyncio.run(partitions.drop_partitions_before(session, datetime(2026, 1, 1)))
+    assert dropped == ["logs_y2025m11"]
+    assert "DROP TABLE logs_y2025m11" in session.sql
+    assert "DELETE FROM logs_default WHERE timestamp < :before" in session.sql
+
+
+def test_retention_cli_requires_a_window():
+    with pytest.raises(SystemExit) as exc:
+        partitions.main([])
+    assert exc.value.code == 2
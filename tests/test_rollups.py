@@ -0,0 +1,54 @@
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+CHICMIC_TEST_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(CHICMIC_TEST_DIR))
+
+from models import Log
+from rollups import choose_resolution, series_query, with_rollups
+
+
+def test_choose_resolution_prefers_coarsest_aligned_rollup():
+    assert choose_resolution("day") == "day"
+    assert choose_resolution("month", datetime(2026, 1, 1), datetime(2026, 4, 1)) == "day"
+    # A range starting mid-day can only be summed exactly from hours
+    assert choose_resolution("day", datetime(2026, 1, 1, 6)) == "hour"
+    assert choose_resolution("hour", until=datetime(2026, 1, 1, 6, 30)) == "minute"
+    # Never coarser than asked for
+    assert choose_resolution("minute", datetime(2026, 1, 1)) == "minute"
+    # Sub-minute bounds need the raw table
+    assert choose_resolution("hour", datetime(2026, 1, 1, 6, 30, 15)) is None
+    with pytest.raises(ValueError):
+        choose_resolution("fortnight")
+
+
+def test_series_query_sources():
+    stmt, source = series_query("week", datetime(2026, 1, 5))
+    sql = str(stmt.compile(dialect=postgresql.dialect()))
+    assert source == "log_rollups:day"
+    assert "FROM log_rollups" in sql and "date_trunc('week'" in sql
+
+    stmt, source = series_query("hour", datetime(2026, 1, 5, 0, 0, 30), levels=["ERROR"])
+    sql = str(stmt.compile(dialect=postgresql.dialect()))
+    assert source == "logs"
+    assert "FROM logs" in sql and "count(*)" in sql
+
+
+def test_with_rollups_updates_counters_in_the_insert_statement():
+    rows = [{"ingest_id": None, "timestamp": None, "module": "m", "level": "INFO", "message": "x", "row_hash": None}]
+    insert = pg_insert(Log.__table__).values(rows).on_conflict_do_nothing(index_elements=["row_hash"])
+    compiled = with_rollups(insert).compile(dialect=postgresql.asyncpg.dialect())
+    sql = str(compiled)
+    assert sql.startswith("WITH inserted AS")
+    assert "INSERT INTO log_rollups" in sql
+    assert "ON CONFLICT (resolution, bucket, module, level) DO UPDATE" in sql
+    # Callers get the hashes of the rows actually inserted
+    assert "RETURNING logs.timestamp, logs.module, logs.level, logs.row_hash" in sql
+    assert sql.rstrip().endswith("SELECT inserted.row_hash \nFROM inserted")
+    # Only the logs columns are bound, so MAX_BATCH_ROWS still holds
+    assert len(compiled.positiontup) == 6
@@ -0,0 +1,160 @@
+import io
+import sys
+from pathlib import Path
+
+CHICMIC_TEST_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(CHICMIC_TEST_DIR))
+
+from log_file import LogFile, RecordReader
+from user_analytics import UserAnalytics
+import Task_B1 as task_b1
+
+SAMPLE_LOGS = CHICMIC_TEST_DIR / "sample_logs"
+
+
+def test_iter_records_small_chunks_match_parse_records():
+    # Chunks of 3 bytes split lines and multi-byte UTF-8 characters
+    raw = (SAMPLE_LOGS / "unicode.log").read_bytes()
+    streamed = list(LogFile(raw).iter_records(chunk_size=3))
+
+    lf = LogFile(SAMPLE_LOGS / "unicode.log")
+    lf.parse_records()
+
+    assert len(streamed) == len(lf.logs["LEVEL"]) == 3
+    assert [r[2] for r in streamed] == lf.logs["MODULE"]
+    assert streamed[2][3] == "Ошибка при обработке"
+
+
+def test_iter_batches_and_missing_file(tmp_path):
+    p = tmp_path / "log.txt"
+    p.write_text("".join(f"2026-01-12_10:15:0{i} INFO mod msg {i}\n" for i in range(5)), encoding="utf-8")
+
+    batches = list(LogFile(p).iter_batches(batch_size=2, chunk_size=7))
+    assert [len(b["LEVEL"]) for b in batches] == [2, 2, 1]
+    assert batches[-1]["MESSAGE"] == ["msg 4"]
+
+    assert list(LogFile(tmp_path / "missing.txt").iter_records()) == []
+
+
+def test_consumers_accept_record_streams():
+    path = SAMPLE_LOGS / "standard.log"
+    lf = LogFile(path)
+    lf.parse_records()
+
+    assert task_b1.find_important_logs(LogFile(path).iter_records()) == task_b1.find_important_logs(lf.logs)
+
+    streamed = UserAnalytics.from_records(LogFile(path).iter_records())
+    eager = UserAnalytics(lf.logs)
+    assert streamed.calculate_stats() == eager.calculate_stats()
+    assert streamed.calculate_module_stats() == eager.calculate_module_stats()
+    assert streamed.calculate_levels_per_module() == eager.calculate_levels_per_module()
+
+
+def test_mmap_parse_matches_streaming_parse():
+    for path in sorted(SAMPLE_LOGS.glob("*.log")):
+        streamed = LogFile(path)
+        streamed.parse_records()
+        mapped = LogFile(path)
+        mapped.parse_records(use_mmap=True)
+        assert mapped.logs == streamed.logs, path.name
+
+
+def test_mmap_parse_selected_fields(tmp_path):
+    lf = LogFile(SAMPLE_LOGS / "standard.log")
+    lf.parse_records(fields=("LEVEL", "MODULE"), use_mmap=True)
+    assert lf.logs["LEVEL"][:2] == ["INFO", "ERROR"]
+    assert lf.logs["MODULE"][1] == "moduleB"
+    assert lf.logs["TIMESTAMP"] == [] and lf.logs["MESSAGE"] == []
+
+    empty = tmp_path / "empty.log"
+    empty.write_bytes(b"")
+    assert LogFile(empty).parse_records(use_mmap=True)["LEVEL"] == []
+
+
+def test_parallel_parse_matches_sequential(tmp_path, monkeypatch):
+    import log_file
+
+    monkeypatch.setattr(log_file, "MIN_RANGE_BYTES", 64)
+    p = tmp_path / "big.log"
+    p.write_text(
+        "".join(f"2026-01-12_10:15:{i % 60:02d} {'ERROR' if i % 7 == 0 else 'INFO'} mod.{i % 5} message {i}\n" for i in range(500)),
+        encoding="utf-8",
+    )
+
+    ranges = log_file.split_ranges(p.read_bytes(), 4)
+    assert len(ranges) == 4
+    assert ranges[0][0] == 0 and ranges[-1][1] == p.stat().st_size
+
+    sequential = LogFile(p)
+    sequential.parse_records()
+    parallel = LogFile(p)
+    parallel.parse_records(workers=4)
+    assert parallel.logs == sequential.logs
+
+
+def test_record_reader_tracks_offsets_for_resume():
+    data = b"2026-01-12_10:15:01 INFO a one\nnot a record\n2026-01-12_10:15:02 WARN b two\n2026-01-12_10:15:03 INFO c three"
+    stream = io.BytesIO(data)
+    reader = RecordReader(stream, chunk_size=7)
+    it = iter(reader)
+    assert next(it)[3] == "one"
+    assert next(it)[3] == "two"
+    offset = reader.offset
+    assert data[:offset].endswith(b"two\n")
+
+    rest = list(RecordReader(stream, start=offset, chunk_size=7))
+    assert [r[3] for r in rest] == ["three"]
+    reader = RecordReader(stream)
+    assert len(list(reader)) == 3 and reader.offset == len(data)
+
+
+def test_mmap_and_parallel_parse_match_streaming_on_unicode_separators(tmp_path, monkeypatch):
+    import log_file
+
+    monkeypatch.setattr(log_file, "MIN_RANGE_BYTES", 64)
+    lines = [
+        "2026-01-12_10:15:01\xa0INFO mod.a nbsp after timestamp",
+        "2026-01-12_10:15:02 WARN\xa0mod.b nbsp after level",
+        "2026-01-12_10:15:03 ERROR mod.c \xa0message starts with nbsp",
+        "2026-01-12_10:15:04 INFO mod.d  keeps  inner spacing\r",
+        "2026-01-12_10:15:05\x1fDEBUG mod.e unit separator",
+        "2026-01-12_10:15:06 INFO módulo accented module",
+    ]
+    p = tmp_path / "nbsp.log"
+    p.write_bytes(("\n".join(lines * 20) + "\n").encode("utf-8"))
+
+    streamed = LogFile(p)
+    streamed.parse_records()
+    assert streamed.logs["LEVEL"][:6] == ["INFO", "WARN", "ERROR", "INFO", "DEBUG", "INFO"]
+    assert streamed.logs["MESSAGE"][2] == "message starts with nbsp"
+    for kwargs in ({"use_mmap": True}, {"workers": 2}):
+        other = LogFile(p)
+        other.parse_records(**kwargs)
+        assert other.logs == streamed.logs, kwargs
+
+
+def test_lines_split_like_str_splitlines(tmp_path):
+    # CR-only, CRLF, form feed and U+2028 all end a line, as with splitlines()
+    text = (
+        "2026-01-12_10:15:01 INFO a one\r2026-01-12_10:15:02 WARN b two\r\n"
+        "2026-01-12_10:15:03 ERROR c three\x0c2026-01-12_10:15:04 INFO d four\u2028"
+        "2026-01-12_10:15:05 DEBUG e five\r"
+    )
+    raw = text.encode("utf-8")
+    expected = ["one", "two", "three", "four", "five"]
+    p = tmp_path / "cr.log"
+    p.write_bytes(raw)
+
+    for chunk_size in (1, 2, 7, len(raw)):
+        assert [r[3] for r in LogFile(raw).iter_records(chunk_size=chunk_size)] == expected, chunk_size
+    assert len(list(LogFile(raw).iter_lines(chunk_size=2))) == len(text.splitlines())
+    mapped = LogFile(p)
+    mapped.parse_records(use_mmap=True)
+    assert mapped.logs["MESSAGE"] == expected
+
+    reader = RecordReader(io.BytesIO(raw), chunk_size=4)
+    assert [r[3] for r in reader] == expected
+    assert reader.offset == len(raw)
+    # Every record's offset is a line start to resume from
+    resumed = RecordReader(io.BytesIO(raw), start=len("2026-01-12_10:15:01 INFO a one\r"))
+    assert [r[3] for r in resumed] == expected[1:]
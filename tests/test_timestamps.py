@@ -0,0 +1,41 @@
+import sys
+from datetime import datetime
+from pathlib import Path
+
+CHICMIC_TEST_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(CHICMIC_TEST_DIR))
+
+from log_records import TimestampColumn
+from timestamps import TimestampParser, parse_timestamp
+
+
+def test_underscore_format_detected_and_parsed():
+    values = [f"2026-01-12_10:15:{s:02d}" for s in range(10)]
+    parser = TimestampParser.detect(values[:5])
+    assert parser.format == "fixed"
+    assert [parser.parse(v) for v in values] == [datetime(2026, 1, 12, 10, 15, s) for s in range(10)]
+    assert parser.fallbacks == 0
+
+
+def test_fractions_offsets_and_fallback():
+    parser = TimestampParser(sample_size=2)
+    assert parser.parse("2023-01-02T01:02:03.25") == datetime(2023, 1, 2, 1, 2, 3, 250000)
+    assert parser.parse("2023-01-02T01:02:03") == datetime(2023, 1, 2, 1, 2, 3)
+    # Offsets are normalised to naive UTC
+    assert parser.parse("2023-01-02T03:02:03+02:00") == datetime(2023, 1, 2, 1, 2, 3)
+    # Locked format misses go through dateutil
+    assert parser.parse("Jan 2 2023 1:02am") == datetime(2023, 1, 2, 1, 2)
+    assert parser.fallbacks == 1
+    assert parser.parse("not-a-date") is None
+    assert parser.parse("") is None
+
+
+def test_other_layouts():
+    assert TimestampParser.detect(["12/Jan/2026:10:15:01"]).format == "apache"
+    assert parse_timestamp("2026/01/12_10:15:01") == datetime(2026, 1, 12, 10, 15, 1)
+    assert parse_timestamp("1736676901") == datetime(2025, 1, 12, 10, 15, 1)
+
+
+def test_timestamp_column_datetimes():
+    col = TimestampColumn(["2026-01-12_10:15:01", "2023-01-02T03:02:03+02:00", "garbage"])
+    assert list(col.datetimes()) == [datetime(2026, 1, 12, 10, 15, 1), datetime(2023, 1, 2, 1, 2, 3), None]
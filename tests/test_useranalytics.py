@@ -1,3 +1,5 @@
+import pytest
+
 from user_analytics import UserAnalytics
 
 
@@ -19,3 +21,84 @@ def test_module_and_levels_per_module():
     assert levels_per['mod.b']['ERROR'] == 1
     assert levels_per['mod.b']['DEBUG'] == 1
     assert levels_per['mod.c']['INFO'] == 1
+
+
+def test_numpy_backend_matches_python():
+    pytest.importorskip("numpy")
+    from log_records import LogRecords
+
+    levels = ['INFO', 'DEBUG', 'ERROR', 'INFO', 'WARN', 'DEBUG', 'ALERT']
+    modules = ['mod.a', 'mod.a', 'mod.b', 'mod.c', 'mod.a', 'mod.b']
+    records = LogRecords()
+    records['LEVEL'].extend(levels)
+    records['MODULE'].extend(modules)
+
+    for logs in ({'LEVEL': levels, 'MODULE': modules}, records, {'LEVEL': levels}):
+        py = UserAnalytics(logs, backend='python')
+        vec = UserAnalytics(logs, backend='numpy')
+        assert vec.calculate_stats() == py.calculate_stats()
+        assert vec.calculate_module_stats() == py.calculate_module_stats()
+        assert vec.calculate_levels_per_module() == py.calculate_levels_per_module()
+
+
+def test_auto_backend_uses_numpy_only_for_coded_columns(monkeypatch):
+    pytest.importorskip("numpy")
+    import user_analytics
+    from log_records import LogRecords
+
+    monkeypatch.setattr(user_analytics, 'NUMPY_MIN_ROWS', 2)
+    levels, modules = ['INFO', 'ERROR', 'INFO'], ['mod.a', 'mod.b', 'mod.a']
+    records = LogRecords()
+    records['LEVEL'].extend(levels)
+    records['MODULE'].extend(modules)
+
+    assert UserAnalytics(records)._use_numpy()
+    assert not UserAnalytics({'LEVEL': levels, 'MODULE': modules})._use_numpy()
+    assert not UserAnalytics({'LEVEL': records['LEVEL'], 'MODULE': modules})._use_numpy()
+
+
+def test_compute_all_is_cached_until_refresh():
+    logs = {'LEVEL': ['INFO', 'ERROR', 'INFO'], 'MODULE': ['mod.a', 'mod.b', 'mod.a']}
+    ua = UserAnalytics(logs, backend='python')
+
+    result = ua.compute_all()
+    assert result.records == 3
+    assert result.levels['INFO'] == 2
+    assert result.modules == {'mod.a': 2, 'mod.b': 1}
+    assert result.levels_per_module == {'mod.a': {'INFO': 2}, 'mod.b': {'ERROR': 1}}
+    assert ua.compute_all() is result
+
+    logs['LEVEL'].append('WARN')
+    assert ua.calculate_stats()['WARN'] == 0
+    assert ua.compute_all(refresh=True).levels['WARN'] == 1
+    # The unpaired LEVEL entry counts toward levels only
+    assert ua.calculate_module_stats() == {'mod.a': 2, 'mod.b': 1}
+
+
+def test_aggregate_update_merge_and_serialize():
+    import json
+    from user_analytics import Aggregate
+
+    first = {'LEVEL': ['INFO', 'ERROR'], 'MODULE': ['mod.a', 'mod.b']}
+    second = [('ts', 'INFO', 'mod.a', 'msg'), ('ts', 'WARN', 'mod.c', 'msg')]
+
+    left = Aggregate().update(first)
+    right = Aggregate().update(second)
+    restored = Aggregate.from_dict(json.loads(json.dumps(right.to_dict())))
+    merged = left.merge(restored)
+    assert merged.records == 4
+
+    full = {'LEVEL': ['INFO', 'ERROR', 'INFO', 'WARN'], 'MODULE': ['mod.a', 'mod.b', 'mod.a', 'mod.c']}
+    assert merged.tables() == Aggregate().update(full).tables()
+
+
+def test_incremental_update_matches_full_recount():
+    logs = {'LEVEL': ['INFO', 'ERROR'], 'MODULE': ['mod.a', 'mod.b']}
+    ua = UserAnalytics(logs)
+    ua.compute_all()
+
+    result = ua.update({'LEVEL': ['WARN', 'INFO'], 'MODULE': ['mod.b', 'mod.a']})
+    expected = UserAnalytics({'LEVEL': ['INFO', 'ERROR', 'WARN', 'INFO'],
+                              'MODULE': ['mod.a', 'mod.b', 'mod.b', 'mod.a']}).compute_all()
+    assert result == expected
+    assert ua.calculate_levels_per_module()['mod.b'] == {'ERROR': 1, 'WARN': 1}
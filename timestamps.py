@@ -0,0 +1,202 @@
+"""Module timestamps
+
+Fast timestamp parsing for log lines.
+
+`dateutil.parser.parse` is flexible but slow, and it rejects the
+`2026-01-12_10:15:01` layout used by this project's own logs.
+`TimestampParser` tries a short list of known layouts on the first
+`sample_size` values, locks in the one that matched most often and from
+then on uses only that fast path. Values the locked format does not
+match fall back to dateutil. Parsed values are memoized by their
+second-resolution prefix, because log lines arrive many per second.
+
+All results are naive datetimes; values with a UTC offset are converted
+to UTC, matching the `logs.timestamp` column.
+"""
+from __future__ import annotations
+
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional, Tuple
+
+try:
+    from dateutil import parser as dateparser
+except ImportError:  # pragma: no cover - dateutil is in requirements.txt
+    dateparser = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SAMPLE_SIZE = 100
+DEFAULT_CACHE_SIZE = 4096
+
+_DIGITS = frozenset("0123456789")
+
+Parse = Callable[[str], Optional[datetime]]
+
+
+def _naive_utc(dt: datetime) -> datetime:
+    if dt.tzinfo is None:
+        return dt
+    return dt.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def parse_fixed(value: str) -> Optional[datetime]:
+    """`YYYY-MM-DD?HH:MM:SS` with any single separator, by slicing."""
+    if len(value) != 19 or value[4] != "-" or value[7] != "-" or value[13] != ":" or value[16] != ":":
+        return None
+    try:
+        return datetime(
+            int(value[0:4]),
+            int(value[5:7]),
+            int(value[8:10]),
+            int(value[11:13]),
+            int(value[14:16]),
+            int(value[17:19]),
+        )
+    except ValueError:
+        return None
+
+
+def parse_iso(value: str) -> Optional[datetime]:
+    """ISO 8601 via `datetime.fromisoformat` (any single date/time separator)."""
+    if len(value) < 10 or value[0] not in _DIGITS:
+        return None
+    try:
+        dt = datetime.fromisoformat(value[:-1] + "+00:00" if value.endswith("Z") else value)
+    except ValueError:
+        return None
+    return _naive_utc(dt)
+
+
+def _strptime(fmt: str) -> Parse:
+    def parse(value: str) -> Optional[datetime]:
+        try:
+            return _naive_utc(datetime.strptime(value, fmt))
+        except ValueError:
+            return None
+
+    return parse
+
+
+def parse_epoch(value: str) -> Optional[datetime]:
+    """Unix epoch seconds, optionally fractional (e.g. `1736676901.25`)."""
+    if not value or value[0] not in _DIGITS:
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        return None
+    # Only accept plausible epochs (2001-2286) so plain numbers are not dates
+    if not 1e9 <= seconds < 1e10:
+        return None
+    return datetime(1970, 1, 1) + timedelta(seconds=seconds)
+
+
+# Candidate formats in detection order; ties favour the earlier entry.
+FORMATS: List[Tuple[str, Parse]] = [
+    ("fixed", parse_fixed),
+    ("iso", parse_iso),
+    ("apache", _strptime("%d/%b/%Y:%H:%M:%S")),
+    ("slashes", _strptime("%Y/%m/%d_%H:%M:%S")),
+    ("syslog_year", _strptime("%b %d %Y %H:%M:%S")),
+    ("epoch", parse_epoch),
+]
+
+
+def parse_dateutil(value: str) -> Optional[datetime]:
+    if dateparser is None or not value:
+        return None
+    try:
+        return _naive_utc(dateparser.parse(value))
+    except (ValueError, OverflowError):
+        return None
+
+
+class TimestampParser:
+    """Format-detecting, memoizing timestamp parser.
+
+    Use one instance per input file (formats rarely change within a file).
+    `parse` returns None for values nothing can read.
+    """
+
+    def __init__(self, sample_size: int = DEFAULT_SAMPLE_SIZE, cache_size: int = DEFAULT_CACHE_SIZE) -> None:
+        self.sample_size = sample_size
+        self.cache_size = cache_size
+        self.format: Optional[str] = None
+        self._fast: Optional[Parse] = None
+        self._hits: Dict[str, int] = {}
+        self._seen = 0
+        # Second-resolution prefix -> datetime (or None when unparseable)
+        self._cache: Dict[str, Optional[datetime]] = {}
+        self.fallbacks = 0
+
+    @classmethod
+    def detect(cls, samples, **kwargs) -> "TimestampParser":
+        """Return a parser whose format was detected from `samples`."""
+        parser = cls(**kwargs)
+        for value in samples:
+            parser.parse(value)
+        parser._lock()
+        return parser
+
+    def _lock(self) -> None:
+        if self._fast is not None or not self._hits:
+            return
+        best = max(FORMATS, key=lambda f: self._hits.get(f[0], 0))
+        self.format, self._fast = best
+        logger.debug("Timestamp format detected: %s (hits=%s)", self.format, self._hits)
+
+    def _detecting(self, value: str) -> Optional[datetime]:
+        result = None
+        for name, parse in FORMATS:
+            dt = parse(value)
+            if dt is not None:
+                self._hits[name] = self._hits.get(name, 0) + 1
+                if result is None:
+                    result = dt
+        self._seen += 1
+        if self._seen >= self.sample_size:
+            self._lock()
+        return result
+
+    def _parse_uncached(self, value: str) -> Optional[datetime]:
+        if self._fast is None:
+            dt = self._detecting(value)
+        else:
+            dt = self._fast(value)
+        if dt is None:
+            dt = parse_dateutil(value)
+            if dt is not None:
+                self.fallbacks += 1
+        return dt
+
+    def parse(self, value: str) -> Optional[datetime]:
+        if not value:
+            return None
+        # Fractional seconds share the cached second: "...:01.250" -> "...:01"
+        key, micros = value, 0
+        if len(value) > 20 and value[19] in ".," and value[20:].isdigit() and len(value) <= 26:
+            key = value[:19]
+            micros = int(value[20:].ljust(6, "0"))
+        try:
+            dt = self._cache[key]
+        except KeyError:
+            dt = self._parse_uncached(key)
+            if dt is None and key is not value:
+                # The prefix alone did not parse; give the full value a chance
+                return self._parse_uncached(value)
+            if len(self._cache) >= self.cache_size:
+                self._cache.clear()
+            self._cache[key] = dt
+        if dt is not None and micros:
+            dt = dt.replace(microsecond=micros)
+        return dt
+
+
+def parse_timestamp(value: str) -> Optional[datetime]:
+    """Parse a single value (e.g. a query parameter) without detection state."""
+    for _, parse in FORMATS:
+        dt = parse(value)
+        if dt is not None:
+            return dt
+    return parse_dateutil(value)
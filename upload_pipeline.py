@@ -0,0 +1,141 @@
+"""Module upload_pipeline
+
+Incremental processing of an uploaded log file.
+
+`UploadPipeline` is fed the upload one block at a time. For each block it
+enforces the size limit, updates the SHA256 file hash, decompresses it if
+the upload is compressed (detected from its magic bytes) and cuts off the
+complete lines; those lines are parsed into an analytics `Aggregate` by
+`aggregate_block`. Nothing but the current block and a partial line is
+held in memory.
+
+`aggregate_block` is a plain module-level function so the parsing step can
+run in a worker process, with the resulting aggregates merged back here.
+"""
+from __future__ import annotations
+
+import hashlib
+from dataclasses import dataclass, field
+from typing import Any, BinaryIO, List, Optional
+
+from compression import MAGIC_BYTES, StreamDecompressor, detect
+from log_file import IncrementalParser
+from user_analytics import Aggregate, AnalyticsResult, UserAnalytics
+
+
+class UploadTooLarge(Exception):
+    """Raised when an upload exceeds `max_size` (or, decompressed, `max_expanded_size`) bytes."""
+
+
+def aggregate_block(block: bytes) -> Aggregate:
+    """Parse a block of complete lines and return its analytics aggregate."""
+    parser = IncrementalParser()
+    aggregate = Aggregate().update(parser.feed(block))
+    return aggregate.update(parser.close())
+
+
+@dataclass
+class UploadPipeline:
+    """Size check, hashing, parsing and analytics for one streamed upload.
+
+    Use `feed` / `close` to do everything in the calling thread, or
+    `accept` / `finish` to get line-aligned blocks, parse them elsewhere
+    with `aggregate_block`, and hand the results back through `add`.
+
+    If `sink` is set, every accepted chunk is also written to it (used to
+    spool the upload for background ingest). `size`, the hash and the sink
+    all see the upload as sent; `compression` names the detected format and
+    `expanded_size` counts decompressed bytes.
+    """
+
+    max_size: int
+    sink: Optional[BinaryIO] = None
+    max_expanded_size: Optional[int] = None
+    size: int = 0
+    expanded_size: int = 0
+    compression: Optional[str] = None
+    aggregate: Aggregate = field(default_factory=Aggregate)
+    # Pieces of the unterminated last line, joined once its newline arrives
+    _carry: List[bytes] = field(default_factory=list, repr=False)
+    _digest: Any = field(default_factory=hashlib.sha256, repr=False)
+    # Leading bytes held until there are enough to check for a magic number
+    _head: Optional[bytes] = field(default=b"", repr=False)
+    _decompressor: Optional[StreamDecompressor] = field(default=None, repr=False)
+
+    @property
+    def file_hash(self) -> str:
+        return self._digest.hexdigest()
+
+    def accept(self, chunk: bytes) -> bytes:
+        """Count and hash `chunk`; return the complete lines it finishes.
+
+        Splitting on the newline byte is safe for UTF-8, whose multi-byte
+        sequences never contain 0x0A.
+        """
+        self.size += len(chunk)
+        if self.size > self.max_size:
+            raise UploadTooLarge(f"Upload exceeds {self.max_size} bytes")
+        self._digest.update(chunk)
+        if self.sink is not None:
+            self.sink.write(chunk)
+        chunk = self._plain(chunk)
+        cut = chunk.rfind(b"\n") + 1
+        if not cut:
+            if chunk:
+                self._carry.append(chunk)
+            return b""
+        self._carry.append(chunk[:cut])
+        block = b"".join(self._carry)
+        self._carry = [chunk[cut:]] if cut < len(chunk) else []
+        return block
+
+    def finish(self) -> bytes:
+        """Return the trailing unterminated line, if any.
+
+        Raises `compression.CompressionError` for a truncated compressed upload.
+        """
+        self._carry.append(self._plain(b"", final=True))
+        block, self._carry = b"".join(self._carry), []
+        if self._decompressor is not None:
+            self._decompressor.close()
+        return block
+
+    def _plain(self, chunk: bytes, final: bool = False) -> bytes:
+        """Return the decompressed (or unchanged) bytes for `chunk`."""
+        if self._head is not None:
+            self._head += chunk
+            if len(self._head) < MAGIC_BYTES and not final:
+                return b""
+            chunk, self._head = self._head, None
+            self.compression = detect(chunk)
+            if self.compression is not None:
+                self._decompressor = StreamDecompressor(self.compression)
+        if self._decompressor is None:
+            self.expanded_size += len(chunk)
+            return chunk
+        pieces = []
+        for piece in self._decompressor.feed(chunk):
+            self.expanded_size += len(piece)
+            if self.max_expanded_size is not None and self.expanded_size > self.max_expanded_size:
+                raise UploadTooLarge(f"Decompressed upload exceeds {self.max_expanded_size} bytes")
+            pieces.append(piece)
+        return b"".join(pieces)
+
+    def add(self, partial: Aggregate) -> None:
+        self.aggregate.merge(partial)
+
+    def result(self) -> AnalyticsResult:
+        return UserAnalytics(aggregate=self.aggregate).compute_all()
+
+    def feed(self, chunk: bytes) -> None:
+        """Process one block of the upload in the calling thread."""
+        block = self.accept(chunk)
+        if block:
+            self.add(aggregate_block(block))
+
+    def close(self) -> AnalyticsResult:
+        """Flush the last partial line and return the analytics result."""
+        block = self.finish()
+        if block:
+            self.add(aggregate_block(block))
+        return self.result()
@@ -5,49 +5,301 @@ Provides UserAnalytics class to compute counts for log levels.
 from __future__ import annotations
 
 from collections import Counter
-from dataclasses import dataclass
-from typing import Dict, List
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from log_records import CodedColumn
+
+try:  # optional vectorized backend
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without numpy
+    np = None
+
+KNOWN_LEVELS = ("ERROR", "INFO", "WARN", "DEBUG")
+
+# Below this many rows the "auto" backend stays in pure Python; array setup
+# costs more than it saves on small inputs. Plain lists always stay in pure
+# Python: encoding them to codes costs more than the Counter it replaces.
+NUMPY_MIN_ROWS = 10_000
+
+# Largest module x level table built densely; beyond it pair codes are
+# counted with np.unique instead.
+_MAX_DENSE_CELLS = 1 << 24
+
+CountTables = Tuple[Dict[str, int], Dict[str, int], Dict[str, Dict[str, int]]]
+
+
+def _codes(column: Sequence[str]) -> Tuple["np.ndarray", List[str]]:
+    """Return (codes, values) for a column, reusing LogRecords encoding."""
+    if isinstance(column, CodedColumn):
+        dtype = np.uint16 if column.codes.typecode == "H" else np.uint32
+        return np.frombuffer(column.codes, dtype=dtype).astype(np.int64), column.values
+    index: Dict[str, int] = {}
+    setdefault = index.setdefault
+    codes = [setdefault(v, len(index)) for v in column]
+    return np.fromiter(codes, dtype=np.int64, count=len(codes)), list(index)
+
+
+def numpy_count_tables(levels: Sequence[str], modules: Sequence[str]) -> CountTables:
+    """Count levels, modules and (module, level) pairs with NumPy.
+
+    Works on dictionary-encoded code arrays: one `np.bincount` over the
+    combined `module * n_levels + level` code builds the 2-D histogram, and
+    the per-level and per-module totals are its row/column sums. Rows past
+    the shorter column only contribute to that column's own totals, which
+    matches the pure-Python methods. Returns plain-int dicts.
+    """
+    lvl_codes, lvl_values = _codes(levels)
+    mod_codes, mod_values = _codes(modules)
+    n_lvl, n_mod = len(lvl_values), len(mod_values)
+    n = min(len(lvl_codes), len(mod_codes))
+
+    level_totals = np.bincount(lvl_codes[n:], minlength=n_lvl)
+    module_totals = np.bincount(mod_codes[n:], minlength=n_mod)
+    per_module: Dict[str, Dict[str, int]] = {}
+    if n and n_lvl * n_mod <= _MAX_DENSE_CELLS:
+        table = np.bincount(mod_codes[:n] * n_lvl + lvl_codes[:n], minlength=n_lvl * n_mod).reshape(n_mod, n_lvl)
+        level_totals = level_totals + table.sum(axis=0)
+        module_totals = module_totals + table.sum(axis=1)
+        for m, lv in zip(*np.nonzero(table)):
+            per_module.setdefault(mod_values[m], {})[lvl_values[lv]] = int(table[m, lv])
+    elif n:
+        pairs, counts = np.unique(mod_codes[:n] * n_lvl + lvl_codes[:n], return_counts=True)
+        level_totals = level_totals + np.bincount(pairs % n_lvl, weights=counts, minlength=n_lvl).astype(np.int64)
+        module_totals = module_totals + np.bincount(pairs // n_lvl, weights=counts, minlength=n_mod).astype(np.int64)
+        for pair, cnt in zip(pairs.tolist(), counts.tolist()):
+            m, lv = divmod(pair, n_lvl)
+            per_module.setdefault(mod_values[m], {})[lvl_values[lv]] = cnt
+
+    level_counts = {lvl_values[i]: c for i, c in enumerate(level_totals.tolist()) if c}
+    module_counts = {mod_values[i]: c for i, c in enumerate(module_totals.tolist()) if c}
+    return level_counts, module_counts, per_module
+
+
+def summarize_levels(counts: Dict[str, int]) -> Dict[str, int]:
+    """Fold raw level counts into the report shape; unknown levels become INVALID."""
+    summary = {lvl: counts.get(lvl, 0) for lvl in KNOWN_LEVELS}
+    summary["INVALID"] = sum(v for k, v in counts.items() if k not in KNOWN_LEVELS)
+    return summary
+
+
+def count_pairs(levels: Sequence[str], modules: Sequence[str]) -> Tuple[Counter, Counter, Counter]:
+    """Count (module, level) pairs plus the unpaired tail of the longer column.
+
+    Returns (pairs, extra_levels, extra_modules).
+    """
+    n = min(len(levels), len(modules))
+    if isinstance(levels, CodedColumn) and isinstance(modules, CodedColumn):
+        # Count integer code pairs, then translate the (few) distinct keys
+        mod_values, lvl_values = modules.values, levels.values
+        pairs = Counter({
+            (mod_values[m], lvl_values[lv]): cnt
+            for (m, lv), cnt in Counter(zip(modules.codes, levels.codes)).items()
+        })
+    else:
+        pairs = Counter(zip(modules, levels))
+    extra_levels: Counter = Counter(levels[n:]) if len(levels) > n else Counter()
+    extra_modules: Counter = Counter(modules[n:]) if len(modules) > n else Counter()
+    return pairs, extra_levels, extra_modules
+
+
+def python_count_tables(levels: Sequence[str], modules: Sequence[str]) -> CountTables:
+    """Pure-Python counterpart of `numpy_count_tables`.
+
+    A single `Counter` over zip(modules, levels) yields the pair counts;
+    level and module totals are folded from it (plus any unpaired tail of
+    the longer column) without traversing the columns again.
+    """
+    return tables_from_pairs(*count_pairs(levels, modules))
+
+
+def tables_from_pairs(
+    pairs: Dict[Tuple[str, str], int],
+    level_counts: Optional[Counter] = None,
+    module_counts: Optional[Counter] = None,
+) -> CountTables:
+    """Derive (levels, modules, levels_per_module) from (module, level) counts.
+
+    `level_counts` / `module_counts` may carry extra totals that are added on.
+    """
+    level_counts = Counter() if level_counts is None else level_counts
+    module_counts = Counter() if module_counts is None else module_counts
+    per_module: Dict[str, Dict[str, int]] = {}
+    for (mod, lvl), cnt in pairs.items():
+        level_counts[lvl] += cnt
+        module_counts[mod] += cnt
+        per_module.setdefault(mod, {})[lvl] = cnt
+    return dict(level_counts), dict(module_counts), per_module
 
 
 @dataclass
-class UserAnalytics:
-    """Compute simple statistics over parsed log dictionaries."""
+class AnalyticsResult:
+    """All aggregates for one set of logs, as returned by `compute_all`."""
 
-    logs: Dict[str, List[str]]
+    records: int
+    levels: Dict[str, int]
+    modules: Dict[str, int]
+    levels_per_module: Dict[str, Dict[str, int]]
 
-    def calculate_stats(self) -> Dict[str, int]:
-        levels = self.logs.get("LEVEL", [])
-        counts = Counter(levels)
 
-        # Preserve current semantics: unknown levels are grouped as INVALID
-        known = {"ERROR", "INFO", "WARN", "DEBUG"}
-        invalid = sum(v for k, v in counts.items() if k not in known)
+@dataclass
+class Aggregate:
+    """Mergeable partial analytics for a stream of log batches.
+
+    Holds (module, level) pair counts, which are enough to rebuild every
+    `UserAnalytics` result. `update` folds in a new batch in O(batch),
+    `merge` combines aggregates built per chunk or per worker, and
+    `to_dict` / `from_dict` round-trip through JSON.
+    """
+
+    records: int = 0
+    pairs: Counter = field(default_factory=Counter)
+    # Rows whose LEVEL or MODULE had no counterpart in the same batch
+    extra_levels: Counter = field(default_factory=Counter)
+    extra_modules: Counter = field(default_factory=Counter)
+
+    def update(self, batch: Mapping[str, Sequence[str]] | Iterable[Tuple[str, str, str, str]]) -> "Aggregate":
+        """Add a columnar batch (logs dict / LogRecords) or an iterable of records."""
+        if isinstance(batch, Mapping):
+            levels = batch.get("LEVEL", [])
+            pairs, extra_levels, extra_modules = count_pairs(levels, batch.get("MODULE", []))
+            self.pairs.update(pairs)
+            self.extra_levels.update(extra_levels)
+            self.extra_modules.update(extra_modules)
+            self.records += len(levels)
+            return self
+        counted = Counter((mod, lvl) for _ts, lvl, mod, _msg in batch)
+        self.pairs.update(counted)
+        self.records += sum(counted.values())
+        return self
 
+    def merge(self, other: "Aggregate") -> "Aggregate":
+        """Add `other`'s counts into this aggregate and return it."""
+        self.records += other.records
+        self.pairs.update(other.pairs)
+        self.extra_levels.update(other.extra_levels)
+        self.extra_modules.update(other.extra_modules)
+        return self
+
+    def tables(self) -> CountTables:
+        return tables_from_pairs(self.pairs, Counter(self.extra_levels), Counter(self.extra_modules))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return a JSON-serializable representation."""
         return {
-            "ERROR": counts.get("ERROR", 0),
-            "INFO": counts.get("INFO", 0),
-            "WARN": counts.get("WARN", 0),
-            "DEBUG": counts.get("DEBUG", 0),
-            "INVALID": invalid,
+            "records": self.records,
+            "pairs": [[mod, lvl, cnt] for (mod, lvl), cnt in self.pairs.items()],
+            "extra_levels": dict(self.extra_levels),
+            "extra_modules": dict(self.extra_modules),
         }
 
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "Aggregate":
+        return cls(
+            records=data.get("records", 0),
+            pairs=Counter({(mod, lvl): cnt for mod, lvl, cnt in data.get("pairs", [])}),
+            extra_levels=Counter(data.get("extra_levels", {})),
+            extra_modules=Counter(data.get("extra_modules", {})),
+        )
+
+
+@dataclass
+class UserAnalytics:
+    """Compute simple statistics over parsed log dictionaries.
+
+    Instances built with `from_records`, or fed through `update`, keep an
+    `Aggregate` of (module, level) pair counts instead of the raw columns,
+    so analytics over a streamed or growing file cost memory proportional
+    to the number of distinct modules and levels, and refreshing them costs
+    O(new lines).
+
+    `backend` selects how columns are counted: "python", "numpy" or "auto"
+    (NumPy when it is installed and the LEVEL and MODULE columns are
+    `CodedColumn`s of at least `NUMPY_MIN_ROWS` rows). Both backends return
+    identical dicts.
+
+    All aggregates are built together by `compute_all` and cached; the
+    `calculate_*` methods read from that cache.
+    """
+
+    logs: Dict[str, List[str]] = field(default_factory=dict)
+    aggregate: Optional[Aggregate] = field(default=None, repr=False)
+    backend: str = "auto"
+    _result: Optional[AnalyticsResult] = field(default=None, init=False, repr=False, compare=False)
+
+    @classmethod
+    def from_records(cls, records: Iterable[Tuple[str, str, str, str]]) -> "UserAnalytics":
+        """Build analytics from an iterable of (timestamp, level, module, message).
+
+        Pass `LogFile.iter_records()` to analyse a file without materializing it.
+        """
+        return cls(aggregate=Aggregate().update(records))
+
+    def update(self, batch: Mapping[str, Sequence[str]] | Iterable[Tuple[str, str, str, str]]) -> AnalyticsResult:
+        """Fold a batch of new records in and return the refreshed result.
+
+        The first call seeds an `Aggregate` from `logs`; afterwards only the
+        new batch is counted. `logs` itself is left untouched.
+        """
+        if self.aggregate is None:
+            self.aggregate = Aggregate().update(self.logs)
+        self.aggregate.update(batch)
+        return self.compute_all(refresh=True)
+
+    def _use_numpy(self) -> bool:
+        if self.aggregate is not None or self.backend == "python":
+            return False
+        if self.backend == "numpy":
+            if np is None:
+                raise RuntimeError("numpy backend requested but numpy is not installed")
+            return True
+        levels, modules = self.logs.get("LEVEL", []), self.logs.get("MODULE", [])
+        return (
+            np is not None
+            and isinstance(levels, CodedColumn)
+            and isinstance(modules, CodedColumn)
+            and len(levels) >= NUMPY_MIN_ROWS
+        )
+
+    def compute_all(self, refresh: bool = False) -> AnalyticsResult:
+        """Compute every aggregate in one pass and cache it on the instance.
+
+        Pass `refresh=True` after mutating `logs` to discard the cached result.
+        """
+        if self._result is not None and not refresh:
+            return self._result
+
+        if self.aggregate is not None:
+            level_counts, module_counts, per_module = self.aggregate.tables()
+            records = self.aggregate.records
+        else:
+            levels = self.logs.get("LEVEL", [])
+            modules = self.logs.get("MODULE", [])
+            if self._use_numpy():
+                level_counts, module_counts, per_module = numpy_count_tables(levels, modules)
+            else:
+                level_counts, module_counts, per_module = python_count_tables(levels, modules)
+            records = len(levels)
+
+        # Preserve current semantics: unknown levels are grouped as INVALID
+        self._result = AnalyticsResult(
+            records=records,
+            levels=summarize_levels(level_counts),
+            modules=module_counts,
+            levels_per_module=per_module,
+        )
+        return self._result
+
+    def calculate_stats(self) -> Dict[str, int]:
+        return dict(self.compute_all().levels)
+
     def calculate_module_stats(self) -> Dict[str, int]:
         """Return a mapping of module name -> number of times module appears in logs."""
-        modules = self.logs.get("MODULE", [])
-        return dict(Counter(modules))
+        return dict(self.compute_all().modules)
 
     def calculate_levels_per_module(self) -> Dict[str, Dict[str, int]]:
         """Return a mapping module -> { level -> count }."""
-        modules = self.logs.get("MODULE", [])
-        levels = self.logs.get("LEVEL", [])
-        per_module: Dict[str, Counter] = {}
-        for mod, lvl in zip(modules, levels):
-            if mod not in per_module:
-                per_module[mod] = Counter()
-            per_module[mod][lvl] += 1
-
-        # Convert Counters to normal dicts
-        return {m: dict(c) for m, c in per_module.items()}
+        return {m: dict(c) for m, c in self.compute_all().levels_per_module.items()}
 
     def generate_report(self) -> None:
         stats = self.calculate_stats()